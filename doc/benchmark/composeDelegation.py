@@ -0,0 +1,100 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Per-level overhead of compose()'s delegation, retval = yield sub(), versus native delegation, retval = yield from sub(), inside a composed generator.
+# For stacks of depth 1 to 50, it measures:
+# - data: a value yielded by the innermost generator, passing through the stack,
+# - calls: building the stack and returning through every level.
+# Reported in microseconds per operation, for the C and the Python compose().
+# compose() resumes only the innermost generator, so data costs the same at any depth.  Native delegation resumes each level in turn (O(depth)),
+# but its calls are cheaper than those of the Python compose().  Helpers that only return a value may use yield from, at the cost of per-level data passing.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 composeDelegation.py)
+
+from time import perf_counter
+
+from weightless.core._compose_py import compose as pyCompose
+from weightless.core import cextension
+if cextension:
+    from weightless.core.ext import compose as cCompose
+
+OPERATIONS = 20000
+DEPTHS = [1, 5, 10, 20, 50]
+
+
+def leaf():
+    for i in range(OPERATIONS):
+        yield i
+
+def dataComposed(depth):
+    if depth == 1:
+        yield leaf()
+    else:
+        yield dataComposed(depth - 1)
+
+def dataNative(depth):
+    if depth == 1:
+        yield from leaf()
+    else:
+        yield from dataNative(depth - 1)
+
+def callComposed(depth):
+    if depth == 1:
+        return 'result'
+        yield
+    result = yield callComposed(depth - 1)
+    return result
+
+def callNative(depth):
+    if depth == 1:
+        return 'result'
+        yield
+    result = yield from callNative(depth - 1)
+    return result
+
+def callsComposed(depth):
+    for i in range(OPERATIONS):
+        yield callComposed(depth)
+    yield 'done'
+
+def callsNative(depth):
+    for i in range(OPERATIONS):
+        yield from callNative(depth)
+    yield 'done'
+
+def microseconds(compose, shape, depth):
+    best = None
+    for _ in range(3):
+        composed = compose(shape(depth))
+        t0 = perf_counter()
+        for _ in composed:
+            pass
+        seconds = perf_counter() - t0
+        best = seconds if best is None else min(best, seconds)
+    return best / OPERATIONS * 1e6
+
+implementations = [('Python', pyCompose)] + ([('C', cCompose)] if cextension else [])
+print('%-6s %5s' % ('shape', 'depth') + ''.join('%18s %18s' % ('%s yield' % name, '%s yield from' % name) for name, _ in implementations))
+for name, composed, native in [('data', dataComposed, dataNative), ('calls', callsComposed, callsNative)]:
+    for depth in DEPTHS:
+        print('%-6s %5d' % (name, depth) + ''.join('%18.3f %18.3f' % (microseconds(compose, composed, depth), microseconds(compose, native, depth)) for _, compose in implementations))
@@ -0,0 +1,95 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Microbenchmarks of the pure Python compose() (weightless/core/_compose_py.py), as used on PyPy and without the C extension.
+# For generator stacks of depth 1 to 20, it measures:
+# - yields: data yielded by the innermost generator, passing through the stack,
+# - calls: building the stack with retval = yield sub() and returning through every level,
+# - exceptions: an exception raised at the bottom, caught at the top.
+# Each shape is reported in microseconds per operation, with the C compose for reference when it is built.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 composePython.py)
+
+from time import perf_counter
+
+from weightless.core._compose_py import compose as pyCompose
+from weightless.core import cextension
+if cextension:
+    from weightless.core.ext import compose as cCompose
+
+OPERATIONS = 20000
+DEPTHS = [1, 2, 5, 10, 20]
+
+
+def yields(depth):
+    def level(depth):
+        if depth == 1:
+            for i in range(OPERATIONS):
+                yield i
+        else:
+            yield level(depth - 1)
+    return level(depth)
+
+def calls(depth):
+    def level(depth):
+        if depth == 1:
+            return 'result',
+            yield
+        result = yield level(depth - 1)
+        return result,
+    def caller():
+        for i in range(OPERATIONS):
+            yield level(depth)
+        yield 'done'
+    return caller()
+
+def exceptions(depth):
+    def level(depth):
+        if depth == 1:
+            raise KeyError('bottom')
+            yield
+        yield level(depth - 1)
+    def caller():
+        for i in range(OPERATIONS):
+            try:
+                yield level(depth)
+            except KeyError:
+                pass
+        yield 'done'
+    return caller()
+
+def microseconds(compose, shape, depth):
+    best = None
+    for _ in range(3):
+        composed = compose(shape(depth))
+        t0 = perf_counter()
+        for _ in composed:
+            pass
+        seconds = perf_counter() - t0
+        best = seconds if best is None else min(best, seconds)
+    return best / OPERATIONS * 1e6
+
+print('%-12s %5s %12s %12s' % ('shape', 'depth', 'Python us', 'C us' if cextension else ''))
+for shape in [yields, calls, exceptions]:
+    for depth in DEPTHS:
+        print('%-12s %5d %12.3f %12s' % (shape.__name__, depth, microseconds(pyCompose, shape, depth), '%.3f' % microseconds(cCompose, shape, depth) if cextension else ''))
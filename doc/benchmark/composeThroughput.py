@@ -0,0 +1,111 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Throughput of the C compose() (weightless.core.ext) against the pure Python one, for the shapes compose sees in a server:
+# long-running generators yielding data, call chains of sub-generators (retval = yield sub()) and data sent in (line = yield).
+# Reports messages per second for each shape and the speedup of C over Python.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 composeThroughput.py)
+
+from time import perf_counter
+
+from weightless.core._compose_py import compose as pyCompose
+from weightless.core import cextension
+
+if not cextension:
+    exit("weightless.core.ext is not available; build it with: python3 setup.py build_ext --inplace")
+from weightless.core.ext import compose as cCompose
+
+N = 200000
+DEPTH = 10
+
+
+def flatYields():
+    def producer():
+        for i in range(N):
+            yield i
+    return producer()
+
+def subGeneratorCalls():
+    def leaf(i):
+        return i,
+        yield
+    def caller():
+        for i in range(N):
+            yield leaf(i)
+        yield 'done'
+    return caller()
+
+def deepStack():
+    def level(depth):
+        if depth == 0:
+            for i in range(N):
+                yield i
+        else:
+            yield level(depth - 1)
+    return level(DEPTH)
+
+def deepCalls():
+    def level(depth, i):
+        if depth == 0:
+            return i,
+        result = yield level(depth - 1, i)
+        return result,
+        yield
+    def caller():
+        for i in range(N // DEPTH):
+            yield level(DEPTH, i)
+        yield 'done'
+    return caller()
+
+def sentData():
+    def consumer():
+        while True:
+            line = yield
+            yield line
+    return consumer()
+
+def driveYields(compose, shape):
+    composed = compose(shape())
+    t0 = perf_counter()
+    for _ in composed:
+        pass
+    return perf_counter() - t0
+
+def driveSends(compose, shape):
+    composed = compose(shape())
+    next(composed)
+    t0 = perf_counter()
+    for i in range(N):
+        composed.send(i)
+        next(composed)
+    return perf_counter() - t0
+
+def best(drive, compose, shape):
+    return min(drive(compose, shape) for _ in range(3))
+
+print('%-20s %14s %14s %8s' % ('shape (N=%d)' % N, 'Python msg/s', 'C msg/s', 'speedup'))
+for drive, shape in [(driveYields, flatYields), (driveYields, subGeneratorCalls), (driveYields, deepStack), (driveYields, deepCalls), (driveSends, sentData)]:
+    pySeconds = best(drive, pyCompose, shape)
+    cSeconds = best(drive, cCompose, shape)
+    print('%-20s %14.0f %14.0f %7.1fx' % (shape.__name__, N / pySeconds, N / cSeconds, pySeconds / cSeconds))
@@ -0,0 +1,76 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Reactor memory per registered connection, and the cost of cleaning up a file-object that went bad (closed: no fileno() anymore) among many registrations: the old scan of all registrations versus the file-object index.
+# 100k real connections won't fit in a default file-descriptor limit; socketpairs for CONNECTIONS connections (2 fds each) are used instead.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 connectionMemory.py)
+
+from socket import socketpair
+from time import monotonic
+import tracemalloc
+
+from weightless.io import Reactor
+
+CONNECTIONS = 5000
+CLEANUPS = 1000
+
+
+def memoryPerConnection(reactor, soks):
+    noop = lambda: None
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for sok in soks:
+        reactor.addReader(sok, noop)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return allocated / len(soks)
+
+def scanCleanup(reactor, obj):
+    for fd, context in list(reactor._fds.items()):
+        if context.fileOrFd == obj:
+            del reactor._fds[fd]
+
+def timeCleanups(reactor, cleanup):
+    t0 = monotonic()
+    for i in range(CLEANUPS):
+        local, remote = socketpair()
+        reactor.addReader(remote, lambda: None)
+        remote.close()
+        cleanup(remote)
+        local.close()
+    return (monotonic() - t0) / CLEANUPS
+
+pairs = [socketpair() for i in range(CONNECTIONS)]
+try:
+    with Reactor() as reactor:
+        print('%-30s %8.0f bytes' % ('memory per registration', memoryPerConnection(reactor, [remote for local, remote in pairs])))
+        print('%-30s %8.1f µs' % ('cleanup, scanning', timeCleanups(reactor, lambda sok: scanCleanup(reactor, sok)) * 1e6))
+        print('%-30s %8.1f µs' % ('cleanup, file-object index', timeCleanups(reactor, reactor._cleanFdsByFileObj) * 1e6))
+        for local, remote in pairs:
+            reactor.removeReader(remote)
+finally:
+    for local, remote in pairs:
+        local.close()
+        remote.close()
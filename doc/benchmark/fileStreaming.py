@@ -0,0 +1,117 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Streaming a file from a reactor: blocking reads in a process versus AsyncFile (reads on an Executor, with read-ahead).
+# Reports the throughput, and the lateness of a 1 ms ticker timer (median and 99th percentile): how long the reactor was kept from other work.
+# The file is in the page cache here; a slow disk is simulated with DISK_LATENCY seconds of sleep per read.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 fileStreaming.py)
+
+import os
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import monotonic, sleep
+
+from weightless.core import compose, identify
+from weightless.io import Reactor, AsyncFile
+
+SIZE = 64 * 1024 * 1024
+CHUNK = 256 * 1024
+DISK_LATENCY = 0.005
+
+
+def ticker(reactor, lateness):
+    def tick(expected=None):
+        if expected is not None:
+            lateness.append(monotonic() - expected)
+        expected = monotonic() + 0.001
+        reactor.addTimer(0.001, lambda: tick(expected))
+    tick()
+
+def blocking(reactor, path, done, diskLatency):
+    fd = os.open(path, os.O_RDONLY)
+    def process():
+        sleep(diskLatency)
+        data = os.read(fd, CHUNK)
+        done[0] += len(data)
+        if not data:
+            reactor.removeProcess(process)
+            os.close(fd)
+            done[1] = True
+    reactor.addProcess(process)
+
+def nonBlocking(reactor, path, done, diskLatency):
+    class SlowDiskFile(AsyncFile):
+        def _pread(self, offset, size):
+            sleep(diskLatency)
+            return AsyncFile._pread(self, offset, size)
+    def stream():
+        f = SlowDiskFile(path, chunkSize=CHUNK)
+        while True:
+            data = yield f.read()
+            done[0] += len(data)
+            if not data:
+                break
+        f.close()
+        done[1] = True
+    @identify
+    def process():  # As asProcess does.
+        this = yield
+        reactor.addProcess(process=this.__next__)
+        yield
+        for response in compose(stream()):
+            if callable(response):
+                response(reactor, this.__next__)
+                yield
+                response.resumeProcess()
+            yield
+        reactor.removeProcess(process=this.__next__)
+        yield
+    process()
+
+def measure(name, start, path, diskLatency):
+    done = [0, False]
+    lateness = []
+    with Reactor(timerfd=True) as reactor:
+        ticker(reactor, lateness)
+        start(reactor, path, done, diskLatency)
+        t0 = monotonic()
+        while not done[1]:
+            reactor.step()
+        seconds = monotonic() - t0
+        reactor._timerHeap[:] = []
+    lateness.sort()
+    print('%-10s disk latency %5.3f s: %7.0f MB/s, ticker late %6.2f ms (median), %6.2f ms (p99)' % (name, diskLatency, done[0] / seconds / 1e6, lateness[len(lateness) // 2] * 1000, lateness[int(len(lateness) * 0.99)] * 1000))
+
+tempdir = mkdtemp()
+try:
+    path = join(tempdir, 'data')
+    with open(path, 'wb') as f:
+        for i in range(SIZE // CHUNK):
+            f.write(os.urandom(CHUNK))
+    for diskLatency in [0, DISK_LATENCY]:
+        measure('blocking', blocking, path, diskLatency)
+        measure('AsyncFile', nonBlocking, path, diskLatency)
+finally:
+    rmtree(tempdir)
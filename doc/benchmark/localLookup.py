@@ -0,0 +1,81 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Microbenchmark of local() lookups, as done by reactor() in a callback.
+# The lookup is done from the innermost of a stack of compose'd generators of depth 1 to 50, for:
+# - scope: the name is bound by LocalScope (as Reactor.step() binds __reactor__); O(1), independent of the depth,
+# - frames: the name is a local variable of the code that resumes the stack; found by walking the frames and the generators of the compose,
+# - missing: not found at all; the whole stack is walked before AttributeError.
+# Each is reported in microseconds per lookup, for the C and the Python implementation of local().
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 localLookup.py)
+
+from time import perf_counter
+
+from weightless.core import LocalScope, cextension
+from weightless.core._local_py import local as pyLocal
+from weightless.core._compose_py import compose as pyCompose
+if cextension:
+    from weightless.core.ext import local as cLocal, compose as cCompose
+
+LOOKUPS = 20000
+DEPTHS = [1, 5, 10, 20, 50]
+
+
+def stack(depth, lookup):
+    def level(depth):
+        if depth == 1:
+            while True:
+                yield lookup()
+        else:
+            yield level(depth - 1)
+    return level(depth)
+
+def microseconds(compose, local, kind, depth):
+    name = '__missing__' if kind == 'missing' else '__reactor__'
+    def lookup():
+        try:
+            return local(name)
+        except AttributeError:
+            return None
+    best = None
+    for _ in range(3):
+        composed = compose(stack(depth, lookup))
+        t0 = perf_counter()
+        if kind == 'scope':
+            with LocalScope(__reactor__='reactor'):
+                for _ in range(LOOKUPS):
+                    next(composed)
+        else:
+            __reactor__ = 'reactor'
+            for _ in range(LOOKUPS):
+                next(composed)
+        seconds = perf_counter() - t0
+        best = seconds if best is None else min(best, seconds)
+    return best / LOOKUPS * 1e6
+
+implementations = [('Python', pyCompose, pyLocal)] + ([('C', cCompose, cLocal)] if cextension else [])
+print('%-10s' % 'kind' + '%6s' % 'depth' + ''.join('%12s' % ('%s us' % name) for name, _, _ in implementations))
+for kind in ['scope', 'frames', 'missing']:
+    for depth in DEPTHS:
+        print('%-10s' % kind + '%6d' % depth + ''.join('%12.3f' % microseconds(compose, local, kind, depth) for _, compose, local in implementations))
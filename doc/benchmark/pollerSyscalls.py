@@ -0,0 +1,102 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Poller system-calls and throughput per request-like exchange: epoll versus IoUringPoller.
+# Each exchange: a new connection is registered for reading, read, switched to writing (as HttpServer does), written and removed.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 pollerSyscalls.py)
+
+from select import epoll
+from socket import socketpair
+from time import monotonic
+
+from weightless.io import Reactor, IoUringPoller
+
+EXCHANGES = 20000
+CONCURRENT = 50
+
+
+class CountingEpoll(object):
+    syscalls = 0
+    def __init__(self):
+        self._epoll = epoll()
+    def poll(self, *args, **kwargs):
+        CountingEpoll.syscalls += 1
+        return self._epoll.poll(*args, **kwargs)
+    def register(self, *args, **kwargs):
+        CountingEpoll.syscalls += 1
+        return self._epoll.register(*args, **kwargs)
+    def modify(self, *args, **kwargs):
+        CountingEpoll.syscalls += 1
+        return self._epoll.modify(*args, **kwargs)
+    def unregister(self, *args, **kwargs):
+        CountingEpoll.syscalls += 1
+        return self._epoll.unregister(*args, **kwargs)
+    def close(self):
+        self._epoll.close()
+
+
+class CountingIoUring(IoUringPoller):
+    syscalls = 0
+    def register(self, *args, **kwargs):
+        CountingIoUring.syscalls += 1  # fstat
+        return IoUringPoller.register(self, *args, **kwargs)
+    def close(self):
+        CountingIoUring.syscalls += self.enterCalls
+        return IoUringPoller.close(self)
+
+
+def exchanges(reactor):
+    done = [0]
+    started = [0]
+    def start():
+        started[0] += 1
+        local, remote = socketpair()
+        local.send(b'request')
+        def read():
+            remote.recv(100)
+            reactor.removeReader(remote)
+            reactor.addWriter(remote, write)
+        def write():
+            remote.send(b'response')
+            reactor.removeWriter(remote)
+            remote.close()
+            local.close()
+            done[0] += 1
+            if started[0] < EXCHANGES:
+                start()
+        reactor.addReader(remote, read)
+    for i in range(CONCURRENT):
+        start()
+    t0 = monotonic()
+    while done[0] < EXCHANGES:
+        reactor.step()
+    return EXCHANGES / (monotonic() - t0)
+
+def report(name, poller):
+    with Reactor(poller=poller) as reactor:
+        perSecond = exchanges(reactor)
+    print('%-14s %8.0f exchanges/s  %5.2f poller system-calls per exchange' % (name, perSecond, poller.syscalls / EXCHANGES))
+
+report('epoll', CountingEpoll)
+report('io_uring', CountingIoUring)
@@ -0,0 +1,87 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Latency of ready fds per priority, with busy prio-0 processes (always ready) as background load.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 prioLatency.py)
+
+from random import Random
+from socket import socketpair
+from time import monotonic
+
+from weightless.io import Reactor
+
+PRIOS = [0, 3, 6, 9]
+SOCKETS_PER_PRIO = 4
+BUSY_PROCESSES = 4
+EVENTS = 4000
+
+
+def measure():
+    random = Random(42)
+    latencies = dict((prio, []) for prio in PRIOS)
+    sent = {}
+    pairs = []
+    with Reactor() as reactor:
+        for prio in PRIOS:
+            for i in range(SOCKETS_PER_PRIO):
+                receiver, sender = socketpair()
+                pairs.append((receiver, sender))
+                def sink(receiver=receiver, prio=prio):
+                    receiver.recv(1)
+                    t0, step0 = sent.pop(receiver)
+                    latencies[prio].append((monotonic() - t0, steps[0] - step0))
+                reactor.addReader(receiver, sink, prio=prio)
+        for i in range(BUSY_PROCESSES):
+            reactor.addProcess(lambda: sum(range(50)))
+        steps = [0]
+        remaining = EVENTS
+        while remaining or sent:
+            if remaining:
+                receiver, sender = random.choice(pairs)
+                if receiver not in sent:
+                    sent[receiver] = monotonic(), steps[0]
+                    sender.send(b'x')
+                    remaining -= 1
+            steps[0] += 1
+            reactor.step()
+        for receiver, sender in pairs:
+            reactor.removeReader(receiver)
+            receiver.close()
+            sender.close()
+        reactor._running.clear()
+    return latencies
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+def report(latencies):
+    for prio in PRIOS:
+        seconds = sorted(t for t, _ in latencies[prio])
+        steps = sorted(s for _, s in latencies[prio])
+        print('prio %d: n=%4d  latency (us) p50: %7.1f  p99: %7.1f  max: %7.1f  steps p50: %2d  p99: %2d  max: %2d' % (
+            prio, len(seconds),
+            percentile(seconds, 0.5) * 1e6, percentile(seconds, 0.99) * 1e6, seconds[-1] * 1e6,
+            percentile(steps, 0.5), percentile(steps, 0.99), steps[-1]))
+
+report(measure())
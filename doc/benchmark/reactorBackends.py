@@ -0,0 +1,83 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Throughput of the epoll Reactor versus the AsyncioReactor (and on uvloop, when installed): ping-pong over socketpairs, and timers.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 reactorBackends.py)
+
+from socket import socketpair
+from time import monotonic
+
+from weightless.io import Reactor, AsyncioReactor
+
+PAIRS = 50
+MESSAGES = 20000
+TIMERS = 20000
+
+def pingPong(reactor):
+    pairs = [socketpair() for i in range(PAIRS)]
+    received = [0]
+    def echo(sok):
+        data = sok.recv(100)
+        received[0] += 1
+        if received[0] + PAIRS <= MESSAGES:
+            sok.send(data)
+    for a, b in pairs:
+        reactor.addReader(a, lambda a=a: echo(a))
+        reactor.addReader(b, lambda b=b: echo(b))
+    t0 = monotonic()
+    for a, b in pairs:
+        a.send(b'ping')
+    while received[0] < MESSAGES:
+        reactor.step()
+    seconds = monotonic() - t0
+    for a, b in pairs:
+        reactor.removeReader(a)
+        reactor.removeReader(b)
+        a.close()
+        b.close()
+    return MESSAGES / seconds
+
+def timers(reactor):
+    done = [0]
+    def fired():
+        done[0] += 1
+    t0 = monotonic()
+    for i in range(TIMERS):
+        reactor.addTimer(0, fired)
+    while done[0] < TIMERS:
+        reactor.step()
+    return TIMERS / (monotonic() - t0)
+
+def report(name, createReactor):
+    with createReactor() as reactor:
+        print('%-24s ping-pong: %9.0f messages/s  timers: %9.0f timers/s' % (name, pingPong(reactor), timers(reactor)))
+
+report('Reactor (epoll)', Reactor)
+report('AsyncioReactor', AsyncioReactor)
+try:
+    import uvloop
+except ImportError:
+    print('uvloop not installed')
+else:
+    report('AsyncioReactor (uvloop)', lambda: AsyncioReactor(loop=uvloop.new_event_loop()))
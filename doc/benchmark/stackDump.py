@@ -0,0 +1,74 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Cost of stackDump() (weightless/io/_stackdump.py) on a loaded reactor, to see whether it can be triggered in production.
+# N composed generator stacks of depth 3, spread over 3 distinct places, wait as processes.  Reported: milliseconds per dump and microseconds per stack.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 stackDump.py)
+
+from time import perf_counter
+
+from weightless.core import compose, cextension
+from weightless.io import Reactor, stackDump
+
+SIZES = [1000, 10000, 50000]
+
+
+def handler(place):
+    yield database(place)
+
+def database(place):
+    yield pool(place)
+
+def pool(place):
+    while True:
+        if place == 0:
+            yield
+        elif place == 1:
+            yield
+        else:
+            yield
+
+def milliseconds(reactor):
+    best = None
+    for _ in range(3):
+        t0 = perf_counter()
+        groups = stackDump(reactor)
+        seconds = perf_counter() - t0
+        best = seconds if best is None else min(best, seconds)
+    return best * 1000, len(groups)
+
+print('compose: %s' % ('C' if cextension else 'Python'))
+print('%8s %8s %10s %10s' % ('stacks', 'groups', 'ms', 'us/stack'))
+for size in SIZES:
+    with Reactor() as reactor:
+        processes = []
+        for i in range(size):
+            process = compose(handler(i % 3))
+            next(process)
+            processes.append(process.__next__)
+            reactor.addProcess(processes[-1])
+        ms, groups = milliseconds(reactor)
+        print('%8d %8d %10.1f %10.2f' % (size, groups, ms, ms * 1000 / size))
+        for process in processes:
+            reactor.removeProcess(process)
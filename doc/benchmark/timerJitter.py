@@ -0,0 +1,61 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Wakeup jitter of Reactor timers: epoll.poll(timeout) (+ EPOLL_TIMEOUT_GRANULARITY) versus timerfd.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 timerJitter.py)
+
+from random import Random
+from time import monotonic
+
+from weightless.io import Reactor
+
+COUNT = 500
+
+def measure(**reactorKwargs):
+    random = Random(42)
+    lateness = []
+    with Reactor(**reactorKwargs) as reactor:
+        for i in range(COUNT):
+            seconds = random.uniform(0.0001, 0.005)
+            done = []
+            start = monotonic()
+            reactor.addTimer(seconds, lambda: done.append(monotonic() - start - seconds))
+            steps = 0
+            while not done:
+                steps += 1
+                reactor.step()
+            lateness.append((done[0], steps))
+    return lateness
+
+def report(name, lateness):
+    values = sorted(l for l, steps in lateness)
+    percentile = lambda p: values[min(len(values) - 1, int(p * len(values)))] * 1e6
+    print('%-8s early: %4d  steps/timer: %.2f  lateness (us) p50: %7.1f  p99: %7.1f  max: %7.1f' % (
+        name,
+        len([v for v in values if v < 0]),
+        sum(steps for l, steps in lateness) / len(lateness),
+        percentile(0.5), percentile(0.99), values[-1] * 1e6))
+
+report('epoll', measure())
+report('timerfd', measure(timerfd=True))
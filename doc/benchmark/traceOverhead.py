@@ -0,0 +1,76 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Overhead of recording a trace: steps per second of a reactor with PROCESSES processes and READERS readable sockets, without instrumentation, with ReactorInstrumentation and with a TraceRecorder.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 traceOverhead.py)
+
+from os.path import join
+from shutil import rmtree
+from socket import socketpair
+from tempfile import mkdtemp
+from time import monotonic
+
+from weightless.io import Reactor, ReactorInstrumentation, TraceRecorder, summarizeTrace
+
+STEPS = 20000
+PROCESSES = 5
+READERS = 5
+
+
+def stepsPerSecond(instrumentation):
+    pairs = [socketpair() for i in range(READERS)]
+    try:
+        with Reactor(instrumentation=instrumentation) as reactor:
+            processes = [lambda: None for i in range(PROCESSES)]
+            for process in processes:
+                reactor.addProcess(process)
+            for local, remote in pairs:
+                local.send(b'x')
+                reactor.addReader(remote, lambda: None)
+            t0 = monotonic()
+            for i in range(STEPS):
+                reactor.step()
+            result = STEPS / (monotonic() - t0)
+            for process in processes:
+                reactor.removeProcess(process)
+            for local, remote in pairs:
+                reactor.removeReader(remote)
+        return result
+    finally:
+        for local, remote in pairs:
+            local.close()
+            remote.close()
+
+tempdir = mkdtemp()
+try:
+    path = join(tempdir, 'reactor.trace')
+    print('%-22s %8.0f steps/s' % ('no instrumentation', stepsPerSecond(None)))
+    print('%-22s %8.0f steps/s' % ('ReactorInstrumentation', stepsPerSecond(ReactorInstrumentation())))
+    recorder = TraceRecorder(path)
+    print('%-22s %8.0f steps/s' % ('TraceRecorder', stepsPerSecond(recorder)))
+    recorder.close()
+    summary = summarizeTrace(path)
+    print('%d steps recorded, %d callbacks' % (summary['steps'], summary['callbackDuration']['count']))
+finally:
+    rmtree(tempdir)
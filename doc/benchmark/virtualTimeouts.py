@@ -0,0 +1,67 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Timeout-heavy load on a Reactor with a VirtualClock: CONNECTIONS simulated connections, each sending a request every few (simulated) seconds and being dropped by its idle timeout after its last one.
+# Reports the wall-clock time needed for SIMULATED seconds, and checks that two runs close the connections in the same order.
+# Run with: (cd doc/benchmark; PYTHONPATH=../.. python3 virtualTimeouts.py)
+
+from hashlib import sha1
+from random import Random
+from time import monotonic
+
+from weightless.io import Reactor, VirtualClock
+
+CONNECTIONS = 10000
+REQUESTS = 20
+IDLE_TIMEOUT = 60
+SIMULATED = IDLE_TIMEOUT + REQUESTS * 30
+
+
+def simulate(timeoutResolution):
+    random = Random(42)
+    closed = []
+    with Reactor(clock=VirtualClock(), timeoutResolution=timeoutResolution) as reactor:
+        def connection(number):
+            state = {'requests': 0, 'timeout': None}
+            def request():
+                if state['timeout'] is not None:
+                    reactor.removeTimeout(state['timeout'])
+                state['timeout'] = reactor.addTimeout(IDLE_TIMEOUT, lambda: closed.append((number, reactor.now())))
+                state['requests'] += 1
+                if state['requests'] < REQUESTS:
+                    reactor.addTimer(random.uniform(1, 30), request)
+            reactor.addTimer(random.uniform(0, 30), request)
+        for number in range(CONNECTIONS):
+            connection(number)
+        t0 = monotonic()
+        while len(closed) < CONNECTIONS:
+            reactor.step()
+        wallClock = monotonic() - t0
+        simulated = reactor.now()
+    return wallClock, simulated, sha1(repr(closed).encode()).hexdigest()
+
+for timeoutResolution in [None, 1]:
+    wallClock, simulated, digest = simulate(timeoutResolution)
+    _, _, digestAgain = simulate(timeoutResolution)
+    print('timeoutResolution=%-5s %6.0f simulated seconds in %5.2f seconds; %d timeouts, same order twice: %s' % (timeoutResolution, simulated, wallClock, CONNECTIONS * REQUESTS, digest == digestAgain))
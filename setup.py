@@ -24,7 +24,7 @@
 #
 ## end license ##
 
-from distutils.core import setup
+from setuptools import setup, Extension
 from os import walk
 
 version = '$Version: 0$'[9:-1].strip()
@@ -35,11 +35,19 @@ for path, dirs, files in walk('weightless'):
         packagename = path.replace('/', '.')
         packages.append(packagename)
 
+# Optional: without a compiler (or Python headers) weightless.core uses its pure Python versions.
+extension = Extension('weightless.core.ext',
+    sources=['weightless/core/_core.c', 'weightless/core/_compose.c', 'weightless/core/_observable.c'],
+    depends=['weightless/core/_core.h', 'weightless/core/_compose.h', 'weightless/core/_observable.h'],
+    extra_compile_args=['-O3'],
+    optional=True,
+)
 
 setup(
     name='weightless-core',
     version=version,
     packages=packages,
+    ext_modules=[extension],
     url='http://www.weightless.io',
     author='Erik J. Groeneveld',
     author_email='erik@seecr.nl',
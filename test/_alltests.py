@@ -53,12 +53,19 @@ from core.localtest import LocalTest
 from core.observabletest import ObservableTest
 from core.observabledirectedmessagingtest import ObservableDirectedMessagingTest
 from core.utilstest import UtilsTest
+from weightless.core import cextension
+if cextension:
+    from core.composetest import ComposeCTest
+    from core.composeschedulingtest import ComposeSchedulingCTest
+    from core.composeparitytest import ComposeParityTest
+    from core.observable_c_test import Observable_C_Test
 
 from _http.acceptortest import AcceptorTest
 from _http.asyncreadertest import AsyncReaderTest
 from _http.httpreadertest import HttpReaderTest
 from _http.httpservertest import HttpServerTest
 from _http.httpspectest import HttpSpecTest
+from _http.preforktest import PreforkServerTest
 from _http.httprequest1_1test import HttpRequest1_1Test
 from _http.socketpooltest import SocketPoolTest
 from _http.suspendtest import SuspendTest
@@ -69,6 +76,16 @@ from wl_io.reactortest import ReactorTest
 from wl_io.giotest import GioTest
 from wl_io.gutilstest import GutilsTest
 from wl_io.servertest import ServerTest
+from wl_io.executortest import ExecutorTest
+from wl_io.instrumentationtest import InstrumentationTest
+from wl_io.stackdumptest import StackDumpTest
+from wl_io.asyncioreactortest import AsyncioReactorTest
+from wl_io.iouringtest import IoUringPollerTest
+from wl_io.virtualclocktest import VirtualClockTest
+from wl_io.tracetest import TraceTest
+from wl_io.subprocesstest import SubprocessTest
+from wl_io.fileiotest import FileIOTest
+from wl_io.timingwheeltest import TimingWheelTest
 from wl_io.utils.asprocesstest import AsProcessTest
 
 
@@ -33,6 +33,7 @@ from os import system
 from subprocess import Popen, PIPE
 
 from weightless.http import Acceptor
+from weightless.http._acceptor import createSocket
 
 
 class AcceptorTest(TestCase):
@@ -151,3 +152,33 @@ class AcceptorTest(TestCase):
         finally:
             acceptor.close()
 
+    def testEdgeTriggeredAcceptsAllPendingConnections(self):
+        reactor = CallTrace()
+        acceptor = Acceptor(reactor, self.port, lambda sok: self.socketCatcher.append(sok) or (lambda: None), edgeTriggered=True)
+        try:
+            self.assertEqual(True, reactor.calledMethods[0].kwargs['edgeTriggered'])
+            self.assertFalse(acceptor._sok.getblocking())
+            acceptCallback = reactor.calledMethods[0].args[1]
+            with socket() as client1, socket() as client2:
+                client1.connect(('127.0.0.1', self.port))
+                client2.connect(('127.0.0.1', self.port))
+                acceptCallback()
+                self.assertEqual(2, len(self.socketCatcher))
+                self.assertEqual(['addReader', 'addReader', 'addReader'], reactor.calledMethodNames())
+                self.assertEqual(True, reactor.calledMethods[1].kwargs['edgeTriggered'])
+                acceptCallback()  # EAGAIN
+                self.assertEqual(2, len(self.socketCatcher))
+        finally:
+            acceptor.close()
+
+    def testNonBlockingSharedSocket(self):
+        reactor = CallTrace()
+        sok = createSocket(self.port)
+        sok.setblocking(False)
+        acceptor = Acceptor(reactor, self.port, self.socketCatcher.append, sok=sok)
+        try:
+            acceptCallback = reactor.calledMethods[0].args[1]
+            acceptCallback()  # No connection (taken by another process): no BlockingIOError.
+            self.assertEqual([], self.socketCatcher)
+        finally:
+            acceptor.close()
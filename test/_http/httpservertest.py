@@ -81,7 +81,7 @@ class HttpServerTest(WeightlessTestCase):
         if sokSends is not None:
             origInit = HttpHandler.__init__
 
-            def newInit(inner_self, reactor, sok, generatorFactory, timeout, recvSize=RECVSIZE, prio=None, maxConnections=None, errorHandler=None, compressResponse=False):
+            def newInit(inner_self, reactor, sok, generatorFactory, timeout, recvSize=RECVSIZE, prio=None, maxConnections=None, errorHandler=None, compressResponse=False, edgeTriggered=False):
                 logging_sok = SendLoggingMockSock(bucket=sokSends, origSock=sok)
                 origInit(inner_self,
                          reactor=reactor,
@@ -92,7 +92,8 @@ class HttpServerTest(WeightlessTestCase):
                          prio=prio,
                          maxConnections=maxConnections,
                          errorHandler=errorHandler,
-                         compressResponse=compressResponse)
+                         compressResponse=compressResponse,
+                         edgeTriggered=edgeTriggered)
 
             HttpHandler.__init__ = newInit
 
@@ -588,6 +589,46 @@ class HttpServerTest(WeightlessTestCase):
             # cleanup
             server.shutdown()
 
+    def testRequestTimeoutInTimingWheel(self):
+        with Reactor(timeoutResolution=0.01) as reactor:
+            server = HttpServer(reactor, self.port, None, timeout=0.02)
+            server.listen()
+            with clientsocket("localhost", self.port) as sok:
+                sok.send(b'GET / HTTP/1.0\r\n')
+                while select([sok],[], [], 0) != ([sok], [], []):
+                    reactor.step()
+                self.assertEqual(b'HTTP/1.0 400 Bad Request\r\n\r\n', sok.recv(4096))
+                self.assertEqual([], reactor._timers)
+
+                # cleanup
+                server.shutdown()
+
+    def testEdgeTriggeredReadsUntilEAGAIN(self):
+        requests = []
+        def onRequest(**kwargs):
+            requests.append(kwargs)
+            return (data for data in ['HTTP/1.0 200 OK\r\n\r\nhello'])
+        with Reactor() as reactor:
+            server = HttpServer(reactor, self.port, onRequest, recvSize=3, edgeTriggered=True)
+            server.listen()
+            with clientsocket("localhost", self.port) as sok1:
+                with clientsocket("localhost", self.port) as sok2:
+                    sok1.send(b'POST / HTTP/1.0\r\nContent-Length: 5\r\n\r\nhello')
+                    sok2.send(b'GET /two HTTP/1.0\r\n\r\n')
+                    sleep(0.01)
+                    reactor.step()  # accepts both connections
+                    self.assertEqual(3, len(reactor._fds))
+                    reactor.step()  # reads both requests completely; though recvSize is 3.
+                    self.assertEqual([b'/', b'/two'], sorted(r['RequestURI'] for r in requests))
+                    self.assertEqual(b'hello', [r for r in requests if r['Method'] == b'POST'][0]['Body'])
+                    while select([sok1, sok2],[], [], 0)[0] != [sok1, sok2]:
+                        reactor.step()
+                    self.assertEqual(b'HTTP/1.0 200 OK\r\n\r\nhello', sok1.recv(4096))
+            server.shutdown()
+
+    def testEdgeTriggeredNotWithSocketWrapper(self):
+        self.assertRaises(ValueError, lambda: HttpServer(CallTrace(), self.port, None, socketWrapper=lambda sok: sok, edgeTriggered=True))
+
     def testPostMethodReadsBody(self):
         self.requestData = None
         def handler(**kwargs):
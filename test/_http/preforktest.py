@@ -0,0 +1,145 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+from seecr.test.portnumbergenerator import PortNumberGenerator
+from seecr.test.io import stderr_replaced, stdout_replaced
+
+import os
+from io import StringIO
+from signal import signal, pthread_kill, SIGTERM, SIGKILL
+from socket import socket
+from threading import get_ident
+from time import sleep, monotonic
+
+from weightless.http import PreforkServer, HttpServer
+from weightless.http import _prefork as prefork
+from weightless.http._prefork import _exitCode, _exitDescription, _ShutdownRequested
+
+
+class PreforkServerTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        self.port = PortNumberGenerator.next()
+
+    def testWorkersServeOnePort(self):
+        pid = self.startSupervisor(workers=2)
+        try:
+            pids = self.collectWorkerPids(expected=2)
+            self.assertEqual(2, len(pids))
+            self.assertFalse(pid in pids)
+        finally:
+            self.stopSupervisor(pid)
+
+    def testWorkersShareInheritedSocket(self):
+        pid = self.startSupervisor(workers=2, reusePort=False)
+        try:
+            self.assertEqual(2, len(self.collectWorkerPids(expected=2)))
+        finally:
+            self.stopSupervisor(pid)
+
+    def testWorkersShareInheritedSocketWithoutExclusive(self):
+        pid = self.startSupervisor(workers=2, reusePort=False, exclusive=False)
+        try:
+            self.assertEqual(2, len(self.collectWorkerPids(expected=2)))
+        finally:
+            self.stopSupervisor(pid)
+
+    def testCrashedWorkerRestarted(self):
+        pid = self.startSupervisor(workers=1, restartDelay=0)
+        try:
+            workerPid, = self.collectWorkerPids(expected=1)
+            os.kill(workerPid, SIGKILL)
+            newPid, = self.collectWorkerPids(expected=1, exclude=workerPid)
+            self.assertNotEqual(workerPid, newPid)
+        finally:
+            self.stopSupervisor(pid)
+
+    def testExitCode(self):
+        self.assertEqual(0, _exitCode(None))
+        self.assertEqual(3, _exitCode(3))
+        err = StringIO()
+        originalStderr, prefork.stderr = prefork.stderr, err
+        try:
+            self.assertEqual(1, _exitCode('Configuration error'))
+            self.assertEqual(1, _exitCode(2.5))
+        finally:
+            prefork.stderr = originalStderr
+        self.assertEqual('Configuration error\n2.5\n', err.getvalue())
+
+    def testExitDescription(self):
+        self.assertEqual('exited with status 0', _exitDescription(0))
+        self.assertEqual('exited with status 3', _exitDescription(3 << 8))
+        self.assertEqual('was killed by signal SIGKILL', _exitDescription(SIGKILL))
+
+    def testShutdownSignalDuringForkDoesNotLoseWorker(self):
+        server = PreforkServer(port=self.port, setupWorker=None)
+        def fork():
+            pthread_kill(get_ident(), SIGTERM)  # To this thread: blocked by _fork until the pid is recorded.
+            return 12345
+        previousHandler = signal(SIGTERM, server._onSignal)
+        originalFork, os.fork = os.fork, fork
+        try:
+            self.assertRaises(_ShutdownRequested, lambda: server._fork(workerIndex=0))
+        finally:
+            os.fork = originalFork
+            signal(SIGTERM, previousHandler)
+        self.assertEqual({0: 12345}, server.workerPids())
+
+    def startSupervisor(self, reusePort=True, exclusive=None, **kwargs):
+        def setupWorker(reactor, sok, workerIndex):
+            def handler(**httpRequest):
+                yield 'HTTP/1.0 200 OK\r\n\r\n%s' % os.getpid()
+            HttpServer(reactor, self.port, handler, sok=sok, exclusive=not reusePort if exclusive is None else exclusive).listen()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                with stderr_replaced(), stdout_replaced():
+                    PreforkServer(port=self.port, setupWorker=setupWorker, reusePort=reusePort, **kwargs).run()
+            finally:
+                os._exit(0)
+        return pid
+
+    def stopSupervisor(self, pid):
+        os.kill(pid, SIGTERM)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, status)
+
+    def collectWorkerPids(self, expected, exclude=None, timeout=5.0):
+        pids = set()
+        t0 = monotonic()
+        while len(pids) < expected and monotonic() - t0 < timeout:
+            try:
+                with socket() as sok:
+                    sok.connect(('127.0.0.1', self.port))
+                    sok.send(b'GET / HTTP/1.0\r\n\r\n')
+                    response = sok.recv(4096)
+            except ConnectionError:
+                sleep(0.01)
+                continue
+            if response:
+                workerPid = int(response.split(b'\r\n\r\n', 1)[1])
+                if workerPid != exclude:
+                    pids.add(workerPid)
+        return pids
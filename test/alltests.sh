@@ -28,4 +28,9 @@ export LANG=en_US.UTF-8
 export PYTHONPATH=.:"$PYTHONPATH"
 export PYTHONWARNINGS=default
 
-python3 _alltests.py "$@"
+python3 _alltests.py "$@" || exit $?
+
+# When built, the C compose(), local() and tostring() are the default; run all tests once more with the Python versions (the C-only tests are left out then).
+if [ $# -eq 0 ]; then
+    WEIGHTLESS_COMPOSE=python python3 _alltests.py
+fi
@@ -0,0 +1,260 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from weightless.core._compose_py import compose as pyCompose, Yield as pyYield
+from weightless.core._local_py import local as pyLocal
+from weightless.core._tostring_py import tostring as pyTostring
+from weightless.core.ext import compose as cCompose, Yield as cYield, local as cLocal, tostring as cTostring
+
+
+class ComposeParityTest(TestCase):
+    """Runs the same generator programs with the C and the Python compose(), local() and tostring(); what the programs observe must be the same."""
+
+    def assertParity(self, program):
+        pyLog = program(Implementation(pyCompose, pyYield, pyLocal, pyTostring))
+        cLog = program(Implementation(cCompose, cYield, cLocal, cTostring))
+        self.assertTrue(pyLog)
+        self.assertEqual(pyLog, cLog)
+
+    def testYieldsAndReturnValues(self):
+        def program(impl):
+            def inner(n):
+                yield 'inner %s' % n
+                return n * 2
+            def middle():
+                a = yield inner(1)
+                b = yield inner(a)
+                yield 'middle %s' % b
+                return a, b, 'remaining'
+            def outer():
+                result = yield middle()
+                rest = yield
+                yield ('outer', result, rest)
+            return impl.run(outer())
+        self.assertParity(program)
+
+    def testDataProtocol(self):
+        def program(impl):
+            def reader():
+                line = yield
+                while line != 'stop':
+                    yield 'echo %s' % line
+                    line = yield
+            c = impl.compose(reader())
+            return [
+                impl.outcome(lambda: next(c)),
+                impl.outcome(lambda: c.send('one')),
+                impl.outcome(lambda: c.send('not now')),
+            ]
+        self.assertParity(program)
+
+    def testExceptions(self):
+        def program(impl):
+            log = []
+            def raiser():
+                yield 'raiser'
+                raise KeyError('inner')
+            def catcher():
+                try:
+                    yield raiser()
+                except KeyError as e:
+                    log.append(('caught', str(e)))
+                try:
+                    yield
+                except ValueError as e:
+                    log.append(('thrown in', str(e)))
+                    raise RuntimeError('out')
+            c = impl.compose(catcher())
+            log.append(impl.outcome(lambda: next(c)))
+            log.append(impl.outcome(lambda: next(c)))
+            log.append(impl.outcome(lambda: c.throw(ValueError('from outside'))))
+            log.append(impl.outcome(lambda: next(c)))
+            return log
+        self.assertParity(program)
+
+    def testCloseRunsFinallyBlocks(self):
+        def program(impl):
+            log = []
+            def inner():
+                try:
+                    yield 'inner'
+                finally:
+                    log.append('inner finally')
+            def outer():
+                try:
+                    yield inner()
+                finally:
+                    log.append('outer finally')
+            c = impl.compose(outer())
+            log.append(impl.outcome(lambda: next(c)))
+            log.append(impl.outcome(c.close))
+            log.append(impl.outcome(lambda: next(c)))
+            return log
+        self.assertParity(program)
+
+    def testStepping(self):
+        def program(impl):
+            def inner():
+                yield 'a'
+                return 'b', 'c'
+            def outer():
+                x = yield inner()
+                y = yield
+                yield (x, y)
+            return impl.run(outer(), stepping=True)
+        self.assertParity(program)
+
+    def testInvalidGenerators(self):
+        def program(impl):
+            def f():
+                yield 'used'
+            def yieldsUsed():
+                g = f()
+                next(g)
+                yield g
+            def yieldsExhausted():
+                g = f()
+                list(g)
+                yield g
+            return [impl.run(yieldsUsed()), impl.run(yieldsExhausted())]
+        self.assertParity(program)
+
+    def testLocal(self):
+        def program(impl):
+            log = []
+            def lookup(name):
+                try:
+                    log.append(impl.local(name))
+                except AttributeError as e:
+                    log.append(('AttributeError', str(e)))
+            def inner():
+                _innerVar_ = 'inner'
+                lookup('_innerVar_')
+                lookup('_outerVar_')
+                yield
+                lookup('_outerVar_')
+                lookup('_noSuchVar_')
+            def outer():
+                _outerVar_ = 'outer'
+                yield inner()
+            _outerVar_ = 'not this one'
+            impl.run(outer())
+            return log
+        self.assertParity(program)
+
+    def testToString(self):
+        def program(impl):
+            def inner():
+                yield 'inner'
+            def outer():
+                yield inner()
+            c = impl.compose(outer())
+            next(c)
+            return impl.tostring(c).split('\n')
+        self.assertParity(program)
+
+    def testToStringOfNativeDelegation(self):
+        def program(impl):
+            def inner():
+                yield 'inner'
+            def middle():
+                yield inner()
+            def outer():
+                yield from impl.compose(middle())
+            g = outer()
+            next(g)
+            return impl.tostring(g).split('\n')
+        self.assertParity(program)
+
+    def testPythonToStringOfDelegatedCCompose(self):
+        def inner():
+            yield 'inner'
+        def outer():
+            yield from cCompose(inner())
+        g = outer()
+        next(g)
+        self.assertEqual(cTostring(g), pyTostring(g))
+        self.assertEqual(['outer', 'inner'], [line.rsplit(' in ', 1)[1] for line in pyTostring(g).split('\n') if line.startswith('  File ')])
+
+    def testNativeDelegation(self):
+        def program(impl):
+            log = []
+            def readLine():
+                line = yield
+                return line.upper()
+            def readWords():
+                words = []
+                while True:
+                    word = yield from nativeReadWord()
+                    if word == 'END':
+                        return words
+                    words.append(word)
+            def nativeReadWord():
+                word = yield readLine()  # compose's call inside a native delegation
+                if word == 'BOOM':
+                    raise ValueError(word)
+                log.append(impl.local('_delegated_'))
+                return word
+            def handler():
+                _delegated_ = 'found'
+                words = yield from readWords()
+                yield ('words', words)
+                try:
+                    yield from readWords()
+                except ValueError as e:
+                    yield ('caught', str(e))
+            c = impl.compose(handler())
+            log.append(impl.outcome(lambda: next(c)))
+            log.append(impl.tostring(c).split('\n'))
+            for message in ['a', 'b', 'end', None, 'boom', None]:
+                log.append(impl.outcome(lambda: c.send(message)))
+            return log
+        self.assertParity(program)
+
+
+class Implementation(object):
+    def __init__(self, compose, Yield, local, tostring):
+        self.compose = compose
+        self.Yield = Yield
+        self.local = local
+        self.tostring = tostring
+
+    def run(self, generator, stepping=False):
+        c = self.compose(generator, stepping=stepping)
+        log = []
+        while True:
+            log.append(self.outcome(lambda: next(c)))
+            if log[-1][0] == 'raised':
+                return log
+
+    def outcome(self, f):
+        try:
+            value = f()
+        except StopIteration as e:
+            return ('raised', 'StopIteration', e.args)
+        except (AssertionError, Exception) as e:
+            return ('raised', type(e).__name__, str(e))
+        return ('value', 'Yield' if value is self.Yield else value)
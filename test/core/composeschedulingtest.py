@@ -210,7 +210,7 @@ Traceback (most recent call last):
   File "%%(__file__)s", line %(cLine)s, in testExceptionOnSendData_TransparentStepping
     c.send('data')
   File "../weightless/core/_compose_py.py", line 143, in _compose
-    raise exception[1].with_traceback(exception[2])
+    raise exception
   File "%%(__file__)s", line %(gLine)s, in g
     yield f()  # first Yield
     ^^^^^^^^^
@@ -246,7 +246,7 @@ Traceback (most recent call last):
   File "%%(__file__)s", line %(cLine)s, in testExceptionThrownInCompose_TransparentStepping
     c.throw(Exception("tripping compose"))
   File "../weightless/core/_compose_py.py", line 143, in _compose
-    raise exception[1].with_traceback(exception[2])
+    raise exception
   File "%%(__file__)s", line %(gLine)s, in g
     yield f()  # first Yield
     ^^^^^^^^^
@@ -307,7 +307,7 @@ Traceback (most recent call last):
   File "%(__file__)s", line %(cLine)s, in testUnsuitableGeneratorTracebackBeforeStepping
     next(composed)
   File "../weightless/core/_compose_py.py", line 143, in _compose
-    raise exception[1].with_traceback(exception[2])
+    raise exception
   File "%(__file__)s", line %(genYieldLine)s, in gen
     yield genF
 AssertionError: Generator already used.\n""" % {
@@ -337,7 +337,7 @@ Traceback (most recent call last):
   File "%(__file__)s", line %(cLine)s, in testExceptionThrownInCompose
     c.throw(Exception("tripping compose"))
   File "../weightless/core/_compose_py.py", line 143, in _compose
-    raise exception[1].with_traceback(exception[2])
+    raise exception
   File "%(__file__)s", line %(gLine)s, in g
     yield f()
   File "%(__file__)s", line %(fLine)s, in f
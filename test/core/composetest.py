@@ -66,7 +66,7 @@ class _ComposeTest(TestCase):
             compose()
             self.fail()
         except TypeError as e:
-            self.assertTrue("compose() missing 1 required positional argument: 'initial'" in str(e), str(e))
+            self.assertTrue(self.missingInitialMessage in str(e), str(e))
         self.assertRaises(TypeError, compose, 's')
         self.assertRaises(TypeError, compose, 0)
 
@@ -257,6 +257,19 @@ class _ComposeTest(TestCase):
         self.assertEqual(['A', 'C'], responses)
         self.assertEqual(['result', None, 'remainingData0', 'remainingData1', None, None], messages)
 
+    def testRemainingDataOfNestedReturnsKeepsItsOrder(self):
+        def f():
+            return 'a', 'b', 'c'
+            yield
+        def g():
+            a = yield f()
+            return a, 'g'
+        def h():
+            result = yield g()
+            remaining = [(yield), (yield), (yield)]
+            yield result, remaining
+        self.assertEqual([('a', ['g', 'b', 'c'])], list(compose(h())))
+
     def testStopIterationWithReturnValue(self):
         def f():
             return 'return value'
@@ -702,8 +715,8 @@ class _ComposeTest(TestCase):
         except Exception:
             exType, exValue, exTraceback = exc_info()
 
-            # TS: FIXME: traceback cleaning broken in PY3: ('_compose' below)
-            self.assertEqual(['testExceptionsHaveGeneratorCallStackAsBackTrace', '_compose', 'g', 'f'], traceback_co_names(exTraceback))
+            # TS: FIXME: traceback cleaning broken in PY3: (composeCoNames: '_compose' for the Python version)
+            self.assertEqual(['testExceptionsHaveGeneratorCallStackAsBackTrace'] + self.composeCoNames + ['g', 'f'], traceback_co_names(exTraceback))
 
     def testToStringForSimpleGenerator(self):
         line = __NEXTLINE__()
@@ -734,6 +747,46 @@ class _ComposeTest(TestCase):
         next(c)
         self.assertEqual(result, tostring(c), "\n%s\n!=\n%s\n" % (result, tostring(c)))
 
+    def testToStringFollowsYieldFrom(self):
+        l1 = __NEXTLINE__(+1)
+        def f1():
+            yield
+        l2 = __NEXTLINE__(+1)
+        def f2():
+            yield from f1()
+        l3 = __NEXTLINE__(+1)
+        def f3():
+            yield f2()
+        c = compose(f3())
+        next(c)
+        result = """  File "%(file)s", line %(l3)s, in f3
+    yield f2()
+  File "%(file)s", line %(l2)s, in f2
+    yield from f1()
+  File "%(file)s", line %(l1)s, in f1
+    yield""" % dict(file=fileDict['__file__'], l1=l1, l2=l2, l3=l3)
+        self.assertEqual(result, tostring(c))
+
+    def testToStringFollowsYieldFromCompose(self):
+        l1 = __NEXTLINE__(+1)
+        def f1():
+            yield
+        l2 = __NEXTLINE__(+1)
+        def f2():
+            yield f1()
+        l3 = __NEXTLINE__(+1)
+        def f3():
+            yield from compose(f2())
+        g = f3()
+        next(g)
+        result = """  File "%(file)s", line %(l3)s, in f3
+    yield from compose(f2())
+  File "%(file)s", line %(l2)s, in f2
+    yield f1()
+  File "%(file)s", line %(l1)s, in f1
+    yield""" % dict(file=fileDict['__file__'], l1=l1, l2=l2, l3=l3)
+        self.assertEqual(result, tostring(g))
+
     def testToStringForUnstartedGenerator(self):
         def f1():
             yield
@@ -1144,16 +1197,15 @@ class _ComposeTest(TestCase):
         except AssertionError as e:
             self.assertEqual('Generator already used.', str(e))
 
-            # TS: FIXME: traceback cleaning broken in PY3: ('_compose' below)
-            stackText = """\
+            # TS: FIXME: traceback cleaning broken in PY3: (composeTraceback: '_compose' for the Python version)
+            stackText = ("""\
 Traceback (most recent call last):
   File "%(__file__)s", line %(cLine)s, in testUnsuitableGeneratorTraceback
     next(composed)
-  File "%(py_compose)s", line 143, in _compose
-    raise exception[1].with_traceback(exception[2])
+""" + self.composeTraceback + """\
   File "%(__file__)s", line %(genYieldLine)s, in gen
     yield genF
-AssertionError: Generator already used.\n""" % {
+AssertionError: Generator already used.\n""") % {
                 '__file__': fileDict['__file__'],
                 'py_compose': fileDict['py_compose'],
                 'cLine': cLine,
@@ -1233,6 +1285,13 @@ AssertionError: Generator already used.\n""" % {
 
 
 class ComposePyTest(_ComposeTest):
+    missingInitialMessage = "compose() missing 1 required positional argument: 'initial'"
+    composeCoNames = ['_compose']
+    composeTraceback = """\
+  File "%(py_compose)s", line 143, in _compose
+    raise exception
+"""
+
     def setUp(self):
         global local, tostring, compose
         local = pyLocal
@@ -1241,6 +1300,10 @@ class ComposePyTest(_ComposeTest):
         _ComposeTest.setUp(self)
 
 class ComposeCTest(_ComposeTest):
+    missingInitialMessage = "compose() missing required argument 'initial' (pos 1)"
+    composeCoNames = []
+    composeTraceback = ''
+
     def setUp(self):
         global local, tostring, compose
         local = cLocal
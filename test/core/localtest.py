@@ -25,7 +25,7 @@
 
 from unittest import TestCase
 from sys import exc_info
-from weightless.core import local, consume
+from weightless.core import local, consume, cextension, LocalScope, compose
 
 
 class LocalTest(TestCase):
@@ -61,7 +61,7 @@ class LocalTest(TestCase):
             while t:
                 names.append(t.tb_frame.f_code.co_name)
                 t = t.tb_next
-        self.assertEqual(['testNotFoundStacktraceCleanNormalFunctions', 'a', 'b', 'local'], names)
+        self.assertEqual(['testNotFoundStacktraceCleanNormalFunctions', 'a', 'b'] + pyLocalCoNames, names)
 
     def testNotFoundStacktraceCleanGeneratorFunctions(self):
         # Py3: hiding of _compose not working anymore
@@ -83,7 +83,7 @@ class LocalTest(TestCase):
                 names.append(t.tb_frame.f_code.co_name)
                 t = t.tb_next
 
-        expectedNames = ['testNotFoundStacktraceCleanGeneratorFunctions', 'consume', '_compose', 'a', 'b', 'c', 'local']
+        expectedNames = ['testNotFoundStacktraceCleanGeneratorFunctions', 'consume'] + pyComposeCoNames + ['a', 'b', 'c'] + pyLocalCoNames
         self.assertEqual(expectedNames, names)
 
     def testVariousTypes(self):
@@ -147,3 +147,66 @@ class LocalTest(TestCase):
         except AttributeError:
             pass
 
+    def testLocalScope(self):
+        def f():
+            return local('_scoped_')
+        with LocalScope(_scoped_='aap'):
+            self.assertEqual('aap', f())
+        self.assertRaises(AttributeError, f)
+
+    def testLocalScopesNest(self):
+        def f():
+            return local('_a_'), local('_b_')
+        with LocalScope(_a_=1, _b_=2):
+            with LocalScope(_b_=3):
+                self.assertEqual((1, 3), f())
+            self.assertEqual((1, 2), f())
+
+    def testLocalScopeCanBeReentered(self):
+        def f():
+            return local('_a_')
+        outer = LocalScope(_a_='outer')
+        inner = LocalScope(_a_='inner')
+        with outer:
+            with inner:
+                with outer:
+                    self.assertEqual('outer', f())
+                self.assertEqual('inner', f())
+            self.assertEqual('outer', f())
+        self.assertRaises(AttributeError, f)
+
+    def testLocalScopeRestoredAfterException(self):
+        try:
+            with LocalScope(_a_=1):
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertRaises(AttributeError, lambda: local('_a_'))
+
+    def testLocalScopeSeenByGeneratorsResumedInside(self):
+        results = []
+        @compose
+        def g():
+            while True:
+                yield
+                results.append(local('_a_'))
+        generator = g()
+        next(generator)
+        with LocalScope(_a_=1):
+            next(generator)
+        with LocalScope(_a_=2):
+            next(generator)
+        self.assertEqual([1, 2], results)
+        self.assertRaises(AttributeError, lambda: next(generator))
+
+    def testLocalScopeBeforeFrames(self):
+        _a_ = 'frame'
+        _b_ = 'frame'
+        with LocalScope(_a_='scope'):
+            self.assertEqual('scope', local('_a_'))
+            self.assertEqual('frame', local('_b_'))
+
+
+# Frames that only the Python versions of compose() and local() add to a traceback.
+pyComposeCoNames = [] if cextension else ['_compose']
+pyLocalCoNames = [] if cextension else ['local']
@@ -35,7 +35,7 @@ from traceback import format_tb
 from inspect import isframe, getframeinfo
 from types import GeneratorType
 from functools import partial
-from weightless.core import compose, Yield, Observable, Transparent, be, tostring, NoneOfTheObserversRespond, DeclineMessage
+from weightless.core import compose, Yield, Observable, Transparent, be, tostring, NoneOfTheObserversRespond, DeclineMessage, cextension
 from weightless.core._observable import AllMessage, AnyMessage, DoMessage, OnceMessage
 from weightless.core import consume
 from unittest import TestCase
@@ -156,7 +156,7 @@ class ObservableTest(TestCase):
         except AssertionError as e:
             self.assertTrue("<bound method ObservableTest.testAllAssertsResultOfCallIsGeneratorOrComposed.<locals>.A.f of <core.observabletest.ObservableTest.testAllAssertsResultOfCallIsGeneratorOrComposed.<locals>.A object at 0x" in str(e), str(e))
             self.assertTrue(">> should have resulted in a generator." in str(e), str(e))
-            self.assertFunctionsOnTraceback("testAllAssertsResultOfCallIsGeneratorOrComposed", "_compose", "all", "all_unknown", "all", "verifyMethodResult")
+            self.assertFunctionsOnTraceback(*expected("testAllAssertsResultOfCallIsGeneratorOrComposed", "_compose", "all", "all_unknown", "all", "verifyMethodResult"))
 
         g = compose(root.all.undefinedMethod())
         try:
@@ -1275,5 +1275,7 @@ class Responder(Observable):
         yield self._value
 
 def expected(*args, exclude=None):
+    if cextension:  # The C compose() has no frame of its own.
+        return tuple(arg for arg in args if arg != '_compose')
     return args
 
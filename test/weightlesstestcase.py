@@ -31,7 +31,7 @@ from seecr.test.portnumbergenerator import PortNumberGenerator
 from contextlib import contextmanager
 from operator import xor
 from socket import socket, AF_INET, SOCK_STREAM
-from time import time, sleep
+from time import time, sleep, monotonic
 
 from os.path import join, dirname, abspath
 from io import StringIO
@@ -66,7 +66,7 @@ class WeightlessTestCase(TestCase):
         self.port = self.newPortNumber()
 
     def tearDown(self):
-        t0 = time()
+        t0 = monotonic()
         if hasattr(self, 'httpd') and hasattr(self.httpd, 'shutdown'):
             self.httpd.shutdown()
         self.reactor.shutdown()
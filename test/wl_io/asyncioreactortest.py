@@ -0,0 +1,255 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+from seecr.test.io import stderr_replaced
+from seecr.test.portnumbergenerator import PortNumberGenerator
+
+import asyncio
+from os import getpid, kill
+from signal import SIGUSR1
+from socket import socketpair, create_connection
+from threading import Thread
+
+from weightless.core import compose, identify
+from weightless.io import AsyncioReactor, Suspend, fromAwaitable, reactor
+from weightless.io.utils import asProcess
+from weightless.http import HttpServer
+
+
+class AsyncioReactorTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        self.reactor = AsyncioReactor()
+
+    def tearDown(self):
+        self.reactor.shutdown()
+        TestCase.tearDown(self)
+
+    def testReaderAndWriter(self):
+        local, remote = socketpair()
+        with local, remote:
+            log = []
+            def sink():
+                self.assertEqual(self.reactor, reactor())
+                log.append(remote.recv(10))
+            self.reactor.addReader(remote, sink)
+            self.reactor.addWriter(local, lambda: (local.send(b'ape'), self.reactor.removeWriter(local)))
+            self.assertEqual(2, self.reactor.getOpenConnections())
+            while not log:
+                self.reactor.step()
+            self.assertEqual([b'ape'], log)
+            self.reactor.removeReader(remote)
+            self.assertEqual(0, self.reactor.getOpenConnections())
+
+    def testUnsupportedModes(self):
+        local, remote = socketpair()
+        with local, remote:
+            self.assertRaises(ValueError, lambda: self.reactor.addReader(remote, lambda: None, edgeTriggered=True))
+            self.assertRaises(ValueError, lambda: self.reactor.addReader(remote, lambda: None, prio=10))
+            self.reactor.addReader(remote, lambda: None)
+            self.assertRaises(ValueError, lambda: self.reactor.addReader(remote, lambda: None))
+            self.reactor.removeReader(remote)
+
+    def testTimers(self):
+        log = []
+        self.reactor.addTimer(0.02, lambda: log.append('second'))
+        self.reactor.addTimer(0.01, lambda: log.append('first'))
+        token = self.reactor.addTimer(0.01, lambda: log.append('removed'))
+        self.reactor.removeTimer(token)
+        self.assertRaises(ValueError, lambda: self.reactor.removeTimer(token))
+        while len(log) < 2:
+            self.reactor.step()
+        self.assertEqual(['first', 'second'], log)
+
+    def testProcessesOncePerStep(self):
+        log = []
+        def process():
+            log.append(len(log))
+            if len(log) == 3:
+                self.reactor.removeProcess()
+        self.reactor.addProcess(process)
+        self.reactor.step()
+        self.assertEqual([0], log)
+        self.reactor.step()
+        self.reactor.step()
+        self.assertEqual([0, 1, 2], log)
+        self.assertEqual({}, self.reactor._running)
+
+    def testExceptionInReaderRemovesIt(self):
+        local, remote = socketpair()
+        with local, remote:
+            def sink():
+                raise RuntimeError('oops')
+            self.reactor.addReader(remote, sink)
+            local.send(b'x')
+            with stderr_replaced() as err:
+                self.reactor.step()
+            self.assertTrue('RuntimeError: oops' in err.getvalue(), err.getvalue())
+            self.assertEqual(0, self.reactor.getOpenConnections())
+
+    def testAssertionErrorRaisedFromStep(self):
+        self.reactor.addTimer(0, lambda: self.fail('raised from step'))
+        try:
+            self.reactor.step()
+            self.fail()
+        except AssertionError as e:
+            self.assertEqual('raised from step', str(e))
+
+    def testSuspendAndResumeReader(self):
+        local, remote = socketpair()
+        with local, remote:
+            log = []
+            handles = []
+            def sink():
+                log.append(remote.recv(1))
+                if len(log) == 1:
+                    handles.append(self.reactor.suspend())
+            self.reactor.addReader(remote, sink)
+            local.send(b'ab')
+            self.reactor.step()
+            self.assertEqual([b'a'], log)
+            self.assertEqual(0, self.reactor.getOpenConnections())
+            self.reactor.addTimer(0.01, lambda: None)
+            self.reactor.step()
+            self.assertEqual([b'a'], log)
+            self.reactor.resumeReader(handles[0])
+            self.reactor.step()
+            self.assertEqual([b'a', b'b'], log)
+            self.reactor.removeReader(remote)
+
+    def testCallSoonThreadsafe(self):
+        log = []
+        thread = Thread(target=lambda: self.reactor.callSoonThreadsafe(lambda: log.append(reactor())))
+        thread.start()
+        thread.join()
+        self.reactor.step()
+        self.assertEqual([self.reactor], log)
+
+    def testSignalHandler(self):
+        log = []
+        self.reactor.addSignalHandler(SIGUSR1, lambda: log.append('usr1'))
+        self.assertRaises(ValueError, lambda: self.reactor.addSignalHandler(SIGUSR1, lambda: None))
+        kill(getpid(), SIGUSR1)
+        self.reactor.step()
+        self.assertEqual(['usr1'], log)
+        self.reactor.removeSignalHandler(SIGUSR1)
+        self.assertRaises(ValueError, lambda: self.reactor.removeSignalHandler(SIGUSR1))
+
+    def testSharesLoopWithAsyncio(self):
+        log = []
+        async def coroutine():
+            await asyncio.sleep(0.01)
+            log.append('asyncio')
+        self.reactor.asyncioLoop.create_task(coroutine())
+        self.reactor.addTimer(0.02, lambda: log.append('weightless'))
+        while len(log) < 2:
+            self.reactor.step()
+        self.assertEqual(['asyncio', 'weightless'], log)
+
+    def testRunByAsyncio(self):
+        log = []
+        async def main():
+            theReactor = AsyncioReactor(loop=asyncio.get_running_loop())
+            local, remote = socketpair()
+            done = asyncio.get_running_loop().create_future()
+            def sink():
+                log.append(remote.recv(10))
+                theReactor.removeReader(remote)
+                done.set_result(None)
+            theReactor.addReader(remote, sink)
+            local.send(b'nut')
+            await done
+            local.close(); remote.close()
+        asyncio.run(main())
+        self.assertEqual([b'nut'], log)
+
+    def testHttpServer(self):
+        port = PortNumberGenerator.next()
+        def handler(**kwargs):
+            yield 'HTTP/1.0 200 OK\r\n\r\n'
+            yield (yield fromAwaitable(asyncio.sleep(0.001, result='slept')))
+        server = HttpServer(self.reactor, port, lambda **kwargs: compose(handler(**kwargs)))
+        server.listen()
+        client = create_connection(('127.0.0.1', port))
+        with client:
+            client.send(b'GET / HTTP/1.0\r\n\r\n')
+            client.setblocking(False)
+            response = b''
+            while True:
+                try:
+                    data = client.recv(100)
+                except BlockingIOError:
+                    self.reactor.step()
+                    continue
+                if not data:
+                    break
+                response += data
+        self.assertEqual(b'HTTP/1.0 200 OK\r\n\r\nslept', response)
+        server.shutdown()
+
+    def testFromAwaitable(self):
+        async def coroutine(value):
+            await asyncio.sleep(0.001)
+            return value * 2
+        async def failing():
+            raise ValueError('not even')
+        results = []
+        def generator():
+            results.append((yield fromAwaitable(coroutine(21))))
+            try:
+                yield fromAwaitable(failing())
+            except ValueError as e:
+                results.append(str(e))
+        self._runComposed(self.reactor, generator())
+        self.assertEqual([42, 'not even'], results)
+
+    def testFromAwaitableWithReactor(self):
+        async def coroutine():
+            await asyncio.sleep(0.001)
+            return ('a', 'tuple')
+        @asProcess
+        def test():
+            return [(yield fromAwaitable(coroutine()))]
+        self.assertEqual([('a', 'tuple')], test())
+
+    def _runComposed(self, theReactor, generator):
+        done = []
+        @identify
+        def process():
+            this = yield
+            theReactor.addProcess(this.__next__)
+            yield
+            for response in compose(generator):
+                if isinstance(response, Suspend):
+                    response(theReactor, this.__next__)
+                    yield
+                    response.resumeProcess()
+                yield
+            done.append(True)
+            theReactor.removeProcess(this.__next__)
+            yield
+        process()
+        while not done:
+            theReactor.step()
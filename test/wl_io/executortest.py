@@ -0,0 +1,98 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+from seecr.test import CallTrace
+
+from threading import current_thread, Event
+from time import sleep
+
+from weightless.io import Executor, ExecutorQueueFull, reactor
+from weightless.io.utils import asProcess
+
+
+class ExecutorTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        self.executor = Executor(workers=1, maxQueue=1)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        TestCase.tearDown(self)
+
+    def testResultFromOtherThread(self):
+        @asProcess
+        def test():
+            result, thread = yield self.executor.run(lambda a, b: (a + b, current_thread()), 1, b=2)
+            return [result, thread, current_thread()]
+        result, thread, mainThread = test()
+        self.assertEqual(3, result)
+        self.assertNotEqual(mainThread, thread)
+        self.assertEqual(1, self.executor.metrics()['completed'])
+
+    def testExceptionRaised(self):
+        def fn():
+            raise ValueError('Not so fast!')
+        @asProcess
+        def test():
+            try:
+                yield self.executor.run(fn)
+                self.fail()
+            except ValueError as e:
+                return str(e)
+        self.assertEqual('Not so fast!', test())
+
+    def testReactorNotBlocked(self):
+        release = Event()
+        log = []
+        def blocking():
+            release.wait(timeout=2)
+            log.append('blocking done')
+            return 'done'
+        @asProcess
+        def test():
+            reactor().addTimer(0.01, lambda: (log.append('timer'), release.set()))
+            return (yield self.executor.run(blocking))
+        self.assertEqual('done', test())
+        self.assertEqual(['timer', 'blocking done'], log)
+
+    def testBoundedQueueAndMetrics(self):
+        release = Event()
+        reactor = CallTrace('reactor')
+        def blocked():
+            release.wait(timeout=2)
+        next(self.executor.run(blocked))(reactor, lambda: None)
+        while self.executor.metrics()['running'] != 1:
+            sleep(0.001)
+        next(self.executor.run(blocked))(reactor, lambda: None)
+        self.assertEqual(1, self.executor.metrics()['queued'])
+        self.assertRaises(ExecutorQueueFull, lambda: next(self.executor.run(blocked)))
+
+        release.set()
+        self.executor.shutdown()
+        self.assertEqual(['suspend', 'suspend', 'callSoonThreadsafe', 'callSoonThreadsafe'], reactor.calledMethodNames())
+        metrics = self.executor.metrics()
+        self.assertEqual({'workers': 1, 'queued': 0, 'running': 0, 'completed': 2}, dict((k, metrics[k]) for k in ['workers', 'queued', 'running', 'completed']))
+        self.assertTrue(metrics['queueWaitMax'] > 0, metrics)
+        self.assertTrue(metrics['queueWaitTotal'] >= metrics['queueWaitMax'], metrics)
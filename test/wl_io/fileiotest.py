@@ -0,0 +1,166 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+
+from weightless.core import compose
+from weightless.io import AsyncFile, streamFile, Executor, reactor
+from weightless.io.utils import asProcess
+
+
+class FileIOTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        self.tempdir = mkdtemp()
+        self.path = join(self.tempdir, 'data')
+        self.executor = Executor(workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        rmtree(self.tempdir)
+        TestCase.tearDown(self)
+
+    def testWriteThenRead(self):
+        @asProcess
+        def test():
+            f = AsyncFile(self.path, 'w', executor=self.executor)
+            yield f.write(b'hello ')
+            yield f.write(bytearray(b'world'))
+            f.close()
+            f = AsyncFile(self.path, chunkSize=4, executor=self.executor)
+            chunks = []
+            while True:
+                data = yield f.read()
+                if not data:
+                    break
+                chunks.append(data)
+            f.close()
+            return chunks
+        self.assertEqual([b'hell', b'o wo', b'rld'], test())
+
+    def testAppend(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'one ')
+        @asProcess
+        def test():
+            f = AsyncFile(self.path, 'a', executor=self.executor)
+            yield f.write(b'two')
+            f.close()
+        test()
+        with open(self.path, 'rb') as f:
+            self.assertEqual(b'one two', f.read())
+
+    def testReadAheadBounded(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 10000)
+        calls = []
+        class CountingExecutor(Executor):
+            def submit(self, fn, *args):
+                calls.append(args)
+                return Executor.submit(self, fn, *args)
+        executor = CountingExecutor(workers=1)
+        @asProcess
+        def test():
+            f = AsyncFile(self.path, chunkSize=4000, executor=executor)
+            data = yield f.read()
+            self.assertEqual([(0, 4000), (4000, 4000)], calls)  # Next chunk is read ahead.
+            data = yield f.read()
+            self.assertEqual(4000, len(data))
+            self.assertEqual([(0, 4000), (4000, 4000), (8000, 4000)], calls)
+            data = yield f.read(10)  # Other size: read ahead not used.
+            self.assertEqual(10, len(data))
+            self.assertEqual([(8000, 10), (8010, 10)], calls[-2:])
+            f.close()
+        try:
+            test()
+        finally:
+            executor.shutdown()
+
+    def testReactorNotBlocked(self):
+        release = Event()
+        log = []
+        class SlowDisk(Executor):
+            def submit(self, fn, *args):
+                def slow(*args):
+                    release.wait(timeout=2)
+                    return fn(*args)
+                return Executor.submit(self, slow, *args)
+        with open(self.path, 'wb') as f:
+            f.write(b'data')
+        executor = SlowDisk(workers=1)
+        @asProcess
+        def test():
+            reactor().addTimer(0.01, lambda: (log.append('timer'), release.set()))
+            f = AsyncFile(self.path, executor=executor)
+            log.append((yield f.read()))
+            f.close()
+        try:
+            test()
+        finally:
+            executor.shutdown()
+        self.assertEqual(['timer', b'data'], log)
+
+    def testReadErrorRaised(self):
+        @asProcess
+        def test():
+            f = AsyncFile(join(self.tempdir, 'missing'), executor=self.executor)
+            try:
+                yield f.read()
+                self.fail()
+            except FileNotFoundError:
+                pass
+            f.close()
+            try:
+                yield f.read()
+                self.fail()
+            except ValueError as e:
+                self.assertEqual('I/O operation on closed file.', str(e))
+        test()
+
+    def testInvalidMode(self):
+        self.assertRaises(ValueError, lambda: AsyncFile(self.path, 'rw'))
+
+    def testStreamFile(self):
+        content = bytes(range(256)) * 1000
+        with open(self.path, 'wb') as f:
+            f.write(content)
+        @asProcess
+        def test():
+            chunks = []
+            def collect():
+                for chunk in compose(streamFile(self.path, chunkSize=10000, executor=self.executor)):
+                    if type(chunk) is bytes:
+                        chunks.append(chunk)
+                    else:
+                        yield chunk
+            yield collect()
+            return chunks
+        chunks = test()
+        self.assertEqual(content, b''.join(chunks))
+        self.assertTrue(all(len(chunk) <= 10000 for chunk in chunks))
@@ -159,6 +159,25 @@ class GioTest(WeightlessTestCase):
         self.assertEqual('1234abcd', open(self.tempdir+'/1').read())
         self.assertEqual('abcd1234', open(self.tempdir+'/2').read())
 
+    def testFileContextReadAndWrite(self):
+        with open(self.tempfile, 'w') as f:
+            f.write('read this!')
+        done = []
+        def myProcessor():
+            with giopen(self.tempfile, 'rw') as datastream:
+                self.assertTrue(isinstance(datastream, Context))
+                self.dataIn = yield
+                yield 'write this!'
+            done.append(True)
+        with Reactor() as reactor:
+            Gio(reactor, myProcessor())
+            while not done:
+                reactor.step()
+            self.assertEqual({}, reactor._fds)
+        self.assertEqual('read this!', self.dataIn)
+        with open(self.tempfile) as f:
+            self.assertEqual('read this!write this!', f.read())
+
     def testSocketHandshake(self):
         with Reactor() as reactor:
             lhs, rhs = socketpair()
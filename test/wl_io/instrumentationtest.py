@@ -0,0 +1,78 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from socket import socketpair
+from time import sleep
+
+from weightless.core import compose, cextension
+from weightless.io import Reactor, ReactorInstrumentation, Histogram
+
+
+class InstrumentationTest(TestCase):
+    def testHistogram(self):
+        h = Histogram([1, 10, 100])
+        for value in [0, 1, 2, 10, 11, 1000]:
+            h.add(value)
+        self.assertEqual({'bounds': (1, 10, 100), 'counts': [2, 2, 1, 1], 'count': 6, 'total': 1024, 'max': 1000}, h.asDict())
+
+    def testPollAndEventsAndTimerLateness(self):
+        instrumentation = ReactorInstrumentation()
+        with Reactor(instrumentation=instrumentation) as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                reactor.addReader(rFD, lambda: rFD.recv(10))
+                reactor.addTimer(0, lambda: None)
+                wFD.send(b'x')
+                reactor.step()
+                reactor.removeReader(rFD)
+        result = instrumentation.asDict()
+        self.assertEqual(1, result['pollWait']['count'])
+        self.assertEqual(1, result['eventsPerStep']['count'])
+        self.assertEqual(1, result['eventsPerStep']['max'])
+        self.assertEqual(1, result['timerLateness']['count'])
+        self.assertEqual(2, result['callbackDuration']['count'])
+        self.assertEqual(0, result['slowCallbacks'])
+
+    def testSlowCallbackReport(self):
+        reports = []
+        instrumentation = ReactorInstrumentation(slowCallbackThreshold=0.001, onSlowCallback=reports.append)
+        def slowSubGenerator():
+            sleep(0.002)
+            yield
+            yield
+        def process():
+            yield slowSubGenerator()
+        with Reactor(instrumentation=instrumentation) as reactor:
+            reactor.addProcess(compose(process()).__next__)
+            reactor.step()
+            reactor.removeProcess(reactor.currentcontext.callback)
+        self.assertEqual(1, len(reports))
+        report = reports[0]
+        self.assertTrue(report.startswith('[Reactor]: slow callback (0.00'), report)
+        self.assertTrue(('compose.__next__' if cextension else '__next__ of generator _compose') in report, report)
+        self.assertTrue('in process\n' in report, report)
+        self.assertTrue('in slowSubGenerator\n' in report, report)
+        self.assertEqual(1, instrumentation.slowCallbacks)
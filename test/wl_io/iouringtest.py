@@ -0,0 +1,133 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from os import close, pipe
+from select import epoll, EPOLLIN, EPOLLOUT, EPOLLET, EPOLLONESHOT
+from socket import socketpair
+from tempfile import TemporaryFile
+from threading import Thread
+from time import monotonic
+
+from weightless.io import IoUringPoller, ioUringOrEpoll, Reactor
+
+
+class IoUringPollerTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        try:
+            self.poller = IoUringPoller(entries=8)
+        except OSError as e:
+            self.skipTest('io_uring not available: %s' % e)
+        self.local, self.remote = socketpair()
+        self.fd = self.remote.fileno()
+
+    def tearDown(self):
+        self.poller.close()
+        self.local.close()
+        self.remote.close()
+        TestCase.tearDown(self)
+
+    def testLevelTriggered(self):
+        self.poller.register(self.fd, EPOLLIN)
+        self.assertEqual([], self.poller.poll(0))
+        self.local.send(b'ab')
+        self.assertEqual([(self.fd, EPOLLIN)], self.poller.poll(1))
+        self.assertEqual([(self.fd, EPOLLIN)], self.poller.poll(1))  # Still readable.
+        self.remote.recv(2)
+        self.assertEqual([], self.poller.poll(0.01))
+
+    def testModifyAndUnregister(self):
+        self.poller.register(self.remote, EPOLLIN)
+        self.poller.modify(self.fd, EPOLLOUT)
+        self.assertEqual([(self.fd, EPOLLOUT)], self.poller.poll(1))
+        self.poller.unregister(self.fd)
+        self.assertEqual([], self.poller.poll(0.01))
+        self.assertRaises(FileNotFoundError, lambda: self.poller.unregister(self.fd))
+        self.assertRaises(FileNotFoundError, lambda: self.poller.modify(self.fd, EPOLLIN))
+
+    def testEdgeTriggered(self):
+        self.poller.register(self.fd, EPOLLIN | EPOLLET)
+        self.local.send(b'a')
+        self.assertEqual([(self.fd, EPOLLIN)], self.poller.poll(1))
+        self.assertEqual([], self.poller.poll(0.01))  # Not read, but no new edge.
+        self.local.send(b'b')
+        self.assertEqual([(self.fd, EPOLLIN)], self.poller.poll(1))
+
+    def testOneshot(self):
+        self.poller.register(self.fd, EPOLLIN | EPOLLONESHOT)
+        self.local.send(b'a')
+        self.assertEqual([(self.fd, EPOLLIN)], self.poller.poll(1))
+        self.assertEqual([], self.poller.poll(0.01))  # Disabled
+        self.poller.modify(self.fd, EPOLLIN | EPOLLONESHOT)
+        self.assertEqual([(self.fd, EPOLLIN)], self.poller.poll(1))
+
+    def testRefusedAsEpollWould(self):
+        r, w = pipe()
+        close(r); close(w)
+        self.assertRaises(OSError, lambda: self.poller.register(r, EPOLLIN))
+        with TemporaryFile() as f:
+            self.assertRaises(PermissionError, lambda: self.poller.register(f, EPOLLIN))
+        self.assertRaises(TypeError, lambda: self.poller.register('not a file', EPOLLIN))
+
+    def testTimeout(self):
+        self.poller.register(self.fd, EPOLLIN)
+        t0 = monotonic()
+        self.assertEqual([], self.poller.poll(0.05))
+        self.assertTrue(0.04 < monotonic() - t0 < 1)
+
+    def testManyRegistrationsBatched(self):
+        pairs = [socketpair() for i in range(20)]  # More than the 8 entries of the submission ring.
+        try:
+            for a, b in pairs:
+                self.poller.register(b, EPOLLOUT)
+            self.assertEqual(sorted(b.fileno() for a, b in pairs), sorted(fd for fd, _ in self.poller.poll(1)))
+        finally:
+            for a, b in pairs:
+                self.poller.unregister(b)
+                a.close()
+                b.close()
+
+    def testReactor(self):
+        log = []
+        with Reactor(poller=IoUringPoller) as reactor:
+            reactor.addReader(self.remote, lambda: log.append(self.remote.recv(10)))
+            self.local.send(b'ape')
+            reactor.step()
+            self.assertEqual([b'ape'], log)
+            reactor.removeReader(self.remote)
+
+            thread = Thread(target=lambda: reactor.callSoonThreadsafe(lambda: log.append('wake-up')))
+            thread.start()
+            reactor.step()
+            thread.join()
+            self.assertEqual([b'ape', 'wake-up'], log)
+
+    def testIoUringOrEpoll(self):
+        poller = ioUringOrEpoll()
+        try:
+            self.assertTrue(type(poller) in (IoUringPoller, epoll))
+        finally:
+            poller.close()
@@ -38,16 +38,17 @@ from io import StringIO
 from errno import EPERM, EBADF, EINTR, EIO
 from inspect import currentframe
 from select import error as ioerror, select
+from signal import signal, pthread_sigmask, pthread_kill, SIG_BLOCK, SIGUSR1, SIGUSR2, SIGHUP
 from socket import socketpair, error, socket
 from tempfile import mkstemp
-from threading import Thread
-from time import time, sleep
+from threading import Thread, get_ident
+from time import time, sleep, monotonic
 
 from weightless.core.utils import identify
 from weightless.io import Reactor, reactor
 from weightless.io.utils import asProcess, sleep as zleep
 
-from weightless.io._reactor import EPOLLIN, EPOLL_TIMEOUT_GRANULARITY, _FDContext, _ProcessContext, _shutdownMessage
+from weightless.io._reactor import EPOLLIN, EPOLL_TIMEOUT_GRANULARITY, TIMER_COMPACT_THRESHOLD, READ_INTENT, WRITE_INTENT, _FDContext, _ProcessContext, _shutdownMessage, _addTimeout, _removeTimeout
 
 
 class ReactorTest(WeightlessTestCase):
@@ -230,6 +231,58 @@ class ReactorTest(WeightlessTestCase):
             reactor.removeTimer(token1)
             self.assertEqual([], reactor._timers)
 
+    def testRemoveTimerTwiceOrAfterExpiryRaises(self):
+        with Reactor() as reactor:
+            called = []
+            token1 = reactor.addTimer(0, lambda: called.append(True))
+            token2 = reactor.addTimer(1, lambda: None)
+            reactor.removeTimer(token2)
+            self.assertRaises(ValueError, lambda: reactor.removeTimer(token2))
+            reactor.step()
+            self.assertEqual([True], called)
+            self.assertRaises(ValueError, lambda: reactor.removeTimer(token1))
+            self.assertEqual([], reactor._timers)
+
+    def testRemovedTimersAreCompacted(self):
+        with Reactor() as reactor:
+            tokens = [reactor.addTimer(1, lambda: None) for i in range(1000)]
+            for token in tokens[:-1]:
+                reactor.removeTimer(token)
+            self.assertTrue(len(reactor._timerHeap) < 2 * TIMER_COMPACT_THRESHOLD, len(reactor._timerHeap))
+            self.assertEqual([tokens[-1]], reactor._timers)
+            reactor.removeTimer(tokens[-1])
+
+    def testTimeoutHelpersFallBackToTimers(self):
+        log = []
+        class TimersOnlyReactor(object):
+            def addTimer(self, seconds, callback):
+                log.append(('addTimer', seconds, callback))
+                return 'token'
+            def removeTimer(self, token):
+                log.append(('removeTimer', token))
+        other = TimersOnlyReactor()
+        callback = lambda: None
+        self.assertEqual('token', _addTimeout(other, 2, callback))
+        _removeTimeout(other, 'token')
+        self.assertEqual([('addTimer', 2, callback), ('removeTimer', 'token')], log)
+        with Reactor(timeoutResolution=0.1) as reactor:
+            token = _addTimeout(reactor, 2, callback)
+            self.assertEqual(1, len(reactor._timingWheel))
+            _removeTimeout(reactor, token)
+            self.assertEqual(0, len(reactor._timingWheel))
+
+    def testTimerAddedByTimerCallbackIsEffectiveWithNextStep(self):
+        log = []
+        with Reactor() as reactor:
+            def first():
+                log.append('first')
+                reactor.addTimer(0, lambda: log.append('second'))
+            reactor.addTimer(0, first)
+            reactor.step()
+            self.assertEqual(['first'], log)
+            reactor.step()
+            self.assertEqual(['first', 'second'], log)
+
     def testRemoveEffectiveImmediately(self):
         log = []
         processDone = []
@@ -774,33 +827,92 @@ class ReactorTest(WeightlessTestCase):
             thereactor.addTimer(0, handler)
             thereactor.step()
 
+    def testGlobalReactorNested(self):
+        log = []
+        with Reactor() as outer:
+            with Reactor() as inner:
+                inner.addTimer(0, lambda: log.append(reactor()))
+                def handler():
+                    log.append(reactor())
+                    inner.step()
+                    log.append(reactor())
+                outer.addTimer(0, handler)
+                outer.step()
+        self.assertEqual([outer, inner, outer], log)
+        self.assertRaises(AttributeError, reactor)
+
     def testReadPriorities(self):
         with Reactor() as reactor:
             local0, remote0 = socketpair()
-            local1, remote1 = socketpair()
-            data0 = []
-            def remoteHandler0():
-                data0.append(remote0.recv(999))
-            data1 = []
-            def remoteHandler1():
-                data1.append(remote1.recv(999))
-            reactor.addReader(remote0, remoteHandler0, 0)
-            reactor.addReader(remote1, remoteHandler1, 2)
-            local0.send(b'ape')
-            local1.send(b'nut')
-            reactor.step() #0
-            self.assertEqual([b'ape'], data0)
-            self.assertEqual([], data1)
-            reactor.step() #1
-            self.assertEqual([], data1)
-            reactor.step() #2
-            self.assertEqual([b'nut'], data1)
+            local5, remote5 = socketpair()
+            steps0 = []
+            steps5 = []
+            reactor.addReader(remote0, lambda: steps0.append(reactor._stepCount), 0)
+            reactor.addReader(remote5, lambda: steps5.append(reactor._stepCount), 5)
+            local0.send(b'ape')  # Never read; stays readable
+            local5.send(b'nut')
+            for i in range(10):
+                reactor.step()
+            self.assertEqual(list(range(1, 11)), steps0)
+            self.assertEqual([1, 2, 4, 6, 8, 10], steps5)  # Half the steps, after one step of credit for idle time.
 
-            # cleanup
             reactor.removeReader(remote0)
-            reactor.removeReader(remote1)
+            del steps5[:]
+            for i in range(3):
+                reactor.step()
+            self.assertEqual([11, 12, 13], steps5)  # No contention, no steps wasted.
+
+            # cleanup
+            reactor.removeReader(remote5)
             local0.close(); remote0.close()
-            local1.close(); remote1.close()
+            local5.close(); remote5.close()
+
+    def testIdleLowPriorityReaderCalledRightAway(self):
+        with Reactor() as reactor:
+            local, remote = socketpair()
+            data = []
+            def handler():
+                data.append((reactor._stepCount, remote.recv(999)))
+            reactor.addReader(remote, handler, Reactor.MAXPRIO - 1)
+            busy = lambda: None
+            reactor.addProcess(busy)
+            for i in range(5):
+                reactor.step()
+            local.send(b'ape')
+            reactor.step()
+            self.assertEqual([(6, b'ape')], data)
+            local.send(b'nut')
+            for i in range(9):
+                reactor.step()
+            self.assertEqual([(6, b'ape'), (15, b'nut')], data)  # Once in MAXPRIO steps, with one step of credit.
+
+            # cleanup
+            reactor.removeProcess(busy)
+            reactor.removeReader(remote)
+            local.close(); remote.close()
+
+    def testLowPriorityReaderNotStarvedAfterRunningUncontended(self):
+        with Reactor() as reactor:
+            local, remote = socketpair()
+            local.send(b'x')  # Stays readable.
+            steps = []
+            reactor.addReader(remote, lambda: steps.append(reactor._stepCount), Reactor.MAXPRIO - 1)
+            for i in range(200):
+                reactor.step()
+            self.assertEqual(200, len(steps))  # Uncontended: every step.
+
+            busy = lambda: None
+            reactor.addProcess(busy)
+            del steps[:]
+            for i in range(100):
+                reactor.step()
+            self.assertEqual(10, len(steps))  # Once in MAXPRIO steps, right from the start.
+            self.assertTrue(steps[0] <= 200 + Reactor.MAXPRIO, steps)
+
+            # cleanup
+            reactor.removeProcess(busy)
+            reactor.removeReader(remote)
+            local.close(); remote.close()
 
     def testMinandMaxPrio(self):
         with Reactor() as reactor:
@@ -839,35 +951,21 @@ class ReactorTest(WeightlessTestCase):
     def testWritePrio(self):
         with Reactor() as reactor:
             local0, remote0 = socketpair()
-            local1, remote1 = socketpair()
-            local1.setblocking(0)
-            def remoteHandler0():
-                remote0.send(b'ape')
-            def remoteHandler1():
-                remote1.send(b'nut')
-            reactor.addWriter(remote0, remoteHandler0, 0)
-            reactor.addWriter(remote1, remoteHandler1, 2)
-            reactor.step() #0
-            self.assertEqual(b'ape', local0.recv(999))
-            try:
-                local1.recv(999)
-                self.fail('must be no data on the socket yet')
-            except error:
-                pass
-            reactor.step() #1
-            try:
-                local1.recv(999)
-                self.fail('must be no data on the socket yet')
-            except error:
-                pass
-            reactor.step() #2
-            self.assertEqual(b'nut', local1.recv(999))
+            local2, remote2 = socketpair()
+            steps0 = []
+            steps2 = []
+            reactor.addWriter(remote0, lambda: steps0.append(reactor._stepCount), 0)
+            reactor.addWriter(remote2, lambda: steps2.append(reactor._stepCount), 2)
+            for i in range(10):
+                reactor.step()
+            self.assertEqual(list(range(1, 11)), steps0)
+            self.assertEqual([1, 2, 3, 4, 5, 7, 8, 9, 10], steps2)  # 8 of each 10 steps.
 
             # cleanup
             reactor.removeWriter(remote0)
-            reactor.removeWriter(remote1)
+            reactor.removeWriter(remote2)
             local0.close(); remote0.close()
-            local1.close(); remote1.close()
+            local2.close(); remote2.close()
 
     def testGetOpenConnections(self):
         with readAndWritable() as rw1, readAndWritable() as rw2:
@@ -983,53 +1081,114 @@ class ReactorTest(WeightlessTestCase):
     def testProcessPriority(self):
         with Reactor() as reactor:
             trace = []
-
-            defaultPass = iter(list(range(99)))
             def defaultPrio():
-                trace.append('default_%s' % next(defaultPass))
-
-            highPass = iter(list(range(99)))
+                trace.append('default')
             def highPrio():
-                trace.append('high_%s' % next(highPass))
-
-            lowPass = iter(list(range(99)))
+                trace.append('high')
             def lowPrio():
-                trace.append('low_%s' % next(lowPass))
+                trace.append('low')
 
             reactor.addProcess(defaultPrio)  # prio will be 0, "very high"
             reactor.addProcess(highPrio, prio=1)
             reactor.addProcess(lowPrio, prio=3)
 
             reactor.step()
-            self.assertEqual([
-                    'default_0',
-                ], trace)
+            self.assertEqual(['default', 'high', 'low'], trace)
+
+            for i in range(19):
+                reactor.step()
+            self.assertEqual(20, trace.count('default'))
+            self.assertEqual(19, trace.count('high'))  # 9 of each 10 steps, plus credit
+            self.assertEqual(15, trace.count('low'))  # 7 of each 10 steps, plus credit
+
+            # cleanup
+            reactor.removeProcess(defaultPrio)
+            reactor.removeProcess(highPrio)
+            reactor.removeProcess(lowPrio)
+
+    def testProcessTimeBudgetCallsProcessesRoundAfterRound(self):
+        with Reactor(processTimeBudget=10.0) as reactor:
+            calls = []
+            def process():
+                calls.append(reactor._stepCount)
+                if len(calls) >= 5:
+                    reactor.idle()
+            reactor.addProcess(process)
+            reactor.step()
+            self.assertEqual([1, 1, 1, 1, 1], calls)  # Until all are idle (or the budget is spent).
+            reactor.step()
+            self.assertEqual([1, 1, 1, 1, 1, 2], calls)
+            reactor.removeProcess(process)
 
+        with Reactor() as reactor:
+            calls = []
+            reactor.addProcess(lambda: calls.append(reactor._stepCount))
+            reactor.step()
+            reactor.step()
+            self.assertEqual([1, 2], calls)  # Without a budget, once per step.
+            reactor._running.clear()
+
+    def testIdleProcessesBackOff(self):
+        with Reactor(maxIdleBackoff=0.004) as reactor:
+            busy = []
+            def process():
+                if not busy:
+                    reactor.idle()
+            reactor.addProcess(process)
+            backoffs = []
+            for i in range(4):
+                reactor.step()
+                backoffs.append(reactor._processBackoff)
+            self.assertEqual([0.001, 0.002, 0.004, 0.004], backoffs)
+            t0 = monotonic()
             reactor.step()
-            self.assertEqual(set([
-                    'default_0',
-                    'high_0', 'default_1',
-                ]), set(trace))
+            self.assertTrue(monotonic() - t0 >= 0.003)
 
+            busy.append(True)
             reactor.step()
-            self.assertEqual(set([
-                    'default_0',
-                    'high_0', 'default_1',
-                    'high_1', 'default_2',
-                ]), set(trace))
+            self.assertEqual(0, reactor._processBackoff)
+            reactor.removeProcess(process)
+
+            self.assertRaises(RuntimeError, reactor.idle)
 
+    def testAddProcessEndsBackOff(self):
+        with Reactor() as reactor:
+            idler = lambda: reactor.idle()
+            reactor.addProcess(idler)
             reactor.step()
-            self.assertEqual(set([
-                    'default_0',
-                    'high_0', 'default_1',
-                    'high_1', 'default_2',
-                    'high_2', 'low_0', 'default_3',
-                ]), set(trace))
+            self.assertEqual(0.001, reactor._processBackoff)
+            other = lambda: None
+            reactor.addProcess(other)
+            self.assertEqual(0, reactor._processBackoff)
+            reactor.removeProcess(idler)
+            reactor.removeProcess(other)
+
+    def testYieldUntilIO(self):
+        with Reactor() as reactor:
+            calls = []
+            def process():
+                calls.append(reactor._stepCount)
+                reactor.yieldUntilIO()
+            reactor.addProcess(process)
+            reactor.step()
+            self.assertEqual([1], calls)
+            self.assertEqual({}, reactor._running)
 
-            # cleanup
-            reactor.removeProcess(defaultPrio)
-            reactor.removeProcess(highPrio)
-            reactor.removeProcess(lowPrio)
+            reactor.addTimer(0, lambda: None)
+            reactor.step()
+            self.assertEqual([1], calls)  # Timers are not I/O.
+
+            local, remote = socketpair()
+            with local, remote:
+                reactor.addReader(remote, lambda: remote.recv(10))
+                local.send(b'x')
+                reactor.step()
+                self.assertEqual([1, 3], calls)
+                reactor.removeReader(remote)
+
+            self.assertRaises(ValueError, lambda: reactor.addProcess(process))
+            self.assertTrue(reactor.removeProcess(process))
+            self.assertEqual({}, reactor._waitingForIO)
 
     def testProcessWithSuspend(self):
         with Reactor() as reactor:
@@ -1201,10 +1360,246 @@ class ReactorTest(WeightlessTestCase):
 
                 reactor.step()      # suspends
                 self.assertEqual(0, fdsLenFromReactor(reactor))
-                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))
                 self.assertEqual(1, len(reactor._suspended))
 
                 reactor.cleanup(rwFD)
+                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))
+
+    def testSuspendedFdParkedInsteadOfUnregistered(self):
+        log = []
+        with Reactor() as reactor:
+            rwFD, other = socketpair()
+            with rwFD, other:
+                def suspendCb():
+                    log.append('suspend')
+                    handle.append(reactor.suspend())
+                handle = []
+                reactor.addWriter(sok=rwFD, source=suspendCb)
+                counts = reactor.getEpollCtlCounts()
+
+                reactor.step()      # suspends; no epoll_ctl
+                self.assertEqual(['suspend'], log)
+                self.assertEqual(counts['calls'], reactor.getEpollCtlCounts()['calls'])
+
+                reactor.step()      # event for suspended fd; parks it
+                self.assertEqual(['suspend'], log)
+                self.assertTrue(reactor._suspended[handle[0]].parked)
+                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))
+
+                reactor.resumeWriter(handle.pop())
+                self.assertEqual(set([rwFD.fileno()]), fdsReadyFromReactorEpoll(reactor))
+                reactor.step()      # suspends again
+                self.assertEqual(['suspend', 'suspend'], log)
+                reactor.resumeWriter(handle.pop())  # Not parked; no epoll_ctl needed
+                self.assertEqual({'calls': counts['calls'] + 2, 'saved': counts['saved'] + 2}, reactor.getEpollCtlCounts())
+
+                reactor.removeWriter(rwFD)
+
+    def testResumeWithOtherIntentModifiesEpollRegistration(self):
+        with Reactor() as reactor:
+            rwFD, other = socketpair()
+            with rwFD, other:
+                def suspendCb():
+                    handle.append(reactor.suspend())
+                handle = []
+                reactor.addWriter(sok=rwFD, source=suspendCb)
+                reactor.step()
+                reactor.resumeReader(handle.pop())
+                self.assertEqual(READ_INTENT, reactor._fds[rwFD.fileno()].intent)
+                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))
+                other.send(b'x')
+                self.assertEqual(set([rwFD.fileno()]), fdsReadyFromReactorEpoll(reactor))
+                reactor.removeReader(rwFD)
+
+    def testResumeClosedSuspendedSocketGivesLastCall(self):
+        log = []
+        with Reactor() as reactor:
+            rwFD = readAndWritable()
+            def suspendCb():
+                log.append('called')
+                if len(log) == 1:
+                    handle.append(reactor.suspend())
+            handle = []
+            reactor.addWriter(sok=rwFD, source=suspendCb)
+            reactor.step()
+            rwFD.close()
+            with stderr_replaced():
+                reactor.resumeWriter(handle.pop())
+            self.assertEqual({}, reactor._fds)
+            reactor.step()      # last-call
+            self.assertEqual(['called', 'called'], log)
+
+    def testEdgeTriggeredReaderOnlyCalledForNewData(self):
+        log = []
+        with Reactor() as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                reactor.addReader(sok=rFD, sink=lambda: log.append(rFD.recv(1)), edgeTriggered=True)
+                wFD.send(b'ab')
+                reactor.step()
+                self.assertEqual([b'a'], log)
+                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))   # 'b' not read, but no new edge.
+                wFD.send(b'c')
+                reactor.step()
+                self.assertEqual([b'a', b'b'], log)
+                reactor.removeReader(rFD)
+
+    def testEdgeTriggeredReaderSkippedForPrioIsRemembered(self):
+        log = []
+        with Reactor() as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                reactor.addReader(sok=rFD, sink=lambda: log.append(rFD.recv(10)), prio=5, edgeTriggered=True)
+                busy = lambda: None
+                reactor.addProcess(busy)
+                wFD.send(b'a')
+                reactor.step()
+                wFD.send(b'b')
+                reactor.step()
+                self.assertEqual([b'a', b'b'], log)
+                wFD.send(b'c')
+                reactor.step()  # Not its turn.
+                self.assertEqual([b'a', b'b'], log)
+                self.assertEqual(set([rFD.fileno()]), reactor._readyFds)
+                reactor.step()
+                self.assertEqual([b'a', b'b', b'c'], log)
+                self.assertEqual(set(), reactor._readyFds)
+
+                reactor.removeProcess(busy)
+                reactor.removeReader(rFD)
+
+    def testEdgeTriggeredRemovedReaderForgotten(self):
+        log = []
+        with Reactor() as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                reactor.addReader(sok=rFD, sink=lambda: log.append(rFD.recv(10)), prio=5, edgeTriggered=True)
+                busy = lambda: None
+                reactor.addProcess(busy)
+                for data in [b'a', b'b', b'c']:
+                    wFD.send(data)
+                    reactor.step()
+                self.assertEqual([b'a', b'b'], log)
+                self.assertEqual(set([rFD.fileno()]), reactor._readyFds)
+                reactor.removeReader(rFD)
+                self.assertEqual(set(), reactor._readyFds)
+
+                reactor.removeProcess(busy)
+
+    def testOneshotReaderReenabledAfterCallback(self):
+        log = []
+        with Reactor() as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                def sink():
+                    log.append(rFD.recv(1))
+                    self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))    # Disabled while running
+                reactor.addReader(sok=rFD, sink=sink, oneshot=True)
+                wFD.send(b'ab')
+                reactor.step()
+                self.assertEqual([b'a'], log)
+                reactor.step()
+                self.assertEqual([b'a', b'b'], log)
+                reactor.removeReader(rFD)
+
+    def testOneshotSuspendAndResume(self):
+        with Reactor() as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                def sink():
+                    handle.append(reactor.suspend())
+                handle = []
+                reactor.addReader(sok=rFD, sink=sink, oneshot=True)
+                wFD.send(b'a')
+                reactor.step()
+                self.assertTrue(reactor._suspended[handle[0]].parked)
+                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))
+                calls = reactor.getEpollCtlCounts()['calls']
+                reactor.resumeReader(handle.pop())
+                self.assertEqual(calls + 1, reactor.getEpollCtlCounts()['calls'])
+                self.assertEqual(set([rFD.fileno()]), fdsReadyFromReactorEpoll(reactor))
+                reactor.removeReader(rFD)
+
+    def testReaderAndWriterOnSameFd(self):
+        log = []
+        with Reactor() as reactor:
+            rwFD, other = socketpair()
+            with rwFD, other:
+                reactor.addWriter(sok=rwFD, source=lambda: log.append('write'))
+                calls = reactor.getEpollCtlCounts()['calls']
+                reactor.addReader(sok=rwFD, sink=lambda: log.append(rwFD.recv(10)))
+                self.assertEqual(calls + 1, reactor.getEpollCtlCounts()['calls'])  # modify, not register
+                self.assertEqual(1, reactor.getOpenConnections())
+
+                reactor.step()
+                self.assertEqual(['write'], log)
+                other.send(b'x')
+                reactor.step()
+                self.assertEqual(['write', b'x', 'write'], log)
+
+                reactor.removeWriter(rwFD)
+                self.assertEqual(READ_INTENT, reactor._fds[rwFD.fileno()].intent)
+                other.send(b'y')
+                reactor.step()
+                self.assertEqual(['write', b'x', 'write', b'y'], log)
+
+                reactor.addWriter(sok=rwFD, source=lambda: log.append('write'))
+                reactor.removeReader(rwFD)
+                self.assertEqual(WRITE_INTENT, reactor._fds[rwFD.fileno()].intent)
+                reactor.removeWriter(rwFD)
+                self.assertEqual({}, reactor._fds)
+                self.assertEqual(set(), fdsReadyFromReactorEpoll(reactor))
+
+    def testReaderAndWriterOnSameFdRestrictions(self):
+        noop = lambda: None
+        with Reactor() as reactor:
+            rwFD, other = socketpair()
+            with rwFD, other:
+                reactor.addReader(sok=rwFD, sink=noop)
+                self.assertRaises(ValueError, lambda: reactor.addWriter(sok=rwFD, source=noop, edgeTriggered=True))
+                def source():
+                    reactor.suspend()
+                reactor.addWriter(sok=rwFD, source=source)
+                self.assertRaises(ValueError, lambda: reactor.addReader(sok=rwFD, sink=noop))
+                with stderr_replaced() as err:
+                    reactor.step()
+                    self.assertTrue('suspend not supported for a socket with both a reader and a writer' in err.getvalue(), err.getvalue())
+                self.assertEqual({}, reactor._fds)
+
+    def testExclusiveReader(self):
+        with Reactor() as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                self.assertRaises(ValueError, lambda: reactor.addReader(sok=rFD, sink=lambda: None, exclusive=True, oneshot=True))
+                reactor.addReader(sok=rFD, sink=lambda: reactor.suspend(), exclusive=True)
+                self.assertRaises(ValueError, lambda: reactor.addWriter(sok=rFD, source=lambda: None))
+                wFD.send(b'x')
+                with stderr_replaced() as err:
+                    reactor.step()
+                    self.assertTrue('suspend not supported for an exclusive reader' in err.getvalue(), err.getvalue())
+
+    def testCallSoonThreadsafeWakesUpReactor(self):
+        log = []
+        with Reactor() as reactor:
+            t = Thread(target=lambda: (sleep(0.01), reactor.callSoonThreadsafe(lambda: log.append('called'))))
+            t.start()
+            reactor.step()  # Would block forever without the wake-up.
+            t.join()
+            if not log:
+                reactor.step()
+            self.assertEqual(['called'], log)
+
+    def testCallSoonThreadsafeCoalescesWakeUps(self):
+        log = []
+        with Reactor() as reactor:
+            with reactor._listening:  # As if in epoll_wait
+                for i in range(3):
+                    reactor.callSoonThreadsafe(lambda i=i: log.append(i))
+                self.assertEqual(1, int.from_bytes(os.read(reactor._epoll_ctrl_read, 8), sys.byteorder))  # One write for three calls.
+            os.write(reactor._epoll_ctrl_write, (1).to_bytes(8, sys.byteorder))  # Read above; written again for the step below.
+            reactor.step()
+            self.assertEqual([0, 1, 2], log)
+            self.assertEqual(False, reactor._wakeUpPending)
 
     def testCleanupAlsoEpollUnregistersWhenPresent(self):
         cb = lambda: None
@@ -1271,6 +1666,42 @@ class ReactorTest(WeightlessTestCase):
 
                 # cleanup is like remove; no _badFdsLastCallback's
                 self.assertEqual(0, len(reactor._badFdsLastCallback))
+                self.assertEqual({}, reactor._fdByFileObj)
+
+    def testFileObjIndexFollowsRegistrations(self):
+        noop = lambda: None
+        with readAndWritable() as rw1, readAndWritable() as rw2:
+            with Reactor() as reactor:
+                reactor.addReader(sok=rw1, sink=noop)
+                reactor.addWriter(sok=rw1, source=noop)
+                reactor.addReader(sok=rw2.fileno(), sink=noop)
+                self.assertEqual({id(rw1): rw1.fileno()}, reactor._fdByFileObj)
+
+                reactor.removeReader(sok=rw1)
+                self.assertEqual({id(rw1): rw1.fileno()}, reactor._fdByFileObj)
+                reactor.removeWriter(sok=rw1)
+                self.assertEqual({}, reactor._fdByFileObj)
+
+                reactor.addReader(sok=rw1, sink=lambda: reactor.suspend())
+                reactor.step()
+                self.assertEqual({id(rw1): rw1.fileno()}, reactor._fdByFileObj)
+                rw1.close()
+                with stderr_replaced():
+                    reactor.cleanup(rw1)
+                self.assertEqual({}, reactor._suspended)
+                self.assertEqual({}, reactor._fdByFileObj)
+                reactor.removeReader(sok=rw2.fileno())
+
+    def testContextsHaveSlots(self):
+        from weightless.io._reactor import Timer, _FDContext, _ProcessContext
+        from weightless.io._timingwheel import Timeout
+        noop = lambda: None
+        for context in [
+                Timer(1, noop),
+                _FDContext(noop, 3, 'r', 0, False, False),
+                _ProcessContext(noop, 0),
+                Timeout(1.0, noop)]:
+            self.assertFalse(hasattr(context, '__dict__'), context)
 
     def testAddProcessFromThread(self):
         with Reactor() as reactor:
@@ -1344,6 +1775,96 @@ class ReactorTest(WeightlessTestCase):
 
             self.assertEqual(1, steps)
 
+    def testTimerfdTimerWakesUpReactorOnce(self):
+        durations = []
+        with Reactor(timerfd=True) as reactor:
+            for attempt in range(5):
+                start = monotonic()
+                called = []
+                reactor.addTimer(seconds=0.0005, callback=lambda: called.append(monotonic() - start))
+                reactor.step()
+                self.assertEqual(1, len(called))
+                self.assertTrue(0.0005 <= called[0], called)
+                durations.append(called[0])
+        self.assertTrue(min(durations) < 0.0015, durations)  # Not rounded up to epoll's milliseconds; the best of a few, as a loaded test run can delay any single one.
+
+    def testTimerfdTimersInOrder(self):
+        log = []
+        with Reactor(timerfd=True) as reactor:
+            reactor.addTimer(0.02, lambda: log.append(2))
+            token = reactor.addTimer(0.005, lambda: log.append('removed'))
+            reactor.addTimer(0.01, lambda: log.append(1))
+            reactor.removeTimer(token)
+            while len(log) < 2:
+                reactor.step()
+            self.assertEqual([1, 2], log)
+
+    def testTimerfdClosedOnShutdown(self):
+        fdsBefore = nrOfOpenFds()
+        reactor = Reactor(timerfd=True)
+        self.assertEqual(fdsBefore + 3, nrOfOpenFds())  # epoll, ctrl-eventfd and timerfd
+        reactor.shutdown()
+        self.assertEqual(fdsBefore, nrOfOpenFds())
+
+    def testSignalHandler(self):
+        # Signals are sent to this thread (pthread_kill); a signal sent to the process (os.kill) might be delivered to another thread of the test-run, which doesn't block it.
+        log = []
+        fdsBefore = nrOfOpenFds()
+        with Reactor() as reactor:
+            reactor.addSignalHandler(SIGUSR1, lambda: log.append('usr1'))
+            reactor.addSignalHandler(SIGHUP, lambda: log.append('hup'))
+            self.assertEqual(fdsBefore + 3, nrOfOpenFds())  # epoll, ctrl-eventfd and signalfd
+            self.assertTrue({SIGUSR1, SIGHUP} <= pthread_sigmask(SIG_BLOCK, []))
+            pthread_kill(get_ident(), SIGUSR1)
+            pthread_kill(get_ident(), SIGHUP)
+            reactor.step()
+            self.assertEqual(['hup', 'usr1'], log)
+            self.assertRaises(ValueError, lambda: reactor.addSignalHandler(SIGUSR1, lambda: None))
+            reactor.removeSignalHandler(SIGUSR1)
+            self.assertRaises(ValueError, lambda: reactor.removeSignalHandler(SIGUSR1))
+            self.assertFalse(SIGUSR1 in pthread_sigmask(SIG_BLOCK, []))
+        self.assertFalse(SIGHUP in pthread_sigmask(SIG_BLOCK, []))
+        self.assertEqual(fdsBefore, nrOfOpenFds())
+
+    def testSignalWakesUpReactor(self):
+        log = []
+        with Reactor() as reactor:
+            reactor.addSignalHandler(SIGUSR1, lambda: log.append(reactor.currenthandle))
+            reactorThread = get_ident()
+            t = Thread(target=lambda: (sleep(0.02), pthread_kill(reactorThread, SIGUSR1)))
+            t.start()
+            reactor.step()
+            t.join()
+            self.assertEqual([None], log)
+            reactor.removeSignalHandler(SIGUSR1)
+
+    def testExceptionInSignalHandlerIsPrinted(self):
+        def raiser():
+            raise Exception('oops')
+        log = []
+        with Reactor() as reactor:
+            reactor.addSignalHandler(SIGUSR1, raiser)
+            reactor.addTimer(0, lambda: log.append('timer'))
+            pthread_kill(get_ident(), SIGUSR1)
+            with stderr_replaced() as err:
+                reactor.step()
+            self.assertTrue('oops' in err.getvalue(), err.getvalue())
+            self.assertEqual(['timer'], log)
+
+    def testRemoveSignalHandlerDiscardsPendingSignal(self):
+        handled = []
+        previous = signal(SIGUSR2, lambda signum, frame: handled.append(signum))
+        try:
+            with Reactor() as reactor:
+                reactor.addSignalHandler(SIGUSR2, lambda: self.fail())
+                pthread_kill(get_ident(), SIGUSR2)
+                reactor.removeSignalHandler(SIGUSR2)
+            self.assertEqual([], handled)
+            pthread_kill(get_ident(), SIGUSR2)
+            self.assertEqual([SIGUSR2], handled)
+        finally:
+            signal(SIGUSR2, previous)
+
     def testShutdownClosesRemainingFilesAndClosableProcesses(self):
         log = []
         class MySocket(socket):
@@ -1440,11 +1961,10 @@ class ReactorTest(WeightlessTestCase):
 
         nfds = nrOfOpenFds()
         with Reactor() as reactor:
-            # 3 extra; because:
+            # 2 extra; because:
             #   - epoll(_create) fd
-            #   - (process) pipe read end
-            #   - (process) pipe write end
-            self.assertEqual(nfds + 3, nrOfOpenFds())
+            #   - (wake-up) eventfd
+            self.assertEqual(nfds + 2, nrOfOpenFds())
             reactor.shutdown()
             self.assertEqual(nfds, nrOfOpenFds())
         self.assertEqual(nfds, nrOfOpenFds())  # 2nd shutdown; no change.
@@ -1518,6 +2038,7 @@ class ReactorTest(WeightlessTestCase):
 
                 self.assertEqual(0, len(reactor._badFdsLastCallback))
                 self.assertEqual(1, len(lastcall))
+                self.assertEqual({}, reactor._fdByFileObj)
 
     def testAddFileNotPossible(self):
         # or meaningful; non-blocking file interface does not exist on Linux (use Threads) and a file-fd cannot be registered in epoll.
@@ -0,0 +1,151 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from io import StringIO
+from signal import SIGUSR1, pthread_kill
+from socket import socketpair
+from threading import get_ident
+
+from weightless.core import compose
+from weightless.io import Reactor, AsyncioReactor, stackDump, stackDumpReport, dumpStacksOnSignal
+
+
+def readRequest():
+    yield readLine()
+
+def readLine():
+    while True:
+        yield
+
+def sendResponse():
+    yield
+
+
+class StackDumpTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        self.soks = []
+
+    def tearDown(self):
+        for sok in self.soks:
+            sok.close()
+        TestCase.tearDown(self)
+
+    def testGroupsIdenticalStacks(self):
+        with Reactor() as reactor:
+            self.addHandlers(reactor)
+            groups = stackDump(reactor)
+            self.assertEqual([(3, 'reading'), (1, 'running')], [(count, state) for count, state, stack in groups])
+            self.assertEqual(['readRequest', 'readLine'], functionNames(groups[0][2]))
+            self.assertTrue('    yield readLine()' in groups[0][2].split('\n'), groups[0][2])
+            self.assertEqual(['sendResponse'], functionNames(groups[1][2]))
+            self.removeHandlers(reactor)
+
+    def testSuspendedAndOtherCallbacks(self):
+        with Reactor() as reactor:
+            rsok, wsok = self.socketpair()
+            def writer():
+                reactor.suspend()
+            reactor.addWriter(wsok, writer)
+            reactor.addReader(rsok, lambda: None)
+            reactor.step()
+            groups = stackDump(reactor)
+            self.assertEqual(2, len(groups))
+            self.assertEqual(set([
+                    (1, 'suspended', '  StackDumpTest.testSuspendedAndOtherCallbacks.<locals>.writer'),
+                    (1, 'reading', '  StackDumpTest.testSuspendedAndOtherCallbacks.<locals>.<lambda>'),
+                ]), set(groups))
+            reactor.removeReader(rsok)
+            reactor.cleanup(wsok)
+
+    def testStackOfRunningGenerator(self):
+        with Reactor() as reactor:
+            dumps = []
+            def process():
+                dumps.append(stackDump(reactor))
+                yield
+            this = compose(process())
+            reactor.addProcess(this.__next__)
+            reactor.step()
+            reactor.removeProcess(this.__next__)
+        self.assertEqual(1, len(dumps[0]))
+        count, state, stack = dumps[0][0]
+        self.assertEqual('running', state)
+        self.assertEqual(['process'], functionNames(stack))
+
+    def testReport(self):
+        with Reactor() as reactor:
+            self.addHandlers(reactor)
+            report = stackDumpReport(reactor)
+            self.assertTrue(report.startswith('[Reactor]: stack dump: 4 callbacks, 2 distinct stacks\n3 reading:\n  File "'), report)
+            self.assertTrue('\n1 running:\n  File "' in report, report)
+            report = stackDumpReport(reactor, limit=1)
+            self.assertTrue('3 reading:' in report, report)
+            self.assertFalse('running' in report, report)
+            self.removeHandlers(reactor)
+
+    def testDumpStacksOnSignal(self):
+        out = StringIO()
+        with Reactor() as reactor:
+            dumpStacksOnSignal(reactor, out=out)
+            self.addHandlers(reactor)
+            pthread_kill(get_ident(), SIGUSR1)  # To this thread, which blocks the signal; see ReactorTest.testSignalHandler.
+            reactor.step()
+            reactor.removeSignalHandler(SIGUSR1)
+            self.removeHandlers(reactor)
+        self.assertTrue(out.getvalue().startswith('[Reactor]: stack dump: 4 callbacks, 2 distinct stacks\n'), out.getvalue())
+
+    def testAsyncioReactor(self):
+        reactor = AsyncioReactor()
+        try:
+            self.addHandlers(reactor)
+            self.assertEqual([(3, 'reading'), (1, 'running')], [(count, state) for count, state, stack in stackDump(reactor)])
+        finally:
+            self.removeHandlers(reactor)
+            reactor.shutdown()
+
+    def addHandlers(self, reactor):
+        for i in range(3):
+            rsok, wsok = self.socketpair()
+            handler = compose(readRequest())
+            next(handler)
+            reactor.addReader(rsok, handler.__next__)
+        self.process = compose(sendResponse()).__next__
+        reactor.addProcess(self.process)
+
+    def removeHandlers(self, reactor):
+        for sok in self.soks[::2]:
+            reactor.removeReader(sok)
+        reactor.removeProcess(self.process)
+
+    def socketpair(self):
+        soks = socketpair()
+        self.soks.extend(soks)
+        return soks
+
+
+def functionNames(stack):
+    return [line.rsplit(' in ', 1)[1] for line in stack.split('\n') if line.startswith('  File ')]
@@ -0,0 +1,141 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from weightless.io import Subprocess, reactor
+from weightless.io.utils import asProcess
+import weightless.io._subprocess as subprocessModule
+
+
+class SubprocessTest(TestCase):
+    def testWriteReadWait(self):
+        @asProcess
+        def test():
+            proc = Subprocess(['cat'])
+            yield proc.write(b'hello ')
+            yield proc.write(bytearray(b'world'))
+            proc.closeStdin()
+            output = yield readAll(proc)
+            self.assertEqual(b'hello world', output)
+            code = yield proc.wait()
+            self.assertEqual(0, code)
+            self.assertEqual(0, proc.returncode)
+            proc.close()
+        test()
+
+    def testReadsBoundedByBufferSize(self):
+        @asProcess
+        def test():
+            proc = Subprocess(['head', '-c', '300000', '/dev/zero'], bufferSize=4096)
+            sizes = []
+            while True:
+                data = yield proc.read()
+                if not data:
+                    break
+                sizes.append(len(data))
+            self.assertEqual(300000, sum(sizes))
+            self.assertTrue(max(sizes) <= 4096, max(sizes))
+            yield proc.wait()
+            proc.close()
+        test()
+
+    def testExitCodeAndStderr(self):
+        @asProcess
+        def test():
+            proc = Subprocess(['sh', '-c', 'echo oops >&2; exit 3'])
+            code = yield proc.wait()
+            self.assertEqual(3, code)
+            self.assertEqual(b'oops\n', proc.stderr())
+            proc.close()
+        test()
+
+    def testStderrBounded(self):
+        @asProcess
+        def test():
+            proc = Subprocess(['sh', '-c', 'head -c 200000 /dev/zero >&2; echo -n end >&2'], stderrLimit=1000)
+            yield proc.wait()
+            self.assertEqual(b'\0' * 997 + b'end', proc.stderr())
+            proc.close()
+        test()
+
+    def testLoopNotBlockedWhileWaiting(self):
+        log = []
+        @asProcess
+        def test():
+            reactor().addTimer(0.01, lambda: log.append('timer'))
+            proc = Subprocess(['sleep', '0.1'])
+            yield proc.wait()
+            log.append('exited')
+            proc.close()
+        test()
+        self.assertEqual(['timer', 'exited'], log)
+
+    def testWaitByPollingWithoutPidfd(self):
+        original = subprocessModule._pidfdOpen
+        subprocessModule._pidfdOpen = None
+        try:
+            @asProcess
+            def test():
+                proc = Subprocess(['sh', '-c', 'sleep 0.02; exit 2'])
+                code = yield proc.wait()
+                self.assertEqual(2, code)
+                proc.close()
+            test()
+        finally:
+            subprocessModule._pidfdOpen = original
+
+    def testWriteToExitedChild(self):
+        @asProcess
+        def test():
+            proc = Subprocess(['true'])
+            yield proc.wait()
+            try:
+                yield proc.write(b'x' * 200000)
+                self.fail()
+            except BrokenPipeError:
+                pass
+            proc.close()
+        test()
+
+    def testLargeWriteSuspends(self):
+        @asProcess
+        def test():
+            proc = Subprocess(['sh', '-c', 'sleep 0.02; wc -c'])
+            yield proc.write(b'x' * 1000000)
+            proc.closeStdin()
+            output = yield readAll(proc)
+            self.assertEqual(b'1000000', output.strip())
+            yield proc.wait()
+            proc.close()
+        test()
+
+
+def readAll(proc):
+    output = b''
+    while True:
+        data = yield proc.read()
+        if not data:
+            return (output,)
+        output += data
@@ -0,0 +1,106 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from weightlesstestcase import WeightlessTestCase
+from seecr.test.io import stderr_replaced
+
+from time import monotonic
+
+from weightless.io import Reactor
+from weightless.io._timingwheel import TimingWheel, Timeout, WHEEL_SIZE
+
+
+class TimingWheelTest(WeightlessTestCase):
+    def testAddTimeoutWithoutResolutionIsATimer(self):
+        with Reactor() as reactor:
+            token = reactor.addTimeout(1, lambda: None)
+            self.assertEqual([token], reactor._timers)
+            reactor.removeTimeout(token)
+            self.assertEqual([], reactor._timers)
+
+    def testTimeoutFires(self):
+        log = []
+        with Reactor(timeoutResolution=0.01) as reactor:
+            start = monotonic()
+            reactor.addTimeout(0.05, lambda: log.append(monotonic() - start))
+            self.assertEqual(1, len(reactor._timers))
+            while not log:
+                reactor.step()
+            self.assertTrue(0.05 <= log[0] < 0.08, log)
+            self.assertEqual([], reactor._timers)
+            self.assertEqual(0, len(reactor._timingWheel))
+
+    def testRemoveTimeout(self):
+        with Reactor(timeoutResolution=0.01) as reactor:
+            token1 = reactor.addTimeout(0.05, lambda: self.fail())
+            token2 = reactor.addTimeout(0.05, lambda: self.fail())
+            self.assertEqual(1, len(reactor._timers))
+            reactor.removeTimeout(token1)
+            self.assertEqual(1, len(reactor._timers))
+            reactor.removeTimeout(token2)
+            self.assertEqual([], reactor._timers)
+            self.assertRaises(ValueError, lambda: reactor.removeTimeout(token2))
+
+    def testOrderOfExpiry(self):
+        log = []
+        with Reactor(timeoutResolution=0.005) as reactor:
+            for seconds in [0.04, 0.01, 0.03, 0.02]:
+                reactor.addTimeout(seconds, lambda seconds=seconds: log.append(seconds))
+            while len(log) < 4:
+                reactor.step()
+            self.assertEqual([0.01, 0.02, 0.03, 0.04], log)
+
+    def testCascadeFromHigherLevels(self):
+        class FakeReactor(object):
+            def addTimer(self, seconds, callback):
+                return 'timer'
+            def now(self):
+                return monotonic()
+        wheel = TimingWheel(reactor=FakeReactor(), resolution=1)
+        start = wheel._nextTick
+        log = []
+        allTicks = [1, WHEEL_SIZE - 1, WHEEL_SIZE + 3, WHEEL_SIZE ** 2 + 5, WHEEL_SIZE ** 3]
+        for ticks in reversed(allTicks):
+            wheel._insert(Timeout(expires=start + ticks, callback=lambda ticks=ticks: log.append((ticks, wheel._nextTick - 1 - start))))
+            wheel._count += 1
+
+        wheel._currentTick = lambda: start + WHEEL_SIZE ** 3 + 1
+        wheel._expire()
+        self.assertEqual([(t, t) for t in allTicks], log)
+        self.assertEqual(0, len(wheel))
+
+    def testExceptionInCallbackIsPrintedAndIgnored(self):
+        log = []
+        def raiser():
+            raise Exception('oops')
+        with Reactor(timeoutResolution=0.01) as reactor:
+            reactor.addTimeout(0, raiser)
+            reactor.addTimeout(0, lambda: log.append(True))
+            with stderr_replaced() as err:
+                while not log:
+                    reactor.step()
+            self.assertTrue('oops' in err.getvalue(), err.getvalue())
+
+    def testInvalidResolution(self):
+        self.assertRaises(ValueError, lambda: Reactor(timeoutResolution=0))
@@ -0,0 +1,141 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from io import StringIO
+from os.path import join, exists, getsize
+from select import EPOLLIN
+from shutil import rmtree
+from socket import socketpair
+from tempfile import mkdtemp
+
+from weightless.io import Reactor, TraceRecorder, readTrace, summarizeTrace
+from weightless.io._trace import printTraceSummary
+
+
+class TraceTest(TestCase):
+    def setUp(self):
+        TestCase.setUp(self)
+        self.tempdir = mkdtemp()
+        self.path = join(self.tempdir, 'reactor.trace')
+
+    def tearDown(self):
+        rmtree(self.tempdir)
+        TestCase.tearDown(self)
+
+    def testRecordStep(self):
+        recorder = TraceRecorder(self.path)
+        def process():
+            reactor.removeProcess()
+        with Reactor(instrumentation=recorder) as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                def read():
+                    rFD.recv(10)
+                reactor.addReader(rFD, read)
+                reactor.addTimer(0, lambda: None)
+                reactor.addProcess(process)
+                wFD.send(b'x')
+                reactor.step()
+                reactor.removeReader(rFD)
+                fd = rFD.fileno()
+        recorder.close()
+
+        steps = list(readTrace(self.path))
+        self.assertEqual(1, len(steps))
+        step = steps[0]
+        self.assertEqual([(fd, EPOLLIN)], step['events'])
+        self.assertEqual(1, len(step['timers']))
+        self.assertEqual([('timer', None), ('fd', fd), ('process', None)], [(kind, fd) for kind, fd, name, duration in step['callbacks']])
+        names = [name for kind, fd, name, duration in step['callbacks']]
+        self.assertTrue(names[0].endswith('<lambda>'), names)
+        self.assertTrue(names[1].endswith('read'), names)
+        self.assertTrue(names[2].endswith('process'), names)
+
+    def testExceptionInCallbackRecorded(self):
+        recorder = TraceRecorder(self.path)
+        def raiser():
+            raise Exception('oops')
+        with Reactor(instrumentation=recorder) as reactor:
+            reactor.addProcess(raiser)
+            self.assertRaises(Exception, reactor.step)
+        recorder.close()
+        self.assertEqual(['process'], [kind for kind, fd, name, duration in list(readTrace(self.path))[0]['callbacks']])
+
+    def testRingOfTwoSegments(self):
+        recorder = TraceRecorder(self.path, maxBytes=4096, bufferSize=256)
+        with Reactor(instrumentation=recorder) as reactor:
+            def process():
+                pass
+            reactor.addProcess(process)
+            for i in range(1000):
+                reactor.step()
+            reactor.removeProcess(process)
+        recorder.close()
+        self.assertTrue(exists(self.path + '.1'))
+        self.assertTrue(getsize(self.path) + getsize(self.path + '.1') < 4096 + 2 * 256)
+        steps = list(readTrace(self.path))
+        self.assertTrue(50 < len(steps) < 1000, len(steps))
+        self.assertEqual(sorted(step['time'] for step in steps), [step['time'] for step in steps])
+        self.assertTrue(all(name.endswith('process') for step in steps for kind, fd, name, duration in step['callbacks']))
+
+    def testTruncatedTraceIgnoresLastRecord(self):
+        recorder = TraceRecorder(self.path)
+        with Reactor(instrumentation=recorder) as reactor:
+            for i in range(2):
+                reactor.addTimer(0, lambda: None)
+                reactor.step()
+        recorder.close()
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(data[:-3])
+        self.assertEqual(2, len(list(readTrace(self.path))))
+
+    def testNotATrace(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'something else')
+        self.assertRaises(ValueError, lambda: list(readTrace(self.path)))
+
+    def testSummary(self):
+        recorder = TraceRecorder(self.path)
+        with Reactor(instrumentation=recorder) as reactor:
+            rFD, wFD = socketpair()
+            with rFD, wFD:
+                reactor.addReader(rFD, lambda: rFD.recv(1))
+                wFD.send(b'xyz')
+                for i in range(3):
+                    reactor.step()
+                reactor.removeReader(rFD)
+                fd = rFD.fileno()
+        recorder.close()
+        summary = summarizeTrace(self.path)
+        self.assertEqual(3, summary['steps'])
+        self.assertEqual(3, summary['callbackDuration']['count'])
+        self.assertEqual([(fd, 3)], [(fd, events) for fd, events, seconds in summary['hotFds']])
+        out = StringIO()
+        printTraceSummary(self.path, steps=True, out=out)
+        self.assertTrue('steps: 3\n' in out.getvalue(), out.getvalue())
+        self.assertTrue('hot fds' in out.getvalue(), out.getvalue())
@@ -0,0 +1,131 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from unittest import TestCase
+
+from socket import socketpair
+from time import monotonic
+
+from weightless.core import compose, identify
+from weightless.io import Reactor, VirtualClock
+from weightless.http import SocketPool
+from weightless.io.utils import sleep
+
+
+class VirtualClockTest(TestCase):
+    def testAdvance(self):
+        clock = VirtualClock(start=10.0)
+        self.assertEqual(10.0, clock())
+        clock.advance(2.5)
+        self.assertEqual(12.5, clock())
+        self.assertRaises(ValueError, lambda: clock.advance(-1))
+
+    def testTimersFastForwarded(self):
+        log = []
+        t0 = monotonic()
+        with Reactor(clock=VirtualClock()) as reactor:
+            for seconds in [3600, 60, 1, 60]:
+                reactor.addTimer(seconds, lambda seconds=seconds: log.append((seconds, reactor.now())))
+            while len(log) < 4:
+                reactor.step()
+        self.assertEqual([(1, 1), (60, 60), (60, 60), (3600, 3600)], log)
+        self.assertTrue(monotonic() - t0 < 1)
+
+    def testTimeoutsInTimingWheelFastForwarded(self):
+        fired = []
+        with Reactor(clock=VirtualClock(), timeoutResolution=1) as reactor:
+            tokens = [reactor.addTimeout(300 + i % 7, lambda i=i: fired.append(i)) for i in range(5000)]
+            for token in tokens[::2]:
+                reactor.removeTimeout(token)
+            while len(fired) < 2500:
+                reactor.step()
+            self.assertTrue(306 <= reactor.now() <= 308, reactor.now())
+        self.assertEqual(sorted(range(1, 5000, 2)), sorted(fired))
+
+    def testPendingIODoesNotAdvanceClock(self):
+        clock = VirtualClock()
+        log = []
+        with Reactor(clock=clock) as reactor:
+            local, remote = socketpair()
+            try:
+                local.send(b'x')
+                reactor.addReader(remote, lambda: log.append(remote.recv(10)))
+                reactor.addTimer(5, lambda: log.append('timer'))
+                reactor.step()
+                self.assertEqual([b'x'], log)
+                self.assertEqual(0, clock())
+                reactor.step()
+                self.assertEqual([b'x', 'timer'], log)
+                self.assertEqual(5, clock())
+                reactor.removeReader(remote)
+            finally:
+                local.close()
+                remote.close()
+
+    def testSleepsDeterministic(self):
+        log = []
+        def sleeper(name, seconds):
+            yield sleep(seconds=seconds)
+            log.append((name, reactor.now()))
+        with Reactor(clock=VirtualClock()) as reactor:
+            for name, seconds in [('s30', 30), ('s90', 90), ('s10', 10)]:
+                asReactorProcess(reactor, sleeper(name, seconds))
+            while len(log) < 3:
+                reactor.step()
+        self.assertEqual([('s10', 10), ('s30', 30), ('s90', 90)], log)
+
+    def testSocketPoolUnusedTimeout(self):
+        with Reactor(clock=VirtualClock()) as reactor:
+            pool = SocketPool(reactor=reactor, unusedTimeout=3600)
+            local, remote = socketpair()
+            try:
+                list(compose(pool.putSocketInPool(host='localhost', port=80, sock=remote)))
+                self.assertEqual(1, pool._poolSize)
+                while pool._poolSize:
+                    reactor.step()
+                self.assertEqual(7200, reactor.now())
+            finally:
+                local.close()
+                remote.close()
+
+    def testTimerfdNotCombined(self):
+        self.assertRaises(ValueError, lambda: Reactor(clock=VirtualClock(), timerfd=True))
+
+
+def asReactorProcess(reactor, generator):
+    "Like asProcess, on a given reactor."
+    @identify
+    def wrapper():
+        this = yield
+        reactor.addProcess(process=this.__next__)
+        yield
+        for response in compose(generator):
+            if callable(response):
+                response(reactor, this.__next__)
+                yield
+                response.resumeProcess()
+            yield
+        reactor.removeProcess(process=this.__next__)
+        yield
+    wrapper()
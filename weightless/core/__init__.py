@@ -26,13 +26,28 @@
 VERSION='$Version: x.y.z$'[9:-1].strip() # Modified by package scripts
 
 from functools import wraps
+from os import environ
 from types import GeneratorType, FunctionType
 
 from warnings import warn
-def is_generator(o):
-    return type(o) is GeneratorType
-class DeclineMessage(Exception):
-    pass
+
+# WEIGHTLESS_COMPOSE selects compose(), local() and tostring(): 'c' (the ext module), 'python', or - by default - 'c' if it is built, 'python' otherwise.
+_implementation = environ.get('WEIGHTLESS_COMPOSE', '').lower()
+if _implementation not in ('', 'c', 'python'):
+    raise ValueError("WEIGHTLESS_COMPOSE must be 'c' or 'python', not %s" % repr(_implementation))
+cextension = False
+if _implementation != 'python':
+    try:
+        from .ext import is_generator, DeclineMessage
+        cextension = True
+    except ImportError:
+        if _implementation == 'c':
+            raise
+if not cextension:
+    def is_generator(o):
+        return type(o) is GeneratorType
+    class DeclineMessage(Exception):
+        pass
 
 import platform
 if hasattr(platform, 'python_implementation'):
@@ -42,9 +57,13 @@ elif hasattr(platform, 'system'):
 else:
     cpython = False
 
-from ._compose_py import compose as _compose, Yield
-from ._local_py import local
-from ._tostring_py import tostring
+if cextension:
+    from .ext import compose as _compose, Yield, local, tostring
+else:
+    from ._compose_py import compose as _compose, Yield
+    from ._local_py import local
+    from ._tostring_py import tostring
+from ._localscope import LocalScope
 
 def compose(X, *args, **kwargs):
     if type(X) == FunctionType: # compose used as decorator
@@ -35,7 +35,7 @@
 
 ////////// Python Object and Type structures //////////
 
-typedef struct {
+typedef struct _PyComposeObject {
     PyObject_HEAD
     int        expect_data;
     int        started;
@@ -47,7 +47,7 @@ typedef struct {
     PyObject** messages_base;
     PyObject** messages_start;
     PyObject** messages_end;
-    PyFrameObject* frame;
+    struct _PyComposeObject* running_outer;
     PyObject*  weakreflist;
 } PyComposeObject;
 
@@ -194,7 +194,6 @@ static int compose_traverse(PyComposeObject* self, visitproc visit, void* arg) {
     for(p = self->messages_base; p < self->messages_base + QUEUE_SIZE; p++)
         Py_VISIT(*p);
 
-    Py_VISIT(self->frame);
     return 0;
 }
 
@@ -213,7 +212,6 @@ static int compose_clear(PyComposeObject* self) {
 
     free(self->messages_base);
     self->messages_base = NULL;
-    Py_CLEAR(self->frame);
     return 0;
 }
 
@@ -233,12 +231,10 @@ static void compose_dealloc(PyComposeObject* self) {
 ////////// Compose Methods //////////
 
 int PyCompose_Check(PyObject* obj) {
-    return PyObject_Type(obj) == (PyObject*) &PyCompose_Type;
+    return Py_TYPE(obj) == &PyCompose_Type;
 }
 
 
-static PyCodeObject* py_code;
-
 static void _compose_initialize(PyComposeObject* cmps) {
     cmps->expect_data = 0;
     cmps->started = 0;
@@ -250,9 +246,8 @@ static void _compose_initialize(PyComposeObject* cmps) {
     cmps->messages_base = (PyObject**) calloc(QUEUE_SIZE, sizeof(PyObject*));
     cmps->messages_start = cmps->messages_base;
     cmps->messages_end = cmps->messages_base;
+    cmps->running_outer = NULL;
     cmps->weakreflist = NULL;
-    cmps->frame = PyFrame_New(PyThreadState_GET(), py_code, PyEval_GetGlobals(), NULL);
-    Py_CLEAR(cmps->frame->f_back);
 }
 
 
@@ -326,24 +321,84 @@ static int _compose_handle_stopiteration(PyComposeObject* self, PyObject* exc_va
 }
 
 
+/* CPython 3.11 replaced the generator's frame object by an internal frame; its
+ * state is available as gi_frame_state, with values from pycore_frame.h. */
+#if PY_VERSION_HEX >= 0x030D0000 && PY_VERSION_HEX < 0x030E0000
+#define GEN_FRAME_CREATED -3
+#elif PY_VERSION_HEX >= 0x030B0000 && PY_VERSION_HEX < 0x030D0000
+#define GEN_FRAME_CREATED -2
+#endif
+#define GEN_FRAME_COMPLETED 1
+
+static int generator_state(PyObject* gen, int* exhausted, int* started) {
+#ifdef GEN_FRAME_CREATED
+    int state = ((PyGenObject*)gen)->gi_frame_state;
+    *exhausted = state >= GEN_FRAME_COMPLETED;
+    *started = state != GEN_FRAME_CREATED;
+    return 1;
+#else
+    PyObject* frame = PyObject_GetAttrString(gen, "gi_frame"); // new ref
+
+    if(!frame)
+        return 0;
+
+    *exhausted = frame == Py_None;
+    Py_DECREF(frame);
+    *started = 0;
+
+    if(!*exhausted) {
+        PyObject* suspended = PyObject_GetAttrString(gen, "gi_suspended"); // new ref
+        PyObject* running = PyObject_GetAttrString(gen, "gi_running"); // new ref
+        *started = suspended == Py_True || running == Py_True;
+        Py_XDECREF(suspended);
+        Py_XDECREF(running);
+
+        if(PyErr_Occurred())
+            return 0;
+    }
+
+    return 1;
+#endif
+}
+
+
+static int _compose_handle_return(PyComposeObject* self, PyObject* value) {
+    // as _compose_handle_stopiteration() with StopIteration(value), or StopIteration() for None
+    if(value != Py_None && !PyTuple_CheckExact(value))
+        return messages_insert(self, value);
+
+    if(value != Py_None && PyTuple_GET_SIZE(value)) {
+        Py_ssize_t i;
+
+        for(i = PyTuple_GET_SIZE(value) - 1; i >= 0; i--)
+            if(!messages_insert(self, PyTuple_GET_ITEM(value, i)))
+                return 0;
+
+    } else if(!generators_empty(self))
+        messages_insert(self, Py_None);
+
+    return 1;
+}
+
+
 static int generator_invalid(PyObject* gen) {
-    PyFrameObject* frame;
+    int exhausted;
     int started;
 
     if(PyCompose_Check(gen)) {
-        frame = ((PyComposeObject*)gen)->frame;
+        exhausted = 0;
         started = ((PyComposeObject*)gen)->started;
 
     } else if(PyGen_Check(gen)) {
-        frame = ((PyGenObject*)gen)->gi_frame;
-        started = frame && frame->f_lasti != -1;
+        if(!generator_state(gen, &exhausted, &started))
+            return 1;
 
     } else { // AllGenerator
-        frame = (PyFrameObject*) 0x1; // fake
+        exhausted = 0;
         started = 0; // ((PyAllGeneratorObject*)gen)->_i > -1;
     }
 
-    if(!frame) {
+    if(exhausted) {
         PyErr_SetString(PyExc_AssertionError, "Generator is exhausted.");
         return 1;
     }
@@ -393,6 +448,23 @@ static PyObject* _compose_go(PyComposeObject* self, PyObject* exc_type, PyObject
             Py_CLEAR(exc_value);
             Py_CLEAR(exc_tb);
 
+        } else if(PyGen_CheckExact(generator)) { // normal message, without the send() method and StopIteration
+            message = messages_pop(self); // ref transfered to me
+            PySendResult sent = PyIter_Send(generator, message, &response); // new ref
+            Py_CLEAR(message);
+
+            if(sent == PYGEN_RETURN) {
+                *--self->generators_top = NULL;
+                int ok = _compose_handle_return(self, response);
+                Py_CLEAR(response);
+                Py_CLEAR(generator);
+
+                if(!ok)
+                    PyErr_Fetch(&exc_type, &exc_value, &exc_tb); // new refs
+
+                continue;
+            }
+
         } else { // normal message
             message = messages_pop(self); // ref transfered to me
             response = PyObject_CallMethod(generator, "send", "(O)", message); // new ref
@@ -429,7 +501,7 @@ static PyObject* _compose_go(PyComposeObject* self, PyObject* exc_type, PyObject
             Py_CLEAR(response);
 
         } else { // exception thrown
-            *self->generators_top-- = NULL;
+            *--self->generators_top = NULL;
             PyErr_Fetch(&exc_type, &exc_value, &exc_tb); // new refs
 
             if(PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration)) {
@@ -473,19 +545,21 @@ static PyObject* _compose_go(PyComposeObject* self, PyObject* exc_type, PyObject
 }
 
 
-static PyObject* _compose_go_with_frame(PyComposeObject* self, PyObject* exc_type, PyObject* exc_value, PyObject* exc_tb) {
-    PyThreadState* tstate = PyThreadState_GET();
-    PyFrameObject* tstate_frame = tstate->frame;
-    self->frame->f_back = tstate_frame;
-    Py_XINCREF(self->frame->f_back); /* can be NULL during GC */
-    tstate->frame = self->frame;
-    *(self->frame->f_stacktop++) = (PyObject*) self;
+////////// Running composes //////////
+
+/* Composes that are running in this thread, innermost first, linked through
+ * running_outer.  local() uses them to continue its search from the frame of
+ * the generator a compose is running, into the generators below it. */
+static _Thread_local PyComposeObject* running = NULL;
+
+static PyObject* _compose_go_running(PyComposeObject* self, PyObject* exc_type, PyObject* exc_value, PyObject* exc_tb) {
     Py_INCREF(self);
+    self->running_outer = running;
+    running = self;
     PyObject* response = _compose_go(self, exc_type, exc_value, exc_tb);
-    self->frame->f_stacktop--;
+    running = self->running_outer;
+    self->running_outer = NULL;
     Py_DECREF(self);
-    Py_CLEAR(self->frame->f_back);
-    tstate->frame = tstate_frame;
     return response;
 }
 
@@ -493,6 +567,12 @@ static PyObject* _compose_go_with_frame(PyComposeObject* self, PyObject* exc_typ
 static PyObject* compose_send(PyComposeObject* self, PyObject* message) {
     PyObject* exc_type = NULL;
     PyObject* exc_val = NULL;
+
+    if(generators_empty(self)) { // exhausted, like a generator: no stale messages
+        PyErr_SetNone(PyExc_StopIteration);
+        return NULL;
+    }
+
     if(self->paused_on_step && message != Py_None) {
         exc_val = PyUnicode_FromString("Cannot accept data when stepping. First send None.");
         exc_type = PyExc_AssertionError;
@@ -501,7 +581,7 @@ static PyObject* compose_send(PyComposeObject* self, PyObject* message) {
         exc_type = PyExc_AssertionError;
     } else
         messages_insert(self, message);
-    PyObject* response = _compose_go_with_frame(self, exc_type, exc_val, NULL);
+    PyObject* response = _compose_go_running(self, exc_type, exc_val, NULL);
     Py_CLEAR(exc_val);
     return response;
 }
@@ -518,12 +598,12 @@ static PyObject* compose_throw(PyComposeObject* self, PyObject* arg) {
         exc_type = PyExceptionInstance_Class(exc_type); // borrowed ref
     }
 
-    return _compose_go_with_frame(self, exc_type, exc_value, exc_tb);
+    return _compose_go_running(self, exc_type, exc_value, exc_tb);
 }
 
 
 static PyObject* compose_close(PyComposeObject* self) {
-    _compose_go_with_frame(self, PyExc_GeneratorExit, NULL, NULL);
+    _compose_go_running(self, PyExc_GeneratorExit, NULL, NULL);
 
     if(PyErr_ExceptionMatches(PyExc_StopIteration) || PyErr_ExceptionMatches(PyExc_GeneratorExit)) {
         PyErr_Clear();	/* ignore these errors */
@@ -547,85 +627,139 @@ static PyObject* compose_iternext(PyComposeObject* self) {
 
 ////////// local() implementation //////////
 
-PyObject* find_local_in_locals(PyFrameObject* frame, PyObject* name);
+static PyObject* find_local_in_compose(PyComposeObject* cmps, PyObject* name);
+
+
+static PyObject* find_local_in_locals(PyObject* frame, PyObject* name) {
+    PyObject* locals = PyObject_GetAttrString(frame, "f_locals"); // new ref
+
+    if(!locals)
+        return NULL;
+
+    PyObject* result = PyObject_GetItem(locals, name); // new ref
+    Py_DECREF(locals);
+
+    if(!result && PyErr_ExceptionMatches(PyExc_KeyError))
+        PyErr_Clear();
+
+    return result;
+}
+
+
+static PyObject* find_local_in_generator(PyObject* generator, PyObject* name) {
+    PyObject* frame = PyObject_GetAttrString(generator, "gi_frame"); // new ref
+
+    if(!frame || frame == Py_None) {
+        Py_XDECREF(frame);
+        return NULL;
+    }
+
+    PyObject* result = find_local_in_locals(frame, name);
+    Py_DECREF(frame);
+    return result;
+}
 
 
-PyObject* find_local_in_compose(PyComposeObject* cmps, PyObject* name) {
+static PyObject* find_local_in_compose(PyComposeObject* cmps, PyObject* name) {
     PyObject** generator = cmps->generators_top;
 
     while(--generator >= cmps->generators_base) {
-        if(PyAllGenerator_Check(*generator))
-            continue;
-        if(PyGen_Check(*generator)) {
-            PyObject* result = find_local_in_locals(((PyGenObject*) * generator)->gi_frame, name);
+        PyObject* result = NULL;
 
-            if(result != NULL)
-                return result;
+        if(PyGen_Check(*generator))
+            result = find_local_in_generator(*generator, name);
 
-        } else {
-            PyObject* result = find_local_in_compose((PyComposeObject*) * generator, name);
+        else if(PyCompose_Check(*generator))
+            result = find_local_in_compose((PyComposeObject*) * generator, name);
 
-            if(result != NULL)
-                return result;
-        }
+        if(result || PyErr_Occurred())
+            return result;
     }
 
     return NULL;
 }
 
 
-PyObject* find_local_in_locals(PyFrameObject* frame, PyObject* name) {
-    int i;
-
-    for(i = 0; i < PyTuple_Size(frame->f_code->co_varnames); i++) {
-        PyObject* localVar = frame->f_localsplus[i];
+static int is_running_generator_frame(PyComposeObject* cmps, PyObject* frame) {
+    // the generator a (nested) compose is running is on top of its stack
+    PyObject* generator = (PyObject*) cmps;
 
-        if(localVar) {
-            PyObject* localName = PyTuple_GetItem(frame->f_code->co_varnames, i);
+    while(PyCompose_Check(generator) && !generators_empty((PyComposeObject*) generator))
+        generator = *(((PyComposeObject*) generator)->generators_top - 1);
 
-            if(PyUnicode_Compare(name, localName) == 0) {
-                Py_INCREF(localVar);
-                return localVar;
-            }
-        }
-    }
+    if(!PyGen_Check(generator))
+        return 0;
 
-    if(frame->f_stacktop > frame->f_valuestack) {
-        PyObject* o = frame->f_stacktop[-1];
+    PyObject* generator_frame = PyObject_GetAttrString(generator, "gi_frame"); // new ref
 
-        if(Py_TYPE(o) == &PyCompose_Type) {
-            return find_local_in_compose((PyComposeObject*) o, name);
-        }
+    if(!generator_frame) {
+        PyErr_Clear();
+        return 0;
     }
 
-    return NULL;
+    Py_DECREF(generator_frame);
+    return generator_frame == frame;
 }
 
 
-PyObject* find_local_in_frame(PyFrameObject* frame, PyObject* name) {
-    if(!frame) return NULL;
-
+static PyObject* find_local_in_frame(PyObject* frame, PyObject* name) {
     PyObject* result = find_local_in_locals(frame, name);
 
-    if(result)
+    if(result || PyErr_Occurred())
         return result;
 
-    return find_local_in_frame(frame->f_back, name);
+    PyComposeObject* cmps;
+
+    for(cmps = running; cmps; cmps = cmps->running_outer)
+        if(is_running_generator_frame(cmps, frame)) {
+            result = find_local_in_compose(cmps, name);
+
+            if(result || PyErr_Occurred())
+                return result;
+        }
+
+    return NULL;
 }
 
 
+/* Names bound by weightless.core.LocalScope: a ContextVar holding a dict, or
+ * None.  These are found without walking the frames. */
+static PyObject* scoped_locals = NULL;
+
 PyObject* local(PyObject* self, PyObject* name) {
-    PyFrameObject* frame = PyEval_GetFrame();
-    PyObject* result = find_local_in_frame(frame, name);
+    PyObject* names = NULL;
 
-    if(!result) {
-        PyObject * ascii_name = PyUnicode_AsASCIIString(name);
-        PyErr_SetString(PyExc_AttributeError, PyBytes_AsString(ascii_name));
-        Py_DECREF(ascii_name);
+    if(PyContextVar_Get(scoped_locals, NULL, &names) < 0) // new ref
         return NULL;
+
+    if(names && names != Py_None) {
+        PyObject* value = PyDict_GetItemWithError(names, name); // borrowed ref
+        Py_XINCREF(value);
+        Py_DECREF(names);
+
+        if(value || PyErr_Occurred())
+            return value;
+    } else
+        Py_XDECREF(names);
+
+    PyFrameObject* frame = PyEval_GetFrame(); // borrowed ref
+    Py_XINCREF(frame);
+
+    while(frame) {
+        PyObject* result = find_local_in_frame((PyObject*) frame, name);
+
+        if(result || PyErr_Occurred()) {
+            Py_DECREF(frame);
+            return result;
+        }
+
+        PyFrameObject* back = PyFrame_GetBack(frame); // new ref
+        Py_DECREF(frame);
+        frame = back;
     }
 
-    return result;
+    PyErr_SetObject(PyExc_AttributeError, name);
+    return NULL;
 }
 
 
@@ -636,61 +770,75 @@ PyObject* py_getline;
 
 PyObject* tostring(PyObject* self, PyObject* gen) {
     if(PyGen_Check(gen)) {
-        PyFrameObject* frame = ((PyGenObject*)gen)->gi_frame;
+        PyObject* frame = PyObject_GetAttrString(gen, "gi_frame"); // new ref
 
         if(!frame)
-            return PyUnicode_FromString("<no frame>");
-
-        int ilineno = PyCode_Addr2Line(frame->f_code, frame->f_lasti);
-        PyObject* lineno = PyLong_FromLong(ilineno); // new ref
-        PyObject* codeline = PyObject_CallFunctionObjArgs(py_getline,
-                             frame->f_code->co_filename, lineno, NULL); // new ref
-        Py_CLEAR(lineno);
-
-        if(!codeline) return NULL;
-
-        PyObject* codeline_stripped = PyObject_CallMethod(codeline, "strip", NULL); // new ref
-        Py_CLEAR(codeline);
+            return NULL;
 
-        if(!codeline_stripped) return NULL;
-
-        PyObject* filename_ascii = PyUnicode_AsASCIIString(frame->f_code->co_filename);
-        PyObject* function_ascii = PyUnicode_AsASCIIString(frame->f_code->co_name);
-        PyObject* codeline_ascii = PyUnicode_AsASCIIString(codeline_stripped);
+        if(frame == Py_None) {
+            Py_DECREF(frame);
+            return PyUnicode_FromString("<no frame>");
+        }
 
-        PyObject* result
-            = PyUnicode_FromFormat("  File \"%s\", line %d, in %s\n    %s",
-                                PyBytes_AsString(filename_ascii),
-                                ilineno, PyBytes_AsString(function_ascii),
-                                PyBytes_AsString(codeline_ascii)); // new ref
-        Py_DECREF(filename_ascii);
-        Py_DECREF(function_ascii);
-        Py_DECREF(codeline_ascii);
+        PyCodeObject* code = PyFrame_GetCode((PyFrameObject*) frame); // new ref
+        int ilineno = PyFrame_GetLineNumber((PyFrameObject*) frame);
+        Py_DECREF(frame);
+        PyObject* codeline = PyObject_CallFunction(py_getline, "Oi", code->co_filename, ilineno); // new ref
+        PyObject* codeline_stripped = codeline ? PyObject_CallMethod(codeline, "strip", NULL) : NULL; // new ref
+        Py_XDECREF(codeline);
+        PyObject* result = codeline_stripped
+            ? PyUnicode_FromFormat("  File \"%U\", line %d, in %U\n    %U",
+                                   code->co_filename, ilineno, code->co_name, codeline_stripped) // new ref
+            : NULL;
+        Py_XDECREF(codeline_stripped);
+        Py_DECREF(code);
+
+        if(!result)
+            return NULL;
+
+        /* native delegation: yield from subgenerator() */
+        PyObject* delegate = PyObject_GetAttrString(gen, "gi_yieldfrom"); // new ref
+
+        if(!delegate) {
+            Py_DECREF(result);
+            return NULL;
+        }
 
+        if(PyGen_Check(delegate) || Py_TYPE(delegate) == &PyCompose_Type) {
+            PyObject* rest = tostring(NULL, delegate); // new ref
+            PyObject* joined = rest ? PyUnicode_FromFormat("%U\n%U", result, rest) : NULL; // new ref
+            Py_XDECREF(rest);
+            Py_DECREF(result);
+            result = joined;
+        }
 
-        Py_CLEAR(codeline_stripped);
+        Py_DECREF(delegate);
         return result;
 
     } else if(Py_TYPE(gen) == &PyCompose_Type) {
         PyComposeObject* cmps = (PyComposeObject*) gen;
-        PyObject* result = NULL;
-        PyObject** generator = cmps->generators_base;
+        Py_ssize_t n = cmps->generators_top - cmps->generators_base;
+        PyObject* lines = PyList_New(n); // new ref
+        Py_ssize_t i;
 
-        while(generator < cmps->generators_top) {
-            PyObject* s = tostring(NULL, *generator++);
+        if(!lines)
+            return NULL;
 
-            if(!result)
-                result = s;
+        for(i = 0; i < n; i++) {
+            PyObject* s = tostring(NULL, cmps->generators_base[i]); // new ref
 
-            else {
-                PyObject* x = PyUnicode_FromString("\n");
-                result = PyUnicode_Concat(result, x);
-                Py_DECREF(x);
-                result = PyUnicode_Concat(result, s);
-                Py_DECREF(s);
+            if(!s) {
+                Py_DECREF(lines);
+                return NULL;
             }
+
+            PyList_SET_ITEM(lines, i, s); // steals ref
         }
 
+        PyObject* separator = PyUnicode_FromString("\n"); // new ref
+        PyObject* result = separator ? PyUnicode_Join(separator, lines) : NULL; // new ref
+        Py_XDECREF(separator);
+        Py_DECREF(lines);
         return result;
     }
 
@@ -732,31 +880,6 @@ PyTypeObject PyCompose_Type = {
 
 ////////// Module initialization //////////
 
-static PyCodeObject* create_empty_code(void) {
-    PyObject* py_srcfile = PyUnicode_FromString(__FILE__);
-    PyObject* py_funcname = PyUnicode_FromString("compose");
-    PyObject* empty_string = PyBytes_FromString("");
-    PyObject* empty_tuple = PyTuple_New(0);
-    PyCodeObject* code = PyCode_New(
-                             0,                 // argcount
-                             0,                 // kwonlyargcount
-                             0,                 // nlocals
-                             1,                 // stacksize is 1
-                             0,                 // flags
-                             empty_string,      // code
-                             empty_tuple,       // consts
-                             empty_tuple,       // names
-                             empty_tuple,       // varnames
-                             empty_tuple,       // freevars
-                             empty_tuple,       // cellvars
-                             py_srcfile,        // filename
-                             py_funcname,       // name
-                             __LINE__,          // firstlineno
-                             empty_string       // lnotab
-                             );
-    return code;
-}
-
 int init_compose(PyObject* module) {
     PyObject* linecache = PyImport_ImportModule("linecache"); // new ref
 
@@ -781,9 +904,19 @@ int init_compose(PyObject* module) {
         return -1;
     }
 
-    py_code = create_empty_code();
+    PyObject* localscope = PyImport_ImportModule("weightless.core._localscope"); // new ref
+
+    if(!localscope) {
+        Py_CLEAR(linecache);
+        Py_CLEAR(py_getline);
+        PyErr_Print();
+        return -1;
+    }
+
+    scoped_locals = PyObject_GetAttrString(localscope, "scopedLocals"); // new ref
+    Py_DECREF(localscope);
 
-    if(!py_code) {
+    if(!scoped_locals) {
         Py_CLEAR(linecache);
         Py_CLEAR(py_getline);
         PyErr_Print();
@@ -793,7 +926,6 @@ int init_compose(PyObject* module) {
     if(PyType_Ready(&PyCompose_Type) < 0) {
         Py_CLEAR(linecache);
         Py_CLEAR(py_getline);
-        Py_CLEAR(py_code);
         PyErr_Print();
         return -1;
     }
@@ -828,15 +960,16 @@ PyObject* compose_selftest(PyObject* self, PyObject* null) {
     assertTrue(c.generators_top == c.generators_base, "generator top of stack invalid");
     assertTrue(c.generators_allocated == INITIAL_STACK_SIZE, "invalid allocated stack size");
     // test pushing to generator stack
-    Py_ssize_t refcount = Py_None->ob_refcnt;
-    assertTrue(generators_push(&c, Py_None) == 1, "generators_push must return 1");
-    assertTrue(Py_None->ob_refcnt == refcount + 1, "refcount not increased");
+    PyObject* item = PyList_New(0); // new ref; unlike None, not immortal
+    Py_ssize_t refcount = Py_REFCNT(item);
+    assertTrue(generators_push(&c, item) == 1, "generators_push must return 1");
+    assertTrue(Py_REFCNT(item) == refcount + 1, "refcount not increased");
     assertTrue(c.generators_top == c.generators_base + 1, "stack top not increased");
-    assertTrue(c.generators_base[0] == Py_None, "top of stack must be Py_None");
+    assertTrue(c.generators_base[0] == item, "top of stack must be item");
     int i;
 
     for(i = 0; i < INITIAL_STACK_SIZE * 3; i++)
-        generators_push(&c, Py_None);
+        generators_push(&c, item);
 
     assertTrue(c.generators_top - c.generators_base == 3 * INITIAL_STACK_SIZE + 1, "extending stack failed");
     assertTrue(c.generators_allocated == 2 * 2 * INITIAL_STACK_SIZE, "stack allocation failed");
@@ -844,12 +977,12 @@ PyObject* compose_selftest(PyObject* self, PyObject* null) {
     assertTrue(messages_empty(&c), "messages not empty");
     assertTrue(0 == _messages_size(&c), "initial queue size must be 0");
     // test append to messages queue
-    refcount = Py_None->ob_refcnt;
-    messages_append(&c, Py_None);
+    refcount = Py_REFCNT(item);
+    messages_append(&c, item);
     assertTrue(1 == _messages_size(&c), "now queue size must be 1");
-    assertTrue(Py_None->ob_refcnt == refcount + 1, "messages_append did not increase ref count");
+    assertTrue(Py_REFCNT(item) == refcount + 1, "messages_append did not increase ref count");
     assertTrue(!messages_empty(&c), "messages must not be empty");
-    assertTrue(Py_None == messages_pop(&c), "incorrect value from queue");
+    assertTrue(item == messages_pop(&c), "incorrect value from queue");
     // test next on messages queue
     assertTrue(0 == _messages_size(&c), "now queue size must be 0 again");
     assertTrue(messages_empty(&c), "messages must be empty again");
@@ -901,22 +1034,22 @@ PyObject* compose_selftest(PyObject* self, PyObject* null) {
     _compose_initialize(&c);
     PyObject* l0 = PyLong_FromLong(1000); // new ref
     PyObject* l1 = PyLong_FromLong(1001); //# new ref
-    assertTrue(1 == l0->ob_refcnt, "initial refcount of l0  must be 1");
-    assertTrue(1 == l1->ob_refcnt, "initial refcount of l1  must be 1");
+    assertTrue(1 == Py_REFCNT(l0), "initial refcount of l0  must be 1");
+    assertTrue(1 == Py_REFCNT(l1), "initial refcount of l1  must be 1");
 
     messages_insert(&c, l0); // wrap backward
     messages_append(&c, l1); // wrap forward
-    assertTrue(2 == l0->ob_refcnt, "after store, refcount of l0  must be 2");
-    assertTrue(2 == l1->ob_refcnt, "after store, refcount of l1  must be 2");
+    assertTrue(2 == Py_REFCNT(l0), "after store, refcount of l0  must be 2");
+    assertTrue(2 == Py_REFCNT(l1), "after store, refcount of l1  must be 2");
 
     PyObject* o = messages_pop(&c);           // end
     assertTrue(1000 == PyLong_AsLong(o), "expected 1000");
-    assertTrue(2 == o->ob_refcnt, "refcount of l0 from next must be 2");
+    assertTrue(2 == Py_REFCNT(o), "refcount of l0 from next must be 2");
     Py_DECREF(o);
 
     o = messages_pop(&c);                     // wrap
     assertTrue(1001 == PyLong_AsLong(o), "expected 1001");
-    assertTrue(2 == o->ob_refcnt, "refcount of l1 from next must be 2");
+    assertTrue(2 == Py_REFCNT(o), "refcount of l1 from next must be 2");
     Py_DECREF(o);
 
     o = messages_pop(&c);
@@ -925,11 +1058,12 @@ PyObject* compose_selftest(PyObject* self, PyObject* null) {
     PyErr_Clear();
 
     compose_clear(&c);
-    assertTrue(1 == l0->ob_refcnt, "remaining refcount of l0  must be 1");
-    assertTrue(1 == l1->ob_refcnt, "remaining refcount of l1  must be 1");
+    assertTrue(1 == Py_REFCNT(l0), "remaining refcount of l0  must be 1");
+    assertTrue(1 == Py_REFCNT(l1), "remaining refcount of l1  must be 1");
 
     Py_DECREF(l0);
     Py_DECREF(l1);
+    Py_DECREF(item);
 
     Py_RETURN_NONE;
 }
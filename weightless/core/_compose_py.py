@@ -24,7 +24,7 @@
 #
 ## end license ##
 
-from sys import exc_info
+from types import GeneratorType
 from weightless.core import cpython, is_generator
 
 """
@@ -85,42 +85,46 @@ def _compose(initial, stepping):
     """
     generators = [initial]
     __callstack__ = generators # make these visible to 'local()'
-    messages = [None]
+    message = None  # the first of the messages (or _NO_MESSAGE); mostly there is just one: the others wait in 'pending', the next one last
+    pending = []
     exception = None
     while generators:
         generator = generators[-1]
         try:
-            if exception:
-                if exception[0] == GeneratorExit:
+            if exception is None:
+                sent = message
+                message = pending.pop() if pending else _NO_MESSAGE
+                response = generator.send(sent)
+            else:
+                if type(exception) is GeneratorExit:
                     generator.close()
-                    raise exception[1]
-                response = generator.throw(*exception)
+                    raise exception
+                response = generator.throw(exception)
                 exception = None
-            else:
-                message = messages.pop(0)
-                response = generator.send(message)
             if is_generator(response):
                 generators.append(response)
-                frame = response.gi_frame
-                if cpython: assert frame, 'Generator is exhausted.'
-                if cpython: assert frame.f_lineno == frame.f_code.co_firstlineno, 'Generator already used.'
+                if __debug__ and cpython and type(response) is GeneratorType: # asserts; off with python -O
+                    assert response.gi_frame is not None, 'Generator is exhausted.'
+                    assert not (response.gi_suspended or response.gi_running), 'Generator already used.'
                 try:
                     if stepping:
                         _ = yield Yield
-                except BaseException:
-                    exType, exValue, exTraceback = exc_info()
-                    exception = (exType, exValue, exTraceback.tb_next)
+                except BaseException as e:
+                    exception = e.with_traceback(e.__traceback__.tb_next)
                     continue
                 if stepping: assert _ is None, 'Cannot accept data when stepping. First send None.'
-                messages.insert(0, None)
-            elif (response is not None) or not messages:
+                if message is not _NO_MESSAGE:
+                    pending.append(message)
+                message = None
+            elif (response is not None) or message is _NO_MESSAGE:
                 try:
-                    message = yield response
-                    assert message is None or response is None, 'Cannot accept data. First send None.'
-                    messages.insert(0, message)
-                except BaseException:
-                    exType, exValue, exTraceback = exc_info()
-                    exception = (exType, exValue, exTraceback.tb_next)
+                    sent = yield response
+                    assert sent is None or response is None, 'Cannot accept data. First send None.'
+                    if message is not _NO_MESSAGE:
+                        pending.append(message)
+                    message = sent
+                except BaseException as e:
+                    exception = e.with_traceback(e.__traceback__.tb_next)
         except StopIteration as returnValue:
             exception = None
             generators.pop()
@@ -128,14 +132,20 @@ def _compose(initial, stepping):
             if type(retval) is tuple and len(retval) == 1 and type(retval[0]) is tuple:
                 retval = retval[0]
             if retval:
-                messages[0:0] = retval
-            else:
-                generators and messages.insert(0, None)
-
-        except BaseException:
+                if message is not _NO_MESSAGE:
+                    pending.append(message)
+                if len(retval) > 1:
+                    pending.extend(reversed(retval[1:]))
+                message = retval[0]
+            elif generators:
+                if message is not _NO_MESSAGE:
+                    pending.append(message)
+                message = None
+        except BaseException as e:
             generators.pop()
-            exType, exValue, exTraceback = exc_info()
-            exception = (exType, exValue, exTraceback.tb_next)
-    if exception:
-        raise exception[1].with_traceback(exception[2])
-    return None if len(messages) == 0 else messages[0]
+            exception = e.with_traceback(e.__traceback__.tb_next)
+    if exception is not None:
+        raise exception
+    return None if message is _NO_MESSAGE else message
+
+_NO_MESSAGE = object()
@@ -25,6 +25,8 @@
 
 from inspect import currentframe
 
+from ._localscope import scopedLocals
+
 
 def findInLocals(f_locals, localName):
     if localName in f_locals:
@@ -48,6 +50,9 @@ def findLocalInFrame(frame, localName):
     raise AttributeError(localName) from None
 
 def local(localName):
+    names = scopedLocals.get()
+    if names is not None and localName in names:
+        return names[localName]
     frame = currentframe().f_back
     try:
         return findLocalInFrame(frame, localName)
@@ -98,7 +98,7 @@ PyObject* _get_next_value(int* i, PyObject* methods, PyObject* args, PyObject* k
 /// AllGenerator Methods ///
 
 int PyAllGenerator_Check(PyObject* obj) {
-    return PyObject_Type(obj) == (PyObject*) &PyAllGenerator_Type;
+    return Py_TYPE(obj) == &PyAllGenerator_Type;
 }
 
 static PyObject* allgenerator_iter(PyObject *self) {
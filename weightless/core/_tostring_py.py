@@ -26,8 +26,14 @@
 from linecache import getline
 from types import GeneratorType
 
+from weightless.core import cextension
+if cextension:
+    from weightless.core.ext import compose as _CCompose, tostring as _ctostring
+
 
 def tostring(generator):
+    if cextension and type(generator) is _CCompose:
+        return _ctostring(generator)  # Its stack is only accessible from C; rendered the same way.
     if type(generator) != GeneratorType:
         raise TypeError("tostring() expects generator")
     frame = generator.gi_frame
@@ -42,4 +48,8 @@ def tostring(generator):
             return tostring(glocals['initial'])
     filename = code.co_filename
     codeline = getline(filename, lineno).strip() or "<no source line available>"
-    return '  File "%(filename)s", line %(lineno)s, in %(name)s\n    %(codeline)s' % locals()
+    result = '  File "%(filename)s", line %(lineno)s, in %(name)s\n    %(codeline)s' % locals()
+    delegate = getattr(generator, 'gi_yieldfrom', None)  # Native delegation: yield from subgenerator(), or yield from compose(...).
+    if type(delegate) is GeneratorType or (cextension and type(delegate) is _CCompose):
+        result += '\n' + tostring(delegate)
+    return result
@@ -24,12 +24,14 @@
 #
 ## end license ##
 
-from socket import socket, SOL_SOCKET, SO_REUSEADDR, SO_LINGER, SOL_TCP, TCP_CORK
+from socket import socket, SOL_SOCKET, SO_REUSEADDR, SO_REUSEPORT, SO_LINGER, SOL_TCP, TCP_CORK
 from struct import pack
 
-def createSocket(port, bindAddress=None):
+def createSocket(port, bindAddress=None, reusePort=False):
     sok = socket()
     sok.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    if reusePort:
+        sok.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)  # Each process its own listening socket; the kernel spreads the connections.
     sok.setsockopt(SOL_SOCKET, SO_LINGER, pack('ii', 0, 0))
     sok.bind(('0.0.0.0' if bindAddress is None else bindAddress, port))
     sok.listen(127)
@@ -38,17 +40,28 @@ def createSocket(port, bindAddress=None):
 class Acceptor(object):
     """Listens on a port for incoming internet (TCP/IP) connections and calls a factory to create a handler for the new connection.  It does not use threads but a asynchronous reactor instead."""
 
-    def __init__(self, reactor, port, sinkFactory, prio=None, sok=None, bindAddress=None):
-        """The reactor is a user specified reactor for dispatching I/O events asynchronously. The sinkFactory is called with the newly created socket as its single argument. It is supposed to return a callable callback function that is called by the reactor when data is available."""
+    def __init__(self, reactor, port, sinkFactory, prio=None, sok=None, bindAddress=None, edgeTriggered=False, exclusive=False):
+        """The reactor is a user specified reactor for dispatching I/O events asynchronously. The sinkFactory is called with the newly created socket as its single argument. It is supposed to return a callable callback function that is called by the reactor when data is available.
+
+        With edgeTriggered, both the listening socket and the new connections are registered edge-triggered: all pending connections are accepted at once, and the callback returned by sinkFactory must read until EAGAIN.
+
+        With exclusive, the listening socket is registered with EPOLLEXCLUSIVE; for a socket shared by (forked) processes, which then are not all woken up for each new connection.   Without it, a shared sok should be non-blocking; a connection taken by another process is then not waited for."""
 
         if sok == None:
             sok = createSocket(port, bindAddress=bindAddress)
-
-        reactor.addReader(sok, self._accept, prio=prio)
+        if edgeTriggered or exclusive:
+            sok.setblocking(False)  # Other processes may have taken the connection.
+        if edgeTriggered:
+            reactor.addReader(sok, self._acceptAll, prio=prio, edgeTriggered=True, exclusive=exclusive)
+        elif exclusive:
+            reactor.addReader(sok, self._acceptShared, prio=prio, exclusive=True)
+        else:
+            reactor.addReader(sok, self._acceptShared, prio=prio)  # Plain accept for a blocking sok; for a non-blocking (shared) one, a connection taken by another process is not waited for.
         self._sinkFactory = sinkFactory
         self._sok = sok
         self._reactor = reactor
         self._prio = prio
+        self._edgeTriggered = edgeTriggered
 
     def _accept(self):
         newConnection, address = self._sok.accept()
@@ -56,7 +69,23 @@ class Acceptor(object):
         #newConnection.setsockopt(SOL_TCP, TCP_NODELAY, 1)
         handler = self._sinkFactory(newConnection)
         if handler:
-            self._reactor.addReader(newConnection, handler, prio=self._prio)
+            if self._edgeTriggered:
+                self._reactor.addReader(newConnection, handler, prio=self._prio, edgeTriggered=True)
+            else:
+                self._reactor.addReader(newConnection, handler, prio=self._prio)
+
+    def _acceptAll(self):
+        while True:
+            try:
+                self._accept()
+            except BlockingIOError:
+                return
+
+    def _acceptShared(self):
+        try:
+            self._accept()
+        except BlockingIOError:
+            pass
 
     def close(self):
         self._sok.close()
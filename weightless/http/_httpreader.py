@@ -27,6 +27,7 @@ from socket import socket, SHUT_RDWR
 from urllib.parse import urlsplit
 from weightless.http import REGEXP, FORMAT, HTTP, parseHeaders
 from ._bufferedhandler import BufferedHandler
+from weightless.io._reactor import _addTimeout, _removeTimeout
 
 RECVSIZE = 4096
 
@@ -94,7 +95,7 @@ class HttpReader(object):
         self._reactor.addWriter(self._sok, requestSendMethod)
         self._timeOuttime = timeout
 
-        self._timer = self._reactor.addTimer(self._timeOuttime, self._timeOut)
+        self._timer = _addTimeout(self._reactor, self._timeOuttime, self._timeOut)
         self._recvSize = recvSize
         self._buffer = b''
         self._peername = self._sok.getpeername()
@@ -193,11 +194,11 @@ class HttpReader(object):
             self._handler.send(fragment)
 
     def _startTimer(self):
-        self._timer = self._reactor.addTimer(self._timeOuttime, self._timeOut)
+        self._timer = _addTimeout(self._reactor, self._timeOuttime, self._timeOut)
 
     def _stopTimer(self):
         if self._timer:
-            self._reactor.removeTimer(self._timer)
+            _removeTimeout(self._reactor, self._timer)
             self._timer = None
 
     def _timeOut(self):
@@ -26,6 +26,7 @@
 
 from ._acceptor import Acceptor
 from weightless.core import identify, Yield, compose
+from weightless.io._reactor import _addTimeout, _removeTimeout
 from weightless.http import REGEXP, parseHeaders, parseHeaderFieldvalue
 
 import re
@@ -49,7 +50,9 @@ CRLF_LEN = 2
 class HttpServer(object):
     """Factory that creates a HTTP server listening on port, calling generatorFactory for each new connection.  When a client does not send a valid HTTP request, it is disconnected after timeout seconds. The generatorFactory is called with the HTTP Status and Headers as arguments.  It is expected to return a generator that produces the response -- including the Status line and Headers -- to be send to the client."""
 
-    def __init__(self, reactor, port, generatorFactory, timeout=1, recvSize=RECVSIZE, prio=None, sok=None, maxConnections=None, errorHandler=None, compressResponse=False, bindAddress=None, socketWrapper=None):
+    def __init__(self, reactor, port, generatorFactory, timeout=1, recvSize=RECVSIZE, prio=None, sok=None, maxConnections=None, errorHandler=None, compressResponse=False, bindAddress=None, socketWrapper=None, edgeTriggered=False, exclusive=False):
+        if edgeTriggered and socketWrapper is not None:
+            raise ValueError('edgeTriggered not supported with a socketWrapper')  # (SSL) wrappers buffer data; epoll can't see that.
         self._reactor = reactor
         self._port = port
         self._bindAddress = bindAddress
@@ -62,6 +65,8 @@ class HttpServer(object):
         self._errorHandler = errorHandler
         self._compressResponse = compressResponse
         self._socketWrapper = socketWrapper
+        self._edgeTriggered = edgeTriggered
+        self._exclusive = exclusive
 
     def listen(self):
         self._acceptor = Acceptor(
@@ -76,11 +81,14 @@ class HttpServer(object):
                 prio=self._prio,
                 maxConnections=self._maxConnections,
                 errorHandler=self._errorHandler,
-                compressResponse=self._compressResponse
+                compressResponse=self._compressResponse,
+                edgeTriggered=self._edgeTriggered,
             ),
             prio=self._prio,
             sok=self._sok,
-            bindAddress=self._bindAddress)
+            bindAddress=self._bindAddress,
+            edgeTriggered=self._edgeTriggered,
+            exclusive=self._exclusive)
 
     def setMaxConnections(self, m):
         self._maxConnections = m
@@ -201,7 +209,7 @@ SUPPORTED_COMPRESSION_CONTENT_ENCODINGS = {
 }
 
 class HttpHandler(object):
-    def __init__(self, reactor, sok, generatorFactory, timeout, recvSize=RECVSIZE, prio=None, maxConnections=None, errorHandler=None, compressResponse=False):
+    def __init__(self, reactor, sok, generatorFactory, timeout, recvSize=RECVSIZE, prio=None, maxConnections=None, errorHandler=None, compressResponse=False, edgeTriggered=False):
         self._reactor = reactor
         self._sok = sok
         self._generatorFactory = generatorFactory
@@ -220,10 +228,23 @@ class HttpHandler(object):
 
         self._compressResponse = compressResponse
         self._decodeRequestBody = None
+        self._edgeTriggered = edgeTriggered
+        self._reading = True
 
 
     def __call__(self):
-        part = self._sok.recv(self._recvSize)
+        if not self._edgeTriggered:
+            return self._handlePart(self._sok.recv(self._recvSize))
+
+        # Edge-triggered: no new event for data that is already there, so read until EAGAIN (or done reading).
+        while self._reading:
+            try:
+                part = self._sok.recv(self._recvSize, MSG_DONTWAIT)
+            except BlockingIOError:
+                return
+            self._handlePart(part)
+
+    def _handlePart(self, part):
         if not part:
             # SOCKET CLOSED by PEER
             self._badRequest()
@@ -298,8 +319,8 @@ class HttpHandler(object):
 
     def _resetTimer(self):
         if self._timer:
-            self._reactor.removeTimer(self._timer)
-        self._timer = self._reactor.addTimer(self._timeout, self._badRequest)
+            _removeTimeout(self._reactor, self._timer)
+        self._timer = _addTimeout(self._reactor, self._timeout, self._badRequest)
 
     def _readBody(self):
         # Determine Content-Encoding in request, if any.
@@ -372,7 +393,8 @@ class HttpHandler(object):
         self.request['Client'] = self._sok.getpeername()
         self._handler = finalizeMethod(**self.request)
         if self._timer:
-            self._reactor.removeTimer(self._timer)
+            _removeTimeout(self._reactor, self._timer)
+        self._reading = False
         self._reactor.removeReader(self._sok)
         self._reactor.addWriter(self._sok, self._writeResponse(encoding=encoding).__next__, prio=self._prio)
 
@@ -380,6 +402,7 @@ class HttpHandler(object):
         self._finalize(self._generatorFactory)
 
     def _badRequest(self):
+        self._reading = False
         self._sok.send(b'HTTP/1.0 400 Bad Request\r\n\r\n')
         self._reactor.removeReader(self._sok)
         self._sok.shutdown(SHUT_RDWR)
@@ -0,0 +1,184 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import gc
+import os
+from signal import signal, pthread_sigmask, Signals, SIGTERM, SIGINT, SIG_DFL, SIG_BLOCK, SIG_SETMASK
+from sys import stderr
+from time import sleep, monotonic
+from traceback import print_exc
+
+from weightless.io import Reactor
+from ._acceptor import createSocket
+
+
+class PreforkServer(object):
+    """Supervisor that forks a number of worker processes, each with its own Reactor, serving one port.
+
+    In each worker setupWorker(reactor=..., sok=..., workerIndex=...) is called to create the DNA tree; it should pass sok to its HttpServer (HttpServer(reactor, port, ..., sok=sok)).  After that, the worker's reactor loops until the worker is terminated.
+
+    With reusePort (the default) each worker gets a listening socket of its own with SO_REUSEPORT, and the kernel spreads the connections over them.  Otherwise all workers inherit one listening socket from the supervisor.  It is non-blocking, so a worker woken up for a connection another worker took does not block in accept(); creating their HttpServer with exclusive=True (EPOLLEXCLUSIVE) also keeps every worker from being woken up for each connection.
+
+    run() blocks until the supervisor gets SIGTERM or SIGINT, then terminates the workers; crashed workers are restarted."""
+
+    def __init__(self, port, setupWorker, workers=None, bindAddress=None, reusePort=True, cpuAffinity=False, freezeGc=True, restart=True, restartDelay=1.0):
+        self._port = port
+        self._setupWorker = setupWorker
+        self._workers = workers if workers else os.cpu_count()
+        self._bindAddress = bindAddress
+        self._reusePort = reusePort
+        self._cpuAffinity = cpuAffinity
+        self._freezeGc = freezeGc
+        self._restart = restart
+        self._restartDelay = restartDelay
+        self._sok = None
+        self._pids = {}
+        self._running = False
+
+    def run(self):
+        self._running = True
+        previousHandlers = [(signum, signal(signum, self._onSignal)) for signum in (SIGTERM, SIGINT)]
+        try:
+            if not self._reusePort:
+                self._sok = createSocket(self._port, bindAddress=self._bindAddress)
+                self._sok.setblocking(False)  # Shared: accept() in all workers woken up for one connection.
+            if self._freezeGc:
+                gc.collect()
+                gc.freeze()  # Keeps the supervisor's objects out of the workers' collections; their memory pages stay shared (copy-on-write).
+            for workerIndex in range(self._workers):
+                self._fork(workerIndex)
+            self._supervise()
+        except _ShutdownRequested:
+            pass
+        finally:
+            for signum, handler in previousHandlers:
+                signal(signum, handler)
+            self._terminateWorkers()
+            if self._sok is not None:
+                self._sok.close()
+                self._sok = None
+
+    def workerPids(self):
+        return dict((workerIndex, pid) for pid, workerIndex in self._pids.items())
+
+    def _supervise(self):
+        lastStarted = {}
+        while self._running:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                return
+            except InterruptedError:
+                continue
+            workerIndex = self._pids.pop(pid, None)
+            if workerIndex is None or not self._running:
+                continue
+            stderr.write('[PreforkServer]: worker %d (pid %d) %s.\n' % (workerIndex, pid, _exitDescription(status)))
+            stderr.flush()
+            if not self._restart:
+                if not self._pids:
+                    return
+                continue
+            tooSoon = self._restartDelay - (monotonic() - lastStarted.get(workerIndex, 0))
+            if tooSoon > 0:
+                sleep(tooSoon)  # No busy fork-loop for a worker that crashes on startup.
+            if self._running:
+                lastStarted[workerIndex] = monotonic()
+                self._fork(workerIndex)
+
+    def _fork(self, workerIndex):
+        mask = pthread_sigmask(SIG_BLOCK, [SIGTERM, SIGINT])  # Until the pid is recorded: _onSignal raises, a worker forked but not in _pids would be orphaned.
+        try:
+            pid = os.fork()
+            if pid == 0:
+                exitCode = 1
+                try:
+                    exitCode = self._worker(workerIndex, mask)
+                except:
+                    print_exc()
+                finally:
+                    stderr.flush()
+                    os._exit(exitCode)
+            self._pids[pid] = workerIndex
+        finally:
+            pthread_sigmask(SIG_SETMASK, mask)
+
+    def _worker(self, workerIndex, mask):
+        for signum in (SIGTERM, SIGINT):
+            signal(signum, _exitWorker)
+        pthread_sigmask(SIG_SETMASK, mask)
+        if self._cpuAffinity:
+            cpus = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, [cpus[workerIndex % len(cpus)]])
+        sok = self._sok if self._sok is not None else createSocket(self._port, bindAddress=self._bindAddress, reusePort=True)
+        reactor = Reactor()
+        self._setupWorker(reactor=reactor, sok=sok, workerIndex=workerIndex)
+        try:
+            reactor.loop()
+        except SystemExit as e:
+            return _exitCode(e.code)
+        return 0
+
+    def _onSignal(self, signum, frame):
+        self._running = False
+        raise _ShutdownRequested()  # Otherwise os.wait() is just resumed (PEP 475).
+
+    def _terminateWorkers(self):
+        for pid in list(self._pids):
+            try:
+                os.kill(pid, SIGTERM)
+            except ProcessLookupError:
+                self._pids.pop(pid)
+        while self._pids:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            self._pids.pop(pid, None)
+        self._pids.clear()
+
+
+class _ShutdownRequested(Exception):
+    pass
+
+def _exitCode(code):
+    "The exit code for SystemExit(code), like sys.exit: None is 0, another non-int is printed and 1."
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    stderr.write('%s\n' % code)
+    return 1
+
+def _exitDescription(status):
+    exitCode = os.waitstatus_to_exitcode(status)
+    if exitCode < 0:
+        return 'was killed by signal %s' % Signals(-exitCode).name
+    return 'exited with status %d' % exitCode
+
+def _exitWorker(signum, frame):
+    signal(signum, SIG_DFL)
+    raise SystemExit(0)  # Leaves reactor.loop() through its finally: the reactor is shut down properly.
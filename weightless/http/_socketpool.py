@@ -26,7 +26,7 @@
 import sys
 from random import choice
 from socket import SHUT_RDWR
-from time import time
+from time import monotonic
 from traceback import print_exc
 
 from weightless.core import Observable, compose, identify
@@ -61,6 +61,7 @@ class SocketPool(Observable):
     def __init__(self, reactor, unusedTimeout=None, limits=None, **kwargs):
         Observable.__init__(self, **kwargs)
         self._reactor = reactor
+        self._now = getattr(reactor, 'now', monotonic)  # The reactor's clock (see Reactor.now), so unusedTimeout also works with a VirtualClock.
         self._unusedTimeout = unusedTimeout
         self._limitTotalSize = limits.get(_TOTAL_SIZE) if limits else None
         self._limitDestinationSize = limits.get(_DESTINATION_SIZE) if limits else None
@@ -92,7 +93,7 @@ class SocketPool(Observable):
         # Expects a socket *object*, not a file-descriptor!
         key = (host, port)
         yield self._purgeSocksIfOversized(key)
-        self._pool.setdefault(key, []).append((sock, time()))
+        self._pool.setdefault(key, []).append((sock, self._now()))
         self._poolSize += 1
         return
         yield
@@ -126,7 +127,7 @@ class SocketPool(Observable):
                     yield  # Wait for timer
 
                     # Purge idle sockets
-                    now = time()
+                    now = self._now()
                     unusedTimeout = self._unusedTimeout
                     for (host, port), _list in list(self._pool.items()):
                         for t in _list[:]:
@@ -31,6 +31,15 @@ class TooBigResponseException(Exception):
 
 from ._reactor import Reactor, reactor
 from ._suspend import Suspend
+from ._executor import Executor, ExecutorQueueFull, runInExecutor, setDefaultExecutor, awaitFuture
+from ._subprocess import Subprocess
+from ._fileio import AsyncFile, streamFile
+from ._instrumentation import ReactorInstrumentation, Histogram
+from ._stackdump import stackDump, stackDumpReport, dumpStacksOnSignal
+from ._trace import TraceRecorder, readTrace, summarizeTrace
+from ._asyncioreactor import AsyncioReactor, fromAwaitable
+from ._iouring import IoUringPoller, ioUringOrEpoll
+from ._virtualclock import VirtualClock
 
 from ._gio import Gio, open as giopen, SocketContext, Timer
 from ._server import Server
@@ -0,0 +1,402 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import asyncio
+from sys import exc_info
+from threading import Lock, Thread
+
+from weightless.core import LocalScope
+from ._reactor import _FDContext, _ProcessContext, _fdNormalize, _HandleEBADFError, _shutdownMessage, _closeAndIgnoreFdErrors, _printException, READ_INTENT, WRITE_INTENT
+from ._suspend import Suspend, _retval
+
+
+class AsyncioReactor(object):
+    """A Reactor on an asyncio event-loop (add_reader / add_writer / call_at); the same API as weightless.io.Reactor, so DNA and asyncio libraries can share one loop (any asyncio loop implementation, e.g. uvloop's).
+
+    Either drive it like the Reactor, with loop() or step(), or run the asyncio loop yourself (e.g. asyncio.run(...) with AsyncioReactor(loop=asyncio.get_running_loop())); the callbacks are called from the loop either way.  prio is checked, but all callbacks are equal to asyncio; edgeTriggered, oneshot and exclusive are not supported."""
+
+    def __init__(self, loop=None):
+        self._ownLoop = loop is None
+        self._asyncioLoop = asyncio.new_event_loop() if loop is None else loop
+        self._readers = {}
+        self._writers = {}
+        self._suspended = {}
+        self._running = {}
+        self._waitingForIO = {}
+        self._signalHandlers = set()
+        self._processRound = None
+        self._stepping = False
+        self._raise = None
+        self._loop = True
+        self.currenthandle = None
+        self.currentcontext = None
+        self._localScope = LocalScope(__reactor__=self)  # For reactor(), in the callbacks.
+
+    @property
+    def asyncioLoop(self):
+        return self._asyncioLoop
+
+    def addReader(self, sok, sink, prio=None, edgeTriggered=False, oneshot=False, exclusive=False):
+        self._addFD(sok, sink, READ_INTENT, prio, edgeTriggered or oneshot or exclusive)
+
+    def addWriter(self, sok, source, prio=None, edgeTriggered=False, oneshot=False):
+        self._addFD(sok, source, WRITE_INTENT, prio, edgeTriggered or oneshot)
+
+    def addProcess(self, process, prio=None):
+        if process in self._suspended:
+            raise ValueError('Process is suspended')
+        if process in self._running or process in self._waitingForIO:
+            raise ValueError('Process is already in processes')
+        self._running[process] = _ProcessContext(process, prio)
+        self._scheduleProcesses()
+
+    def addTimer(self, seconds, callback):
+        assert seconds >= 0, 'Timeout must be >= 0. It was %s.' % seconds
+        timer = _AsyncioTimer(callback, self._asyncioLoop.time() + seconds)
+        timer.handle = self._asyncioLoop.call_at(timer.time, self._timerCallback, timer)
+        return timer
+
+    addTimeout = addTimer
+
+    def now(self):
+        return self._asyncioLoop.time()
+
+    def callSoonThreadsafe(self, callback):
+        self._asyncioLoop.call_soon_threadsafe(self._threadsafeCallback, callback)
+
+    def addSignalHandler(self, signum, callback):
+        if signum in self._signalHandlers:
+            raise ValueError('Signal %s already has a handler' % signum)
+        self._asyncioLoop.add_signal_handler(signum, self._threadsafeCallback, callback)
+        self._signalHandlers.add(signum)
+
+    def removeSignalHandler(self, signum):
+        if signum not in self._signalHandlers:
+            raise ValueError('Signal %s has no handler' % signum)
+        self._signalHandlers.discard(signum)
+        self._asyncioLoop.remove_signal_handler(signum)
+
+    def removeReader(self, sok):
+        self._removeFD(sok, READ_INTENT)
+
+    def removeWriter(self, sok):
+        self._removeFD(sok, WRITE_INTENT)
+
+    def removeProcess(self, process=None):
+        if process is None:
+            process = self.currentcontext.callback
+        if process in self._running:
+            del self._running[process]
+            return True
+        if process in self._waitingForIO:
+            del self._waitingForIO[process]
+            return True
+
+    def removeTimer(self, token):
+        if not token.pending:
+            raise ValueError('Timer not pending')
+        token.pending = False
+        token.handle.cancel()
+
+    removeTimeout = removeTimer
+
+    def idle(self):
+        "No back-off here; asyncio does not busy-poll: processes are called once per loop iteration."
+        self._currentProcessContext()
+
+    def yieldUntilIO(self):
+        self._currentProcessContext()
+        self._waitingForIO[self.currenthandle] = self._running.pop(self.currenthandle)
+
+    def cleanup(self, sok):
+        try:
+            fd = _fdNormalize(sok)
+        except _HandleEBADFError:
+            for fds in (self._readers, self._writers, self._suspended):
+                for handle, context in list(fds.items()):
+                    if getattr(context, 'fileOrFd', None) == sok:
+                        self._forget(fds, handle)
+        else:
+            for fds in (self._readers, self._writers, self._suspended):
+                self._forget(fds, fd)
+
+    def suspend(self):
+        if self.currenthandle is None:
+            raise RuntimeError('suspend called from a timer or when running a last-call callback for a bad file-descriptor.')
+        handle = self.currenthandle
+        for fds in (self._readers, self._writers):
+            if fds.get(handle) is self.currentcontext:
+                self._forget(fds, handle)
+                break
+        else:
+            if not self.removeProcess(handle):
+                raise RuntimeError('Current context not found!')
+        self._suspended[handle] = self.currentcontext
+        return handle
+
+    def resumeReader(self, handle):
+        self._resumeFD(handle, READ_INTENT)
+
+    def resumeWriter(self, handle):
+        self._resumeFD(handle, WRITE_INTENT)
+
+    def resumeProcess(self, handle):
+        self._running[handle] = self._suspended.pop(handle)
+        self._scheduleProcesses()
+
+    def getOpenConnections(self):
+        return len(set(self._readers) | set(self._writers))
+
+    def _callbacksByState(self):
+        "(state, callback) for each reader, writer, process and suspended context; see stackDump()."
+        for state, contexts in [('reading', self._readers), ('writing', self._writers), ('running', self._running), ('waiting for I/O', self._waitingForIO), ('suspended', self._suspended)]:
+            for context in list(contexts.values()):
+                yield state, context.callback
+
+    def shutdown(self):
+        for fds, info in [(self._readers, 'active'), (self._writers, 'active'), (self._suspended, 'suspended'), (self._running, 'active'), (self._waitingForIO, 'active')]:
+            for handle, context in list(fds.items()):
+                self._forget(fds, handle)
+                obj = context.fileOrFd if hasattr(context, 'fileOrFd') else context.callback
+                if hasattr(obj, 'close'):
+                    print(_shutdownMessage(message='closing - %s' % info, thing=obj, context=context))
+                    _closeAndIgnoreFdErrors(obj)
+                else:
+                    print(_shutdownMessage(message='terminating - %s' % info, thing=handle, context=context))
+        for signum in list(self._signalHandlers):
+            self.removeSignalHandler(signum)
+        if self._ownLoop and not self._asyncioLoop.is_closed():
+            self._asyncioLoop.close()
+
+    def request_shutdown(self):
+        self._loop = False
+
+    def loop(self):
+        try:
+            while self._loop:
+                self.step()
+        finally:
+            self.shutdown()
+
+    def step(self):
+        "Runs the asyncio loop until (at least) one of the reactor's callbacks was called."
+        self._stepping = True
+        try:
+            self._asyncioLoop.run_forever()
+        finally:
+            self._stepping = False
+        if self._raise is not None:
+            exception, self._raise = self._raise, None
+            raise exception[1].with_traceback(exception[2])
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+    def _addFD(self, fileOrFd, callback, intent, prio, unsupported):
+        if unsupported:
+            raise ValueError('edgeTriggered, oneshot and exclusive are not supported by AsyncioReactor')
+        context = _FDContext(callback, fileOrFd, intent, prio)
+        fds = self._readers if intent is READ_INTENT else self._writers
+        try:
+            fd = _fdNormalize(fileOrFd)
+            if fd in fds:
+                raise ValueError('fd already registered')
+            if fd in self._suspended:
+                raise ValueError('Socket is suspended')
+            self._register(fd, context)
+        except (_HandleEBADFError, TypeError, OSError):
+            _printException()
+            self._asyncioLoop.call_soon(self._lastCallback, context)  # Lets the callback find out about the bad file-descriptor.
+        else:
+            fds[fd] = context
+
+    def _register(self, fd, context):
+        if context.intent is READ_INTENT:
+            self._asyncioLoop.add_reader(fd, self._fdCallback, fd, context)
+        else:
+            self._asyncioLoop.add_writer(fd, self._fdCallback, fd, context)
+
+    def _resumeFD(self, handle, intent):
+        context = self._suspended.pop(handle)
+        context.intent = intent
+        try:
+            _fdNormalize(context.fileOrFd)
+            self._register(handle, context)
+        except (_HandleEBADFError, OSError):
+            self._asyncioLoop.call_soon(self._lastCallback, context)
+        else:
+            (self._readers if intent is READ_INTENT else self._writers)[handle] = context
+
+    def _removeFD(self, fileOrFd, intent):
+        fds = self._readers if intent is READ_INTENT else self._writers
+        try:
+            fd = _fdNormalize(fileOrFd)
+        except _HandleEBADFError:
+            for handle, context in list(fds.items()):
+                if context.fileOrFd == fileOrFd:
+                    self._forget(fds, handle)
+            return
+        self._forget(fds, fd)
+
+    def _forget(self, fds, handle):
+        context = fds.pop(handle, None)
+        if context is None:
+            return
+        try:
+            if fds is self._readers:
+                self._asyncioLoop.remove_reader(handle)
+            elif fds is self._writers:
+                self._asyncioLoop.remove_writer(handle)
+        except (OSError, ValueError):
+            pass  # Closed meanwhile.
+
+    def _fdCallback(self, fd, context):
+        if self._waitingForIO:
+            self._running.update(self._waitingForIO)
+            self._waitingForIO.clear()
+            self._scheduleProcesses()
+        self.currenthandle = fd
+        self.currentcontext = context
+        fds = self._readers if context.intent is READ_INTENT else self._writers
+        try:
+            with self._localScope:
+                context.callback()
+        except (AssertionError, SystemExit, KeyboardInterrupt):
+            self._forget(fds, fd)
+            self._raise = exc_info()
+        except:
+            _printException()
+            if fds.get(fd) is context:
+                self._forget(fds, fd)
+        self._stepDone()
+
+    def _timerCallback(self, timer):
+        timer.pending = False
+        self.currenthandle = None
+        self.currentcontext = timer
+        self._call(timer.callback)
+
+    def _threadsafeCallback(self, callback):
+        self.currenthandle = None
+        self.currentcontext = None
+        self._call(callback)
+
+    def _lastCallback(self, context):
+        self.currenthandle = None
+        self.currentcontext = context
+        self._call(context.callback)
+
+    def _call(self, callback):
+        try:
+            with self._localScope:
+                callback()
+        except (AssertionError, SystemExit, KeyboardInterrupt):
+            self._raise = exc_info()
+        except:
+            _printException()
+        self._stepDone()
+
+    def _processCallbacks(self):
+        self._processRound = None
+        for self.currenthandle, context in list(self._running.items()):
+            if self.currenthandle in self._running:
+                self.currentcontext = context
+                try:
+                    with self._localScope:
+                        context.callback()
+                except:
+                    self.removeProcess(self.currenthandle)
+                    self._raise = exc_info()
+                    break
+        self._scheduleProcesses()
+        self._stepDone()
+
+    def _scheduleProcesses(self):
+        if self._running and self._processRound is None:
+            self._processRound = self._asyncioLoop.call_soon(self._processCallbacks)
+
+    def _currentProcessContext(self):
+        context = self._running.get(self.currenthandle)
+        if context is None or context is not self.currentcontext:
+            raise RuntimeError('Not called from a process.')
+        return context
+
+    def _stepDone(self):
+        if self._stepping:
+            self._asyncioLoop.stop()  # Returns from run_forever() after this iteration of the asyncio loop.
+
+
+class _AsyncioTimer(object):
+    def __init__(self, callback, time):
+        self.callback = callback
+        self.time = time
+        self.pending = True
+        self.handle = None
+
+
+def fromAwaitable(awaitable):
+    """For composed generators: result = yield fromAwaitable(someCoroutine()).
+
+    The generator is suspended until the awaitable is done; then resumed with its result, or its exception is raised.  With an AsyncioReactor it is run on that reactor's loop; with the (epoll) Reactor, on an asyncio loop in a background thread."""
+    suspend = Suspend(doNext=lambda suspend: _runAwaitable(suspend, awaitable))
+    yield suspend
+    return _retval(suspend.getResult())
+
+def _runAwaitable(suspend, awaitable):
+    reactor = suspend._reactor
+    loop = getattr(reactor, 'asyncioLoop', None)
+    if loop is not None:
+        future = asyncio.ensure_future(awaitable, loop=loop)
+    else:
+        future = asyncio.run_coroutine_threadsafe(_await(awaitable), _backgroundLoop())
+    future.add_done_callback(lambda future: reactor.callSoonThreadsafe(lambda: _settle(suspend, future)))
+
+async def _await(awaitable):
+    return await awaitable
+
+def _settle(suspend, future):
+    if future.cancelled():
+        suspend.throw(asyncio.CancelledError, asyncio.CancelledError(), None)
+        return
+    exception = future.exception()
+    if exception is not None:
+        suspend.throw(type(exception), exception, exception.__traceback__)
+    else:
+        suspend.resume(future.result())
+
+def _backgroundLoop():
+    global _loopInThread
+    with _loopInThreadLock:
+        if _loopInThread is None:
+            _loopInThread = asyncio.new_event_loop()
+            Thread(target=_loopInThread.run_forever, name='weightless-asyncio', daemon=True).start()
+        return _loopInThread
+
+_loopInThread = None
+_loopInThreadLock = Lock()
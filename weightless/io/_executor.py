@@ -0,0 +1,142 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from concurrent.futures import ThreadPoolExecutor
+from sys import exc_info
+from threading import Lock
+from time import monotonic
+
+from ._suspend import Suspend, _retval
+
+
+class ExecutorQueueFull(Exception):
+    pass
+
+
+class Executor(object):
+    """Bounded thread pool for blocking calls (C parsers, disk I/O, legacy database drivers) that would otherwise freeze the reactor.
+
+        result = yield executor.run(fn, *args, **kwargs)
+
+    The generator is suspended while fn runs on one of the threads; it is resumed from the reactor's thread with fn's result, or fn's exception is raised.  At most maxQueue calls wait for a thread (None: unbounded); beyond that run() raises ExecutorQueueFull."""
+
+    def __init__(self, workers=4, maxQueue=None):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='weightless-executor')
+        self._workers = workers
+        self._maxQueue = maxQueue
+        self._lock = Lock()
+        self._pending = 0  # Submitted, not finished.
+        self._running = 0
+        self._completed = 0
+        self._queueWaitTotal = 0.0
+        self._queueWaitMax = 0.0
+
+    def run(self, fn, *args, **kwargs):
+        self._raiseIfQueueFull()
+        suspend = Suspend(doNext=lambda suspend: self._submit(suspend, fn, args, kwargs))
+        yield suspend
+        return _retval(suspend.getResult())
+
+    def submit(self, fn, *args, **kwargs):
+        "Like run(), but without waiting: returns a concurrent.futures.Future, for: result = yield awaitFuture(future).  Meant for work started ahead (read-ahead); fn runs even when its result is never awaited."
+        self._raiseIfQueueFull()
+        with self._lock:
+            self._pending += 1
+        return self._pool.submit(self._measured, monotonic(), fn, args, kwargs)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'workers': self._workers,
+                'queued': self._pending - self._running,
+                'running': self._running,
+                'completed': self._completed,
+                'queueWaitTotal': self._queueWaitTotal,
+                'queueWaitMax': self._queueWaitMax,
+            }
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def _submit(self, suspend, fn, args, kwargs):
+        reactor = suspend._reactor
+        with self._lock:
+            self._pending += 1
+        self._pool.submit(self._call, reactor, suspend, monotonic(), fn, args, kwargs)
+
+    def _call(self, reactor, suspend, submitted, fn, args, kwargs):
+        try:
+            result = self._measured(submitted, fn, args, kwargs)
+        except BaseException:
+            exception = exc_info()
+            reactor.callSoonThreadsafe(lambda: suspend.throw(*exception))
+        else:
+            reactor.callSoonThreadsafe(lambda: suspend.resume(result))
+
+    def _measured(self, submitted, fn, args, kwargs):
+        queueWait = monotonic() - submitted
+        with self._lock:
+            self._running += 1
+            self._queueWaitTotal += queueWait
+            self._queueWaitMax = max(self._queueWaitMax, queueWait)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+
+    def _raiseIfQueueFull(self):
+        if self._maxQueue is not None and self._pending - self._running >= self._maxQueue:
+            raise ExecutorQueueFull('%s calls waiting' % self._maxQueue)
+
+
+def awaitFuture(future):
+    "result = yield awaitFuture(future); waits for a concurrent.futures.Future (e.g. from Executor.submit) without blocking the reactor, raising its exception if it failed."
+    if not future.done():
+        suspend = Suspend(doNext=lambda suspend: future.add_done_callback(lambda future: suspend._reactor.callSoonThreadsafe(suspend.resume)))
+        yield suspend
+        suspend.getResult()
+    return _retval(future.result())
+
+def runInExecutor(fn, *args, **kwargs):
+    """result = yield runInExecutor(fn, *args, **kwargs); runs fn on the default Executor (see setDefaultExecutor)."""
+    return defaultExecutor().run(fn, *args, **kwargs)
+
+def defaultExecutor():
+    global _defaultExecutor
+    with _defaultExecutorLock:
+        if _defaultExecutor is None:
+            _defaultExecutor = Executor()
+        return _defaultExecutor
+
+def setDefaultExecutor(executor):
+    global _defaultExecutor
+    with _defaultExecutorLock:
+        previous, _defaultExecutor = _defaultExecutor, executor
+    return previous
+
+_defaultExecutor = None
+_defaultExecutorLock = Lock()
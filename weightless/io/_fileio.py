@@ -0,0 +1,125 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import os
+
+from ._executor import defaultExecutor, awaitFuture
+
+
+class AsyncFile(object):
+    """Regular-file I/O for compose'd generators on the reactor: the system calls run on an Executor's threads, so a slow disk does not block the reactor (O_NONBLOCK has no effect on regular files, nor does epoll accept them).
+
+        f = AsyncFile(path)
+        data = yield f.read()       # At most chunkSize bytes; b'' at end-of-file.
+        ...
+        f.close()
+
+    Reads are sequential: with readAhead (the default) the next chunk is read while the current one is processed, and the kernel is told to read ahead as well (POSIX_FADV_SEQUENTIAL); so streaming a file holds at most two chunks in memory.  With a mode for writing, yield f.write(data) appends to the file.  The file is opened with the first call, on the executor as well."""
+
+    def __init__(self, path, mode='r', chunkSize=64 * 1024, readAhead=True, executor=None):
+        if mode not in FLAGS:
+            raise ValueError('Invalid mode: %s' % mode)
+        self._path = path
+        self._flags = FLAGS[mode]
+        self._chunkSize = chunkSize
+        self._readAhead = readAhead
+        self._executor = defaultExecutor() if executor is None else executor
+        self._fd = None
+        self._offset = 0
+        self._ahead = None  # (offset, size, future) of the chunk read ahead.
+        self._inFlight = None
+        self._closed = False
+
+    def read(self, size=None):
+        size = self._chunkSize if size is None else size
+        ahead, self._ahead = self._ahead, None
+        if ahead is not None and ahead[:2] == (self._offset, size):
+            future = ahead[2]
+        else:
+            if ahead is not None:
+                yield awaitFuture(ahead[2])  # Unused; but one call at a time.
+            future = self._submit(self._pread, self._offset, size)
+        data = yield awaitFuture(future)
+        self._offset += len(data)
+        if self._readAhead and len(data) == size:
+            self._ahead = (self._offset, size, self._submit(self._pread, self._offset, size))
+        return data
+
+    def write(self, data):
+        yield awaitFuture(self._submit(self._writeAll, memoryview(data).cast('B')))
+
+    def close(self):
+        "Closes the file; when a call is still running (read-ahead), once that is done."
+        self._closed = True
+        self._ahead = None
+        if self._inFlight is not None and not self._inFlight.done():
+            self._inFlight.add_done_callback(lambda future: self._closeFd())
+        else:
+            self._closeFd()
+
+    def _submit(self, fn, *args):
+        if self._closed:
+            raise ValueError('I/O operation on closed file.')
+        self._inFlight = self._executor.submit(fn, *args)
+        return self._inFlight
+
+    def _open(self):
+        if self._fd is None:
+            self._fd = os.open(self._path, self._flags | os.O_CLOEXEC, 0o666)
+            if self._readAhead and self._flags == os.O_RDONLY:
+                os.posix_fadvise(self._fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return self._fd
+
+    def _pread(self, offset, size):
+        return os.pread(self._open(), size, offset)
+
+    def _writeAll(self, data):
+        fd = self._open()
+        while data:
+            data = data[os.write(fd, data):]
+
+    def _closeFd(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def streamFile(path, chunkSize=64 * 1024, executor=None):
+    """Yields the contents of a file in chunks (bytes) of at most chunkSize, read with an AsyncFile; e.g. as (part of) a response: yield streamFile(path)."""
+    f = AsyncFile(path, chunkSize=chunkSize, executor=executor)
+    try:
+        while True:
+            data = yield f.read()
+            if not data:
+                break
+            yield data
+    finally:
+        f.close()
+
+
+FLAGS = {
+    'r': os.O_RDONLY,
+    'w': os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+    'a': os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+}
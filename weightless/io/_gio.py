@@ -29,6 +29,8 @@ from socket import SOL_SOCKET, SO_RCVBUF, SHUT_RDWR
 
 from weightless.core import compose, local
 from . import TimeoutException
+from ._executor import defaultExecutor
+from ._suspend import _retval
 
 
 class Gio(object):
@@ -179,13 +181,33 @@ class SocketContext(FdContext):
         self._save_sok_from_gc.close() # os.close is not enough appearantly
 
 class FileContext(FdContext):
+    """A regular file; its reads and writes run on an Executor's threads (the default one unless given), resuming the Gio from the reactor.  Regular files can't be waited for with epoll, and O_NONBLOCK has no effect on them."""
 
-    def __init__(self, uri, mode='r'):
+    def __init__(self, uri, mode='r', executor=None):
         flags = 'w' in mode and os.O_RDWR or os.O_RDONLY
-        f = os.open(uri, flags | os.O_NONBLOCK)
+        f = os.open(uri, flags)
         self.readBufSize = os.fstat(f).st_blksize
+        self._executor = defaultExecutor() if executor is None else executor
         FdContext.__init__(self, f)
 
+    def write(self, response):
+        buff = memoryview(response.encode())
+        while len(buff) > 0:
+            written = yield self._whenDone(self._executor.submit(os.write, self._fd, buff))
+            buff = buff[written:]
+
+    def read(self):
+        message = yield self._whenDone(self._executor.submit(os.read, self._fd, self.readBufSize))
+        return message.decode()
+
+    def _whenDone(self, future):
+        gio = self.gio
+        waiting = [True]
+        self.onExit(waiting.clear)  # Not resumed after the generator exited.
+        future.add_done_callback(lambda future: gio._reactor.callSoonThreadsafe(lambda: waiting and gio._callback2generator.__next__()))
+        yield
+        return _retval(future.result())
+
 def open(*args, **kwargs):
     return FileContext(*args, **kwargs)
 
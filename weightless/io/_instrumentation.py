@@ -0,0 +1,127 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from bisect import bisect_left
+from sys import stderr
+from time import monotonic
+from types import GeneratorType
+
+from weightless.core import tostring, cextension
+if cextension:
+    from weightless.core.ext import compose as _CCompose
+
+
+class Histogram(object):
+    """Fixed-bucket histogram: counts[i] counts the values <= bounds[i] (and > bounds[i - 1]); the last count is for values > bounds[-1]."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def asDict(self):
+        return {'bounds': self.bounds, 'counts': list(self.counts), 'count': self.count, 'total': self.total, 'max': self.max}
+
+
+class ReactorInstrumentation(object):
+    """Collects what the reactor's loop spends its time on: Reactor(instrumentation=ReactorInstrumentation()).
+
+    Histograms for the time waiting in epoll, the time spent per callback (timers, fds and processes), the number of events per step and the lateness of timers.  A callback taking more than slowCallbackThreshold seconds is reported to onSlowCallback(report) (default: written to stderr), naming the callback and - for compose'd generators - their stack."""
+
+    def __init__(self, slowCallbackThreshold=0.1, onSlowCallback=None):
+        self.slowCallbackThreshold = slowCallbackThreshold
+        self._onSlowCallback = onSlowCallback if onSlowCallback is not None else _writeToStderr
+        self.pollWait = Histogram(TIME_BUCKETS)
+        self.callbackDuration = Histogram(TIME_BUCKETS)
+        self.eventsPerStep = Histogram(COUNT_BUCKETS)
+        self.timerLateness = Histogram(TIME_BUCKETS)
+        self.slowCallbacks = 0
+
+    def attach(self, reactor):
+        pass
+
+    def polled(self, seconds, fdEvents):
+        self.pollWait.add(seconds)
+        self.eventsPerStep.add(len(fdEvents))
+
+    def timerDue(self, lateness):
+        self.timerLateness.add(lateness)
+
+    def call(self, callback):
+        t0 = monotonic()
+        try:
+            callback()
+        finally:
+            duration = monotonic() - t0
+            self.callbackDuration.add(duration)
+            if duration > self.slowCallbackThreshold:
+                self.slowCallbacks += 1
+                self._onSlowCallback(slowCallbackReport(callback, duration))
+
+    def asDict(self):
+        return {
+            'pollWait': self.pollWait.asDict(),
+            'callbackDuration': self.callbackDuration.asDict(),
+            'eventsPerStep': self.eventsPerStep.asDict(),
+            'timerLateness': self.timerLateness.asDict(),
+            'slowCallbacks': self.slowCallbacks,
+        }
+
+
+def slowCallbackReport(callback, duration):
+    lines = ['[Reactor]: slow callback (%.3f seconds): %s' % (duration, _callbackName(callback))]
+    generator = getattr(callback, '__self__', None)
+    if _hasStack(generator):
+        lines.append('Now at:')
+        lines.append(tostring(generator))
+    return '\n'.join(lines) + '\n'
+
+def _hasStack(generator):
+    if type(generator) is GeneratorType:
+        return generator.gi_frame is not None
+    return cextension and type(generator) is _CCompose
+
+def _callbackName(callback):
+    name = getattr(callback, '__qualname__', None) or repr(callback)
+    owner = getattr(callback, '__self__', None)
+    if type(owner) is GeneratorType:
+        return '%s of generator %s' % (name, owner.__qualname__)
+    return name
+
+def _writeToStderr(report):
+    stderr.write(report)
+    stderr.flush()
+
+
+TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
@@ -0,0 +1,303 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import os
+import sys
+from ctypes import CDLL, Structure, addressof, byref, c_char, c_int, c_long, c_uint, c_uint32, c_uint64, c_int64, c_size_t, c_void_p, sizeof, get_errno
+from errno import EBADF, EINTR, EPERM, ETIME, ENOENT, ENOSYS
+from mmap import MAP_SHARED, MAP_POPULATE, PROT_READ, PROT_WRITE
+from os import fstat
+from stat import S_ISREG
+from select import epoll, EPOLLIN, EPOLLERR, EPOLLHUP, EPOLLET, EPOLLONESHOT
+from struct import pack_into, unpack_from
+from time import monotonic
+
+
+class IoUringPoller(object):
+    """An epoll look-alike (register / modify / unregister / poll / close) on io_uring's poll requests; for Reactor(poller=IoUringPoller), see ioUringOrEpoll.
+
+    Registrations are not system-calls of their own (but for an fstat, checking the fd as epoll would): they are queued in the submission ring and submitted with the next poll(), in the same io_uring_enter that waits for events.  Level-triggered registrations are one-shot poll requests, re-armed with the next poll() after an event (io_uring checks the readiness on arming); edge-triggered ones are multi-shot.
+
+    Unlike with epoll, closing an fd does not end its registration: io_uring holds on to the file until it is unregistered.
+
+    Raises OSError when the kernel (< 5.13) or the container (seccomp, sysctl kernel.io_uring_disabled) refuses io_uring."""
+
+    def __init__(self, entries=4096):
+        params = _io_uring_params()
+        fd = _syscall(_SYS_io_uring_setup, c_uint(entries), byref(params))
+        if fd < 0:
+            errno = get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+        self._rings = []
+        try:
+            if params.features & _REQUIRED_FEATURES != _REQUIRED_FEATURES:
+                raise OSError(ENOSYS, 'io_uring without multi-shot poll and extended arguments (Linux < 5.13)')
+            sq, cq = params.sq_off, params.cq_off
+            sqRing = self._mmap(sq.array + params.sq_entries * 4, _IORING_OFF_SQ_RING)
+            cqRing = self._mmap(cq.cqes + params.cq_entries * _CQE_SIZE, _IORING_OFF_CQ_RING)
+            self._sqes = self._mmap(params.sq_entries * _SQE_SIZE, _IORING_OFF_SQES)
+        except:
+            self.close()
+            raise
+        self._sqRing, self._cqRing = sqRing, cqRing
+        self._sqTailOffset, self._sqArrayOffset, self._sqFlagsOffset = sq.tail, sq.array, sq.flags
+        self._sqMask, self._sqEntries = unpack_from('=I', sqRing, sq.ring_mask)[0], params.sq_entries
+        self._cqHeadOffset, self._cqTailOffset, self._cqesOffset = cq.head, cq.tail, cq.cqes
+        self._cqMask = unpack_from('=I', cqRing, cq.ring_mask)[0]
+        self._sqTail = unpack_from('=I', sqRing, sq.tail)[0]
+        self._toSubmit = 0
+        self._registrations = {}  # fd -> _Registration
+        self._tokens = {}  # user_data -> _Registration
+        self._nextToken = 1
+        self._rearm = []
+        self._timespec = _kernel_timespec()
+        self._getEventsArg = _io_uring_getevents_arg(ts=addressof(self._timespec))
+        self.enterCalls = 0
+
+    def fileno(self):
+        return self._fd
+
+    @property
+    def closed(self):
+        return self._fd is None
+
+    def register(self, fd, eventmask=EPOLLIN):
+        fd = _fileno(fd)
+        if S_ISREG(fstat(fd).st_mode):
+            raise PermissionError(EPERM, os.strerror(EPERM))  # As epoll: regular files are always ready.
+        previous = self._registrations.get(fd)
+        if previous is not None:
+            self._forget(previous)  # Closed and reused without unregister; epoll would have forgotten it too.
+        registration = _Registration(fd, eventmask, self._nextToken)
+        self._nextToken += 1
+        self._registrations[fd] = registration
+        self._tokens[registration.token] = registration
+        self._arm(registration)
+
+    def modify(self, fd, eventmask):
+        fd = _fileno(fd)
+        if fd not in self._registrations:
+            raise FileNotFoundError(ENOENT, os.strerror(ENOENT))
+        self.register(fd, eventmask)
+
+    def unregister(self, fd):
+        registration = self._registrations.get(_fileno(fd))
+        if registration is None:
+            raise FileNotFoundError(ENOENT, os.strerror(ENOENT))
+        self._forget(registration)
+        if registration.armed:
+            self._enter(minComplete=0)  # Now: the file is released by the removal; closing it would not.
+
+    def poll(self, timeout=-1, maxevents=-1):
+        if self._fd is None:
+            raise ValueError('I/O operation on closed io_uring')
+        for registration in self._rearm:
+            if self._tokens.get(registration.token) is registration and not registration.armed:
+                self._arm(registration)
+        del self._rearm[:]
+        deadline = None if timeout is None or timeout < 0 else monotonic() + timeout
+        while True:
+            if deadline is None:
+                self._enter(minComplete=1)
+            else:
+                remaining = deadline - monotonic()
+                if remaining > 0:
+                    self._enter(minComplete=1, timeout=remaining)
+                elif self._toSubmit:
+                    self._enter(minComplete=0)
+            events = self._harvest({})
+            while unpack_from('=I', self._sqRing, self._sqFlagsOffset)[0] & _IORING_SQ_CQ_OVERFLOW:
+                self._enter(minComplete=0, getEvents=True)  # Moves the completions that did not fit in the ring.
+                events = self._harvest(events)
+            events = list(events.items())
+            if events or (deadline is not None and monotonic() >= deadline):
+                return events
+
+    def close(self):
+        if self._fd is None:
+            return
+        for registration in list(self._registrations.values()):
+            self._forget(registration)
+        try:
+            if self._toSubmit:
+                self._enter(minComplete=0)  # Releases the files now; not when the kernel gets to tearing down the ring.
+        except OSError:
+            pass
+        for address, size in self._rings:
+            _munmap(address, size)
+        self._rings = []
+        os.close(self._fd)
+        self._fd = None
+
+    def _mmap(self, size, offset):
+        address = _mmap(None, size, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_POPULATE, self._fd, offset)
+        if address == _MAP_FAILED:
+            errno = get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._rings.append((address, size))
+        return (c_char * size).from_address(address)  # Not the mmap module: it keeps a dup() of the fd.
+
+    def _arm(self, registration):
+        eventmask = registration.eventmask
+        multishot = (eventmask & EPOLLET) and not (eventmask & EPOLLONESHOT)
+        self._queue(_IORING_OP_POLL_ADD, registration.fd, 0, _IORING_POLL_ADD_MULTI if multishot else 0, _poll32(eventmask & ~(EPOLLET | EPOLLONESHOT)), registration.token)
+        registration.armed = True
+
+    def _forget(self, registration):
+        del self._registrations[registration.fd]
+        del self._tokens[registration.token]
+        if registration.armed:
+            self._queue(_IORING_OP_POLL_REMOVE, -1, registration.token, 0, 0, 0)
+
+    def _queue(self, opcode, fd, addr, length, opFlags, userData):
+        if self._toSubmit == self._sqEntries:
+            self._enter(minComplete=0)
+        index = self._sqTail & self._sqMask
+        pack_into(_SQE_FORMAT, self._sqes, index * _SQE_SIZE, opcode, 0, 0, fd, 0, addr, length, opFlags, userData, 0, 0, 0, 0, 0)
+        pack_into('=I', self._sqRing, self._sqArrayOffset + index * 4, index)
+        self._sqTail = (self._sqTail + 1) & 0xffffffff
+        pack_into('=I', self._sqRing, self._sqTailOffset, self._sqTail)
+        self._toSubmit += 1
+
+    def _enter(self, minComplete, timeout=None, getEvents=False):
+        flags = _IORING_ENTER_EXT_ARG
+        if minComplete or getEvents:
+            flags |= _IORING_ENTER_GETEVENTS
+        arg = self._getEventsArg
+        if timeout is None:
+            arg.ts = 0
+        else:
+            self._timespec.tv_sec = int(timeout)
+            self._timespec.tv_nsec = int((timeout - int(timeout)) * 1e9)
+            arg.ts = addressof(self._timespec)
+        self.enterCalls += 1
+        result = _syscall(_SYS_io_uring_enter, c_uint(self._fd), c_uint(self._toSubmit), c_uint(minComplete), c_uint(flags), byref(arg), c_size_t(sizeof(arg)))
+        if result >= 0:
+            self._toSubmit -= result
+            return
+        errno = get_errno()
+        if errno in (ETIME, EINTR):
+            return  # poll() waits again, for the remaining time.
+        raise OSError(errno, os.strerror(errno))
+
+    def _harvest(self, events):
+        cqRing = self._cqRing
+        head = unpack_from('=I', cqRing, self._cqHeadOffset)[0]
+        tail = unpack_from('=I', cqRing, self._cqTailOffset)[0]
+        if head == tail:
+            return events
+        tokens = self._tokens
+        while head != tail:
+            userData, result, flags = unpack_from('=QiI', cqRing, self._cqesOffset + (head & self._cqMask) * _CQE_SIZE)
+            head = (head + 1) & 0xffffffff
+            registration = tokens.get(userData)
+            if registration is None:
+                continue  # Removed (or replaced) meanwhile, or the completion of a removal.
+            if not flags & _IORING_CQE_F_MORE:
+                registration.armed = False
+                if not registration.eventmask & EPOLLONESHOT:
+                    self._rearm.append(registration)
+            if result < 0:
+                if result == -EBADF:
+                    continue  # Closed before the submission; as epoll, which forgets closed fds.
+                result = EPOLLERR | EPOLLHUP
+            fd = registration.fd
+            events[fd] = events.get(fd, 0) | result
+        pack_into('=I', cqRing, self._cqHeadOffset, head)
+        return events
+
+
+def _fileno(fd):
+    if isinstance(fd, int):
+        return fd
+    if hasattr(fd, 'fileno'):
+        return fd.fileno()
+    raise TypeError('argument must be an int, or have a fileno() method.')
+
+def ioUringOrEpoll():
+    "Poller factory for Reactor(poller=ioUringOrEpoll): an IoUringPoller, or epoll when io_uring is refused."
+    try:
+        return IoUringPoller()
+    except OSError:
+        return epoll()
+
+
+class _Registration(object):
+    def __init__(self, fd, eventmask, token):
+        self.fd = fd
+        self.eventmask = eventmask
+        self.token = token
+        self.armed = False
+
+
+class _io_sqring_offsets(Structure):
+    _fields_ = [(name, c_uint32) for name in ('head', 'tail', 'ring_mask', 'ring_entries', 'flags', 'dropped', 'array', 'resv1')] + [('user_addr', c_uint64)]
+
+class _io_cqring_offsets(Structure):
+    _fields_ = [(name, c_uint32) for name in ('head', 'tail', 'ring_mask', 'ring_entries', 'overflow', 'cqes', 'flags', 'resv1')] + [('user_addr', c_uint64)]
+
+class _io_uring_params(Structure):
+    _fields_ = [(name, c_uint32) for name in ('sq_entries', 'cq_entries', 'flags', 'sq_thread_cpu', 'sq_thread_idle', 'features', 'wq_fd')] + [
+        ('resv', c_uint32 * 3), ('sq_off', _io_sqring_offsets), ('cq_off', _io_cqring_offsets)]
+
+class _kernel_timespec(Structure):
+    _fields_ = [('tv_sec', c_int64), ('tv_nsec', c_int64)]
+
+class _io_uring_getevents_arg(Structure):
+    _fields_ = [('sigmask', c_uint64), ('sigmask_sz', c_uint32), ('pad', c_uint32), ('ts', c_uint64)]
+
+if sys.byteorder == 'little':
+    _poll32 = lambda eventmask: eventmask
+else:
+    _poll32 = lambda eventmask: ((eventmask << 16) | (eventmask >> 16)) & 0xffffffff  # The kernel swaps the half-words back.
+
+_libc = CDLL(None, use_errno=True)
+_syscall = _libc.syscall
+_syscall.restype = c_long
+_mmap = _libc.mmap
+_mmap.restype = c_void_p
+_mmap.argtypes = [c_void_p, c_size_t, c_int, c_int, c_int, c_long]
+_munmap = _libc.munmap
+_munmap.argtypes = [c_void_p, c_size_t]
+_MAP_FAILED = c_void_p(-1).value
+
+_SYS_io_uring_setup = c_long(425)  # The same on all architectures (but alpha).
+_SYS_io_uring_enter = c_long(426)
+_IORING_OFF_SQ_RING = 0
+_IORING_OFF_CQ_RING = 0x8000000
+_IORING_OFF_SQES = 0x10000000
+_IORING_OP_POLL_ADD = 6
+_IORING_OP_POLL_REMOVE = 7
+_IORING_POLL_ADD_MULTI = 1
+_IORING_ENTER_GETEVENTS = 1
+_IORING_ENTER_EXT_ARG = 8
+_IORING_CQE_F_MORE = 2
+_IORING_SQ_CQ_OVERFLOW = 2
+_IORING_FEAT_EXT_ARG = 1 << 8
+_IORING_FEAT_RSRC_TAGS = 1 << 10  # Linux 5.13; as multi-shot poll.
+_REQUIRED_FEATURES = _IORING_FEAT_EXT_ARG | _IORING_FEAT_RSRC_TAGS
+_SQE_FORMAT = '=BBHiQQIIQHHiQQ'
+_SQE_SIZE = 64
+_CQE_SIZE = 16
@@ -24,15 +24,20 @@
 #
 ## end license ##
 
+import os
 import sys
 
 import threading
+from collections import deque
+from heapq import heappush, heappop, heapify
 from select import epoll
-from select import EPOLLIN, EPOLLOUT, EPOLLPRI, EPOLLERR, EPOLLHUP, EPOLLET, EPOLLONESHOT, EPOLLRDNORM, EPOLLRDBAND, EPOLLWRNORM, EPOLLWRBAND, EPOLLMSG
+from signal import pthread_sigmask, sigtimedwait, SIG_BLOCK, SIG_UNBLOCK
+from select import EPOLLIN, EPOLLOUT, EPOLLPRI, EPOLLERR, EPOLLHUP, EPOLLET, EPOLLONESHOT, EPOLLEXCLUSIVE, EPOLLRDNORM, EPOLLRDBAND, EPOLLWRNORM, EPOLLWRBAND, EPOLLMSG
 from socket import error as socket_error
-from time import time
+from time import monotonic
 from errno import EBADF, EINTR, ENOENT
-from weightless.core import local
+from weightless.core import local, LocalScope
+from ._timingwheel import TimingWheel
 from os import pipe, close, write, read
 from inspect import getsourcelines, getsourcefile
 from sys import stderr
@@ -44,16 +49,49 @@ class Reactor(object):
     MAXPRIO = 10
     DEFAULTPRIO = 0
 
-    def __init__(self):
-        self._epoll = epoll()
+    def __init__(self, timeoutResolution=None, timerfd=False, instrumentation=None, processTimeBudget=None, maxIdleBackoff=0.05, poller=None, clock=None):
+        self._clock = monotonic if clock is None else clock  # See now().
+        self._advanceClock = getattr(clock, 'advance', None)  # A VirtualClock: jumps to the next timer instead of waiting for it.
+        if self._advanceClock is not None and timerfd:
+            raise ValueError('timerfd cannot be combined with a virtual clock')
+        self._instrumentation = instrumentation  # See ReactorInstrumentation and TraceRecorder; None: no overhead but a few 'is None' checks.
+        if instrumentation is not None:
+            instrumentation.attach(self)
+        self._timingWheel = None if timeoutResolution is None else TimingWheel(reactor=self, resolution=timeoutResolution)
+        self._epoll = epoll() if poller is None else poller()  # Anything with epoll's interface; e.g. IoUringPoller.
         self._fds = {}
+        self._fdByFileObj = {}  # id(file-object) -> fd, for fds in _fds or _suspended; to clean up after the file-object went bad (no fileno() anymore).
         self._badFdsLastCallback = []
         self._suspended = {}
         self._running = {}
-        self._timers = []
-        self._prio = -1
-        self._epoll_ctrl_read, self._epoll_ctrl_write = pipe()
+        self._waitingForIO = {}  # Processes that called yieldUntilIO().
+        self._processTimeBudget = processTimeBudget
+        self._maxIdleBackoff = maxIdleBackoff
+        self._processBackoff = 0
+        self._readyFds = set()
+        self._threadsafeCalls = deque()
+        self._timerHeap = []
+        self._timerSequence = 0
+        self._cancelledTimers = 0
+        self._epollCtlCalls = 0
+        self._epollCtlSaved = 0
+        self._stepCount = 0
+        self._runThreshold = 0
+        self._epoll_ctrl_read, self._epoll_ctrl_write = _wakeUpFds()
+        self._wakeUpPending = False
         self._epoll.register(fd=self._epoll_ctrl_read, eventmask=EPOLLIN)
+        self._timerfd = None
+        self._timerGranularity = EPOLL_TIMEOUT_GRANULARITY
+        if timerfd:
+            # Wakes up epoll for the first timer with sub-millisecond precision; no EPOLL_TIMEOUT_GRANULARITY needed.
+            from ._timerfd import TimerFd
+            self._timerfd = TimerFd()
+            self._timerGranularity = 0
+            self._epoll.register(fd=self._timerfd.fileno(), eventmask=EPOLLIN)
+        if self._advanceClock is not None:
+            self._timerGranularity = 0  # Virtual time is exact.
+        self._signalfd = None  # Created with the first addSignalHandler.
+        self._signalHandlers = {}  # signum -> (callback, was the signal blocked already)
 
         # per (part-of) step relevent state
         self.currentcontext = None
@@ -61,37 +99,93 @@ class Reactor(object):
         self._removeFdsInCurrentStep = set()
         self._listening = threading.Lock()
         self._loop = True
+        self._localScope = LocalScope(__reactor__=self)  # For reactor(), in the callbacks of step().
 
-    def addReader(self, sok, sink, prio=None):
-        """Adds a socket and calls sink() when the socket becomes readable."""
-        self._addFD(fileOrFd=sok, callback=sink, intent=READ_INTENT, prio=prio)
+    def addReader(self, sok, sink, prio=None, edgeTriggered=False, oneshot=False, exclusive=False):
+        """Adds a socket and calls sink() when the socket becomes readable.
 
-    def addWriter(self, sok, source, prio=None):
-        """Adds a socket and calls source() whenever the socket is writable."""
-        self._addFD(fileOrFd=sok, callback=source, intent=WRITE_INTENT, prio=prio)
+        A socket can have both a reader and a writer (full-duplex); they share one epoll registration.  Such a socket cannot be suspended.
+
+        With edgeTriggered, sink() is only called again when new data arrived after it was called; so sink() must read until EAGAIN.  With oneshot, epoll disables the socket with each event; the reactor re-enables it after sink() returned.  With exclusive (EPOLLEXCLUSIVE), only one of the processes waiting on a shared (listening) socket is woken up; it cannot be combined with oneshot, nor be suspended."""
+        self._addFD(fileOrFd=sok, callback=sink, intent=READ_INTENT, prio=prio, edgeTriggered=edgeTriggered, oneshot=oneshot, exclusive=exclusive)
+
+    def addWriter(self, sok, source, prio=None, edgeTriggered=False, oneshot=False):
+        """Adds a socket and calls source() whenever the socket is writable.
+
+        With edgeTriggered, source() is only called again when the socket became writable again after it was called; so source() must write until EAGAIN.  With oneshot, see addReader."""
+        self._addFD(fileOrFd=sok, callback=source, intent=WRITE_INTENT, prio=prio, edgeTriggered=edgeTriggered, oneshot=oneshot, exclusive=False)
 
     def addProcess(self, process, prio=None):
-        """Adds a process and calls it repeatedly."""
+        """Adds a process and calls it repeatedly.
+
+        prio (0..MAXPRIO-1) is a weight, shared with the fds: with contention, a callback with prio p is called in (MAXPRIO - p) of each MAXPRIO steps it is ready; without contention, it is called right away.
+
+        Once per step by default; with a processTimeBudget given to the Reactor, the processes are called round after round until that many seconds are spent, before polling again.  A process with nothing to do should call reactor.idle() (the reactor then backs off when all are idle) or reactor.yieldUntilIO()."""
         if process in self._suspended:
             raise ValueError('Process is suspended')
-        if process in self._running:
+        if process in self._running or process in self._waitingForIO:
             raise ValueError('Process is already in processes')
-        self._running[process] = _ProcessContext(process, prio)
+        self._running[process] = context = _ProcessContext(process, prio)
+        context.nextRun = self._stepCount  # Joins at the current virtual time.
+        self._processBackoff = 0
         self._wake_up()
 
     def addTimer(self, seconds, callback):
         """Add a timer that calls callback() after the specified number of seconds. Afterwards, the timer is deleted.  It returns a token for removeTimer()."""
-        timer = Timer(seconds, callback)
-        self._timers.append(timer)
-        self._timers.sort(key=_timeKey)
+        timer = Timer(seconds, callback, granularity=self._timerGranularity, now=self._clock())
+        self._timerSequence += 1
+        heappush(self._timerHeap, (timer.time, self._timerSequence, timer))
         self._wake_up()
         return timer
 
+    def addTimeout(self, seconds, callback):
+        """Add a coarse timeout; like addTimer, but meant for timeouts that are mostly removed before they expire (idle- and request-timeouts).  With a timeoutResolution given to the Reactor, these are kept in a timing wheel: O(1) to add and remove, firing up to timeoutResolution seconds late.  Otherwise it is the same as addTimer.  It returns a token for removeTimeout()."""
+        if self._timingWheel is None:
+            return self.addTimer(seconds, callback)
+        return self._timingWheel.addTimeout(seconds, callback)
+
+    def now(self):
+        """The current time in seconds of the reactor's clock, the time base of its timers: time.monotonic() unless another clock was given to the Reactor.
+
+        With Reactor(clock=VirtualClock()), time stands still while there is work to do; when the reactor would otherwise wait for a timer (no I/O pending), the clock jumps ahead to it.  Simulations with thousands of connections and long timeouts then run in milliseconds, in a reproducible order."""
+        return self._clock()
+
+    def callSoonThreadsafe(self, callback):
+        """Calls callback() from the reactor's thread, in the next step().  This is the only method that may be called from other threads; e.g. reactor.callSoonThreadsafe(suspend.resume).
+
+        Any number of calls between two steps cost (at most) one wake-up write."""
+        self._threadsafeCalls.append(callback)
+        self._wake_up()
+
+    def addSignalHandler(self, signum, callback):
+        """Calls callback() from the reactor's loop, like any other event, when signal signum arrived; e.g. SIGHUP for a reload or SIGUSR1 for a stats dump.
+
+        Backed by a signalfd in the epoll set: the signal is blocked (signal.pthread_sigmask) in the calling thread, so it no longer interrupts system calls, nor runs a Python signal handler.  A signal is delivered to any thread not blocking it, so add the handlers before other threads are started (they inherit the mask).  Arrivals of one signal before its callback was called are coalesced."""
+        if signum in self._signalHandlers:
+            raise ValueError('Signal %s already has a handler' % signum)
+        if self._signalfd is None:
+            from ._signalfd import SignalFd
+            self._signalfd = SignalFd()
+            self._epoll.register(fd=self._signalfd.fileno(), eventmask=EPOLLIN)
+        wasBlocked = signum in pthread_sigmask(SIG_BLOCK, [signum])
+        self._signalHandlers[signum] = (callback, wasBlocked)
+        self._signalfd.setSignals(self._signalHandlers)
+
+    def removeSignalHandler(self, signum):
+        if signum not in self._signalHandlers:
+            raise ValueError('Signal %s has no handler' % signum)
+        callback, wasBlocked = self._signalHandlers.pop(signum)
+        self._signalfd.setSignals(self._signalHandlers)
+        if not wasBlocked:
+            while sigtimedwait([signum], 0) is not None:
+                pass  # Still pending: it was for the removed handler.
+            pthread_sigmask(SIG_UNBLOCK, [signum])
+
     def removeReader(self, sok):
-        self._removeFD(fileOrFd=sok)
+        self._removeFD(fileOrFd=sok, intent=READ_INTENT)
 
     def removeWriter(self, sok):
-        self._removeFD(fileOrFd=sok)
+        self._removeFD(fileOrFd=sok, intent=WRITE_INTENT)
 
     def removeProcess(self, process=None):
         if process is None:
@@ -99,9 +193,32 @@ class Reactor(object):
         if process in self._running:
             del self._running[process]
             return True
+        if process in self._waitingForIO:
+            del self._waitingForIO[process]
+            return True
+
+    def idle(self):
+        """Called from a process that had nothing to do.  When all processes called in a step were idle, the next poll waits for I/O (and timers) up to 1 ms instead of not at all; doubling with each idle step, up to maxIdleBackoff seconds."""
+        self._currentProcessContext().idle = True
+
+    def yieldUntilIO(self):
+        """Called from a process: it is not called again until a step in which some fd has an event."""
+        self._currentProcessContext()
+        self._waitingForIO[self.currenthandle] = self._running.pop(self.currenthandle)
 
     def removeTimer(self, token):
-        self._timers.remove(token)
+        if not token.pending:
+            raise ValueError('Timer not pending')
+        token.pending = False  # Tombstone; popped from the heap lazily.
+        self._cancelledTimers += 1
+        if self._cancelledTimers > TIMER_COMPACT_THRESHOLD and self._cancelledTimers * 2 > len(self._timerHeap):
+            self._compactTimers()
+
+    def removeTimeout(self, token):
+        if self._timingWheel is None:
+            self.removeTimer(token)
+        else:
+            self._timingWheel.removeTimeout(token)
 
     def cleanup(self, sok):
         # Only use for Reader/Writer's!
@@ -113,14 +230,26 @@ class Reactor(object):
         else:
             self._fds.pop(fd, None)
             self._suspended.pop(fd, None)
+            self._fdByFileObj.pop(id(sok), None)
             self._epollUnregisterSafe(fd=fd)
 
     def suspend(self):
         if self.currenthandle is None:
             raise RuntimeError('suspend called from a timer or when running a last-call callback for a bad file-descriptor.')
 
+        if isinstance(self._fds.get(self.currenthandle), _DuplexFDContext):
+            raise RuntimeError('suspend not supported for a socket with both a reader and a writer.')
+        if getattr(self._fds.get(self.currenthandle), 'exclusive', False):
+            raise RuntimeError('suspend not supported for an exclusive reader.')  # EPOLLEXCLUSIVE can't be modified.
         if self.currenthandle in self._fds:
-            self._removeFD(fileOrFd=self.currenthandle)
+            # Stays registered with epoll; only disabled (parked) when an event arrives while suspended.
+            context = self._fds.pop(self.currenthandle)
+            self._removeFdsInCurrentStep.add(self.currenthandle)
+            self._readyFds.discard(self.currenthandle)
+            if context.oneshot:
+                context.parked = True  # Already disabled by epoll.
+            else:
+                self._epollCtlSaved += 1
         elif self.removeProcess(self.currenthandle):
             pass
         else:
@@ -129,15 +258,15 @@ class Reactor(object):
         return self.currenthandle
 
     def resumeReader(self, handle):
-        context = self._suspended.pop(handle)
-        self._addFD(fileOrFd=context.fileOrFd, callback=context.callback, intent=READ_INTENT, prio=context.prio, fdContext=context)
+        self._resumeFD(handle=handle, intent=READ_INTENT)
 
     def resumeWriter(self, handle):
-        context = self._suspended.pop(handle)
-        self._addFD(fileOrFd=context.fileOrFd, callback=context.callback, intent=WRITE_INTENT, prio=context.prio, fdContext=context)
+        self._resumeFD(handle=handle, intent=WRITE_INTENT)
 
     def resumeProcess(self, handle):
-        self._running[handle] = self._suspended.pop(handle)
+        self._running[handle] = context = self._suspended.pop(handle)
+        context.nextRun = max(context.nextRun, self._stepCount)  # Rejoins at the current virtual time; keeps a stride not yet served.
+        self._processBackoff = 0
         self._wake_up()
 
     def shutdown(self):
@@ -148,6 +277,8 @@ class Reactor(object):
         ]:
             for handle, context in list(contextDict.items()):
                 contextDict.pop(handle)
+                if isinstance(context, _DuplexFDContext):
+                    context = context.reader
                 obj = context.fileOrFd if hasattr(context, 'fileOrFd') else context.callback
                 if hasattr(obj, 'close'):
                     print(_shutdownMessage(message='closing - %s' % info, thing=obj, context=context))
@@ -155,15 +286,23 @@ class Reactor(object):
                 else:
                     print(_shutdownMessage(message='terminating - %s' % info, thing=handle, context=context))
 
-        for handle, context in list(self._running.items()):
-            self._running.pop(handle)
+        for handle, context in list(self._running.items()) + list(self._waitingForIO.items()):
+            self._running.pop(handle, None)
+            self._waitingForIO.pop(handle, None)
             if hasattr(handle, 'close'):
                 print(_shutdownMessage(message='closing - active', thing=handle, context=context))
                 _closeAndIgnoreFdErrors(handle)
             else:
                 print(_shutdownMessage(message='terminating - active', thing=handle, context=context))
         del self._badFdsLastCallback[:]
+        self._fdByFileObj.clear()
         self._close_epoll_ctrl()
+        if self._timerfd is not None and self._timerfd.fileno() is not None:
+            _closeAndIgnoreFdErrors(self._timerfd)
+        for signum in list(self._signalHandlers):
+            self.removeSignalHandler(signum)
+        if self._signalfd is not None and self._signalfd.fileno() is not None:
+            _closeAndIgnoreFdErrors(self._signalfd)
         _closeAndIgnoreFdErrors(self._epoll)
 
     def request_shutdown(self):
@@ -177,24 +316,41 @@ class Reactor(object):
             self.shutdown()
 
     def step(self):
-        __reactor__ = self
+        with self._localScope:
+            return self._step()
 
+    def _step(self):
         if self._badFdsLastCallback:
             self._lastCallbacks()
             return self
 
-        self._prio = (self._prio + 1) % Reactor.MAXPRIO
+        self._stepCount += 1
 
         with self._listening:
-            if self._running:
+            if (self._running and not self._processBackoff) or self._readyFds or self._threadsafeCalls:
                 timeout = 0
-            elif self._timers:
-                timeout = min(max(0, self._timers[0].time - time()), MAX_TIMEOUT_EPOLL)
+            elif self._firstTimerEntry():
+                if self._timerfd is None:
+                    timeout = min(max(0, self._timerHeap[0][0] - self._clock()), MAX_TIMEOUT_EPOLL)
+                else:
+                    self._timerfd.armAt(self._timerHeap[0][0])
+                    timeout = -1
             else:
+                if self._timerfd is not None:
+                    self._timerfd.disarm()
                 timeout = -1
+            if self._running and timeout != 0:
+                timeout = self._processBackoff if timeout == -1 else min(timeout, self._processBackoff)
 
             try:
-                fdEvents = self._epoll.poll(timeout=timeout)
+                if self._advanceClock is not None and timeout > 0:
+                    fdEvents = self._pollOrAdvanceClock(timeout)
+                elif self._instrumentation is None:
+                    fdEvents = self._epoll.poll(timeout=timeout)
+                else:
+                    t0 = monotonic()
+                    fdEvents = self._epoll.poll(timeout=timeout)
+                    self._instrumentation.polled(monotonic() - t0, fdEvents)
             except IOError as e:
                 (errno, description) = e.args
                 _printException()
@@ -208,12 +364,23 @@ class Reactor(object):
                 raise
 
         self._clear_epoll_ctrl(fdEvents)
+        if self._readyFds:
+            fdEvents = self._withReadyFds(fdEvents)
 
         self._removeFdsInCurrentStep = set([self._epoll_ctrl_read])
-
-        self._timerCallbacks(self._timers)
-        self._callbacks(fdEvents, self._fds, READ_INTENT)
-        self._callbacks(fdEvents, self._fds, WRITE_INTENT)
+        if self._timerfd is not None:
+            self._clear_timerfd(fdEvents)
+        if self._signalfd is not None:
+            self._signalCallbacks(fdEvents)
+        if self._waitingForIO and any(fd not in self._removeFdsInCurrentStep for fd, _ in fdEvents):
+            self._running.update(self._waitingForIO)
+            self._waitingForIO.clear()
+
+        self._timerCallbacks(self._timerHeap)
+        if self._threadsafeCalls:
+            self._threadsafeCallbacks()
+        self._runThreshold = self._nextRunThreshold(fdEvents, self._fds, self._running)
+        self._callbacks(fdEvents, self._fds)
         self._processCallbacks(self._running)
 
         return self
@@ -221,6 +388,24 @@ class Reactor(object):
     def getOpenConnections(self):
         return len(self._fds)
 
+    def _callbacksByState(self):
+        "(state, callback) for each reader, writer, process and suspended context; see stackDump()."
+        for context in list(self._fds.values()):
+            for context in ((context.reader, context.writer) if type(context) is _DuplexFDContext else (context,)):
+                yield ('reading' if context.intent is READ_INTENT else 'writing'), context.callback
+        for state, contexts in [('running', self._running), ('waiting for I/O', self._waitingForIO), ('suspended', self._suspended)]:
+            for context in list(contexts.values()):
+                yield state, context.callback
+
+    def getEpollCtlCounts(self):
+        "Number of epoll_ctl system-calls done, and saved by keeping suspended fds registered."
+        return {'calls': self._epollCtlCalls, 'saved': self._epollCtlSaved}
+
+    @property
+    def _timers(self):
+        "Pending timers in order of expiry; for inspection only (not used in the reactor itself)."
+        return [timer for (_, _, timer) in sorted(self._timerHeap) if timer.pending]
+
     def __enter__(self):
         "Usable as a context-manager for testing purposes"
         return self
@@ -233,18 +418,17 @@ class Reactor(object):
         self.shutdown()
         return False
 
-    def _addFD(self, fileOrFd, callback, intent, prio, fdContext=None):
-        context = fdContext or _FDContext(callback, fileOrFd, intent, prio)
+    def _addFD(self, fileOrFd, callback, intent, prio, edgeTriggered, oneshot, exclusive):
+        context = _FDContext(callback, fileOrFd, intent, prio, edgeTriggered, oneshot, exclusive)
+        context.nextRun = self._stepCount  # Joins at the current virtual time.
         try:
             fd = _fdNormalize(fileOrFd)
             if fd in self._fds:
-                # Otherwise epoll would give an IOError, Errno 17 / EEXIST.
-                raise ValueError('fd already registered')
-            if fd in self._suspended:
+                context = self._addOtherIntent(fd=fd, context=context)
+            elif fd in self._suspended:
                 raise ValueError('Socket is suspended')
-
-            eventmask = EPOLLIN if intent is READ_INTENT else EPOLLOUT  # Change iff >2 intents exist.
-            self._epollRegister(fd=fd, eventmask=eventmask)
+            else:
+                self._epollRegister(fd=fd, eventmask=context.eventmask())
         except _HandleEBADFError:
             self._raiseIfFileObjSuspended(obj=fileOrFd)
             self._badFdsLastCallback.append(context)
@@ -253,48 +437,150 @@ class Reactor(object):
             self._badFdsLastCallback.append(context)
         else:
             self._fds[fd] = context
+            if fd is not fileOrFd:
+                self._fdByFileObj[id(fileOrFd)] = fd
+
+    def _addOtherIntent(self, fd, context):
+        existing = self._fds[fd]
+        if isinstance(existing, _DuplexFDContext) or existing.intent is context.intent or existing.fileOrFd != context.fileOrFd:
+            # Otherwise epoll would give an IOError, Errno 17 / EEXIST.
+            raise ValueError('fd already registered')
+        if existing.exclusive or context.exclusive:
+            raise ValueError('fd already registered')  # EPOLLEXCLUSIVE can't be modified.
+        if (existing.edgeTriggered, existing.oneshot) != (context.edgeTriggered, context.oneshot):
+            raise ValueError('Reader and writer of one fd must have the same edgeTriggered and oneshot modes')
+        reader, writer = (existing, context) if context.intent is WRITE_INTENT else (context, existing)
+        duplex = _DuplexFDContext(reader=reader, writer=writer)
+        self._epollModify(fd=fd, eventmask=duplex.eventmask())
+        return duplex
+
+    def _resumeFD(self, handle, intent):
+        context = self._suspended.pop(handle)
+        try:
+            _fdNormalize(context.fileOrFd)  # Closed meanwhile?
+            if context.parked or context.intent is not intent:
+                self._epollModify(fd=handle, eventmask=context.eventmask(intent))
+                context.parked = False
+            else:
+                self._epollCtlSaved += 1
+        except _HandleEBADFError:
+            self._unindexFileObj(handle, context.fileOrFd)
+            self._badFdsLastCallback.append(context)
+        else:
+            context.intent = intent
+            context.nextRun = max(context.nextRun, self._stepCount)  # Rejoins at the current virtual time; keeps a stride not yet served.
+            self._fds[handle] = context
+            if context.edgeTriggered:
+                self._readyFds.add(handle)  # An edge might have been consumed before the suspend; called (at least) once more.
+
+    def _withReadyFds(self, fdEvents):
+        "Adds the edge-triggered and one-shot fds that were reported earlier, but not called yet (skipped for their priority); epoll won't report them again."
+        polledFds = set(fd for fd, _ in fdEvents)
+        return fdEvents + [(fd, 0) for fd in self._readyFds if fd not in polledFds]
+
+    def _parkSuspendedFD(self, fd):
+        context = self._suspended[fd]
+        if not context.parked:
+            context.parked = True
+            self._epollCtlSaved -= 1
+            try:
+                self._epollModify(fd=fd, eventmask=EPOLLONESHOT)  # No events at all, not even EPOLLHUP / EPOLLERR, after (at most) one more.
+            except _HandleEBADFError:
+                pass
 
-    def _removeFD(self, fileOrFd):
+    def _removeFD(self, fileOrFd, intent):
         try:
             fd = _fdNormalize(fileOrFd)
         except _HandleEBADFError:
             self._cleanFdsByFileObj(fileOrFd)
             return
 
-        if fd in self._fds:
+        context = self._fds.get(fd)
+        if isinstance(context, _DuplexFDContext):
+            remaining = context.writer if intent is READ_INTENT else context.reader
+            self._fds[fd] = remaining
+            self._epollModify(fd=fd, eventmask=remaining.eventmask())
+        elif context is not None:
             del self._fds[fd]
+            self._unindexFileObj(fd, context.fileOrFd)
             self._epollUnregister(fd=fd)
 
+    def _pollOrAdvanceClock(self, timeout):
+        fdEvents = self._epoll.poll(timeout=0)
+        if self._instrumentation is not None:
+            self._instrumentation.polled(0, fdEvents)
+        if not fdEvents:
+            self._advanceClock(timeout)
+        return fdEvents
+
     def _lastCallbacks(self):
         while self._badFdsLastCallback:
             context = self._badFdsLastCallback.pop()
             self.currenthandle = None
             self.currentcontext = context
             try:
-                self.currentcontext.callback()
+                self._call(self.currentcontext.callback)
             except (AssertionError, SystemExit, KeyboardInterrupt):
                 raise
             except:
                 _printException()
 
-    def _timerCallbacks(self, timers):
-        currentTime = time()
-        for timer in timers[:]:
-            if timer.time > (currentTime + EPOLL_TIMEOUT_GRANULARITY):
-                break
-            if timer not in timers:
-                continue
+    def _timerCallbacks(self, timerHeap):
+        currentTime = self._clock()
+        lastSequence = self._timerSequence  # Timers added by the callbacks below are effective with the next step().
+        postponed = []
+        try:
+            while timerHeap and timerHeap[0][0] <= (currentTime + self._timerGranularity):
+                entry = heappop(timerHeap)
+                timer = entry[2]
+                if not timer.pending:
+                    self._cancelledTimers -= 1
+                    continue
+                if entry[1] > lastSequence:
+                    postponed.append(entry)
+                    continue
+                self.currenthandle = None
+                self.currentcontext = timer
+                timer.pending = False
+                if self._instrumentation is not None:
+                    self._instrumentation.timerDue(max(0, self._clock() - timer.time))
+                try:
+                    self._call(timer.callback)
+                except (AssertionError, SystemExit, KeyboardInterrupt):
+                    raise
+                except:
+                    _printException()
+        finally:
+            for entry in postponed:
+                heappush(timerHeap, entry)
+
+    def _threadsafeCallbacks(self):
+        for _ in range(len(self._threadsafeCalls)):  # Calls added meanwhile wait for the next step().
+            callback = self._threadsafeCalls.popleft()
             self.currenthandle = None
-            self.currentcontext = timer
-            self.removeTimer(timer)
+            self.currentcontext = None
             try:
-                timer.callback()
+                self._call(callback)
             except (AssertionError, SystemExit, KeyboardInterrupt):
                 raise
             except:
                 _printException()
 
-    def _callbacks(self, fdEvents, fds, intent):
+    def _firstTimerEntry(self):
+        timerHeap = self._timerHeap
+        while timerHeap and not timerHeap[0][2].pending:
+            heappop(timerHeap)
+            self._cancelledTimers -= 1
+        return timerHeap[0] if timerHeap else None
+
+    def _compactTimers(self):
+        self._timerHeap[:] = [entry for entry in self._timerHeap if entry[2].pending]
+        heapify(self._timerHeap)
+        self._cancelledTimers = 0
+
+    def _callbacks(self, fdEvents, fds):
+        writers = []
+        rearm = {}  # One-shot fds that had a callback called; fd -> context.
         for fd, eventmask in fdEvents:
             if fd in self._removeFdsInCurrentStep:
                 continue
@@ -303,40 +589,138 @@ class Reactor(object):
                 context = fds[fd]
             except KeyError:
                 self._removeFdsInCurrentStep.add(fd)
+                if fd in self._suspended:
+                    self._parkSuspendedFD(fd)
+                    continue
                 sys.stderr.write('[Reactor]: epoll event fd %d does not exist in fds list.\n' % fd)
                 sys.stderr.flush()
                 continue
 
-            if context.intent is not intent:
+            self._readyFds.discard(fd)
+            if isinstance(context, _DuplexFDContext):
+                # A remembered (ready) fd has no eventmask; both are called.
+                called = (eventmask & _READ_EVENTS or not eventmask) and self._callback(fd, context.reader, fds)
+                if eventmask & _WRITE_EVENTS or not eventmask:
+                    writers.append((fd, context, context.writer))
+            elif context.intent is READ_INTENT:
+                called = self._callback(fd, context, fds)
+            else:
+                called = False
+                writers.append((fd, context, context))
+            if called and context.oneshot:
+                rearm[fd] = context
+
+        # All reads before all writes within a step.
+        for fd, context, writer in writers:
+            if fds.get(fd) in (context, writer) and self._callback(fd, writer, fds) and context.oneshot:
+                rearm[fd] = context
+
+        for fd, context in rearm.items():
+            if fds.get(fd) is context:
+                self._rearmOneshotFD(fd, context)
+
+    def _nextRunThreshold(self, fdEvents, fds, processes):
+        """Stride scheduling: a ready callback runs when its nextRun is due; then nextRun advances by its stride (MAXPRIO / (MAXPRIO - prio)), so prio acts as a weight.  When none of the ready callbacks is due, the earliest ones run anyway; no step is wasted.  The step count is the scheduler's virtual time: nextRun is set relative to it (see _advanceNextRun), so a callback running ahead without competition is never more than its stride ahead when competition appears."""
+        stepCount = self._stepCount
+        threshold = None
+        for fd, _ in fdEvents:
+            context = fds.get(fd)
+            if context is None:
                 continue
+            for context in ((context.reader, context.writer) if isinstance(context, _DuplexFDContext) else (context,)):
+                if context.nextRun <= stepCount:
+                    return stepCount
+                if threshold is None or context.nextRun < threshold:
+                    threshold = context.nextRun
+        for context in processes.values():
+            if context.nextRun <= stepCount:
+                return stepCount
+            if threshold is None or context.nextRun < threshold:
+                threshold = context.nextRun
+        return stepCount if threshold is None else threshold
+
+    def _callback(self, fd, context, fds):
+        if context.nextRun > self._runThreshold:
+            if context.edgeTriggered or context.oneshot:
+                self._readyFds.add(fd)
+            return False
+
+        self._advanceNextRun(context)
+        self.currenthandle = fd
+        self.currentcontext = context
+        try:
+            if self._instrumentation is None:  # Inlined _call; the hot path.
+                context.callback()
+            else:
+                self._instrumentation.call(context.callback)
+        except (AssertionError, SystemExit, KeyboardInterrupt):
+            if self.currenthandle in fds:
+                self._unindexFileObj(self.currenthandle, fds.pop(self.currenthandle).fileOrFd)
+                self._epollUnregisterSafe(fd=self.currenthandle)
+            raise
+        except:
+            _printException()
+            if self.currenthandle in fds:
+                self._unindexFileObj(self.currenthandle, fds.pop(self.currenthandle).fileOrFd)
+                self._epollUnregisterSafe(fd=self.currenthandle)
+        return True
 
-            if context.prio <= self._prio:
-                self.currenthandle = fd
-                self.currentcontext = context
-                try:
-                    context.callback()
-                except (AssertionError, SystemExit, KeyboardInterrupt):
-                    if self.currenthandle in fds:
-                        del fds[self.currenthandle]
-                        self._epollUnregisterSafe(fd=self.currenthandle)
-                    raise
-                except:
-                    _printException()
-                    if self.currenthandle in fds:
-                        del fds[self.currenthandle]
-                        self._epollUnregisterSafe(fd=self.currenthandle)
+    def _advanceNextRun(self, context):
+        # Credit for idle time is at most one step; running early (not yet due) gives no debt either.
+        stepCount = self._stepCount
+        context.nextRun = max(min(context.nextRun, stepCount), stepCount - 1) + context.stride
+
+    def _rearmOneshotFD(self, fd, context):
+        try:
+            self._epollModify(fd=fd, eventmask=context.eventmask())
+        except _HandleEBADFError:
+            del self._fds[fd]
+            self._unindexFileObj(fd, context.fileOrFd)
+            self._badFdsLastCallback.append(context)
 
     def _processCallbacks(self, processes):
-        for self.currenthandle, context in list(processes.items()):
-            if self.currenthandle in processes and context.prio <= self._prio:
-                self.currentcontext = context
-                try:
-                    context.callback()
-                except:
-                    self.removeProcess(self.currenthandle)
-                    raise
+        deadline = None if self._processTimeBudget is None else monotonic() + self._processTimeBudget
+        called = busy = False
+        while True:
+            roundBusy = False
+            for self.currenthandle, context in list(processes.items()):
+                if self.currenthandle in processes and context.nextRun <= self._runThreshold:
+                    self._advanceNextRun(context)
+                    context.idle = False
+                    self.currentcontext = context
+                    try:
+                        if self._instrumentation is None:  # Inlined _call; the hot path.
+                            context.callback()
+                        else:
+                            self._instrumentation.call(context.callback)
+                    except:
+                        self.removeProcess(self.currenthandle)
+                        raise
+                    called = True
+                    roundBusy = roundBusy or not context.idle
+            busy = busy or roundBusy
+            if deadline is None or not roundBusy or not processes or monotonic() >= deadline:
+                break
+            self._runThreshold = min(context.nextRun for context in processes.values())  # Another round; by weight.
+        if busy:
+            self._processBackoff = 0
+        elif called:
+            self._processBackoff = min(max(2 * self._processBackoff, IDLE_BACKOFF_MIN), self._maxIdleBackoff)
+
+    def _currentProcessContext(self):
+        context = self._running.get(self.currenthandle)
+        if context is None or context is not self.currentcontext:
+            raise RuntimeError('Not called from a process.')
+        return context
+
+    def _call(self, callback):
+        if self._instrumentation is None:
+            callback()
+        else:
+            self._instrumentation.call(callback)
 
     def _epollRegister(self, fd, eventmask):
+        self._epollCtlCalls += 1
         try:
             self._epoll.register(fd=fd, eventmask=eventmask)
         except IOError as e:
@@ -346,8 +730,23 @@ class Reactor(object):
                 raise _HandleEBADFError()
             raise
 
+    def _epollModify(self, fd, eventmask):
+        self._epollCtlCalls += 1
+        try:
+            self._epoll.modify(fd, eventmask)
+        except IOError as e:
+            (errno, description) = e.args
+            if errno == ENOENT:  # Closed and re-opened (same fd number) meanwhile.
+                return self._epollRegister(fd=fd, eventmask=eventmask)
+            _printException()
+            if errno == EBADF:
+                raise _HandleEBADFError()
+            raise
+
     def _epollUnregister(self, fd):
         self._removeFdsInCurrentStep.add(fd)
+        self._readyFds.discard(fd)
+        self._epollCtlCalls += 1
         try:
             self._epoll.unregister(fd)
         except IOError as e:
@@ -361,8 +760,10 @@ class Reactor(object):
     def _epollUnregisterSafe(self, fd):
         "Ignores the expected (ENOENT & EBADF) and unexpected exceptions from epoll_ctl / unregister"
         self._removeFdsInCurrentStep.add(fd)
+        self._readyFds.discard(fd)
         try:
             if fd != -1:
+                self._epollCtlCalls += 1
                 self._epoll.unregister(fd)
         except IOError as e:
             # If errno is either ENOENT or EBADF than the fd is already gone (epoll's EBADF automagical cleanup); not reproducable in Python's epoll binding - but staying on the safe side.
@@ -377,7 +778,8 @@ class Reactor(object):
         if (self._epoll_ctrl_read, EPOLLIN) in fdEvents:
           while True:
             try:
-                read(self._epoll_ctrl_read, 1)
+                read(self._epoll_ctrl_read, 8)  # eventfd: resets the counter; pipe: the one (coalesced) byte.
+                self._wakeUpPending = False
                 break
             except (IOError, OSError) as e:
                 (errno, description) = e.args
@@ -386,11 +788,37 @@ class Reactor(object):
                 else:
                     raise
 
+    def _clear_timerfd(self, fdEvents):
+        timerfd = self._timerfd.fileno()
+        self._removeFdsInCurrentStep.add(timerfd)
+        if (timerfd, EPOLLIN) in fdEvents:
+            self._timerfd.clear()
+
+    def _signalCallbacks(self, fdEvents):
+        signalfd = self._signalfd.fileno()
+        self._removeFdsInCurrentStep.add(signalfd)
+        if (signalfd, EPOLLIN) not in fdEvents:
+            return
+        for signum in self._signalfd.signals():
+            handler = self._signalHandlers.get(signum)
+            if handler is None:
+                continue
+            self.currenthandle = None
+            self.currentcontext = None
+            try:
+                self._call(handler[0])
+            except (AssertionError, SystemExit, KeyboardInterrupt):
+                raise
+            except:
+                _printException()
+
     def _wake_up(self):
-        if self._listening.locked():
+        # Races (with the reactor's thread, or others) give at most a spurious wake-up; not a missed one: the reactor only clears _wakeUpPending after reading, and looks at its queues after that.
+        if self._listening.locked() and not self._wakeUpPending:
+          self._wakeUpPending = True
           while True:
             try:
-                write(self._epoll_ctrl_write, b'x')
+                write(self._epoll_ctrl_write, _WAKE_UP)
                 break
             except (IOError, OSError) as e:
                 (errno, description) = e.args
@@ -400,20 +828,34 @@ class Reactor(object):
                     raise
 
     def _raiseIfFileObjSuspended(self, obj):
-        for handle, context in list(self._suspended.items()):
-            if hasattr(context, 'fileOrFd') and context.fileOrFd == obj:
-                raise ValueError('Socket is suspended')
+        if self._fdOfFileObj(self._suspended, obj) is not None:
+            raise ValueError('Socket is suspended')
 
     def _cleanFdsByFileObj(self, obj):
-        for fd, context in list(self._fds.items()):
-            if context.fileOrFd == obj:
-                del self._fds[fd]
-                self._epollUnregisterSafe(fd=fd)
+        fd = self._fdOfFileObj(self._fds, obj)
+        if fd is not None:
+            del self._fds[fd]
+            self._unindexFileObj(fd, obj)
+            self._epollUnregisterSafe(fd=fd)
 
     def _cleanSuspendedByFileObj(self, obj):
-        for handle, context in list(self._suspended.items()):
-            if hasattr(context, 'fileOrFd') and context.fileOrFd == obj:
-                del self._suspended[handle]
+        fd = self._fdOfFileObj(self._suspended, obj)
+        if fd is not None:
+            del self._suspended[fd]
+            self._unindexFileObj(fd, obj)
+
+    def _fdOfFileObj(self, contexts, obj):
+        fd = self._fdByFileObj.get(id(obj))
+        context = contexts.get(fd)
+        if context is not None and context.fileOrFd is obj:
+            return fd
+
+    def _unindexFileObj(self, fd, obj):
+        "After fd was removed from _fds or _suspended; forgets obj when it is in neither anymore."
+        for context in (self._fds.get(fd), self._suspended.get(fd)):
+            if context is not None and context.fileOrFd is obj:
+                return
+        self._fdByFileObj.pop(id(obj), None)
 
     def _close_epoll_ctrl(self):
         # Will be called exactly once; in testing situations 1..n times.
@@ -422,12 +864,22 @@ class Reactor(object):
         except Exception:
             pass
         try:
-            close(self._epoll_ctrl_write)
+            if self._epoll_ctrl_write != self._epoll_ctrl_read:  # Unless eventfd
+                close(self._epoll_ctrl_write)
         except Exception:
             pass
         self._epoll_ctrl_read = None
         self._epoll_ctrl_write = None
 
+if hasattr(os, 'eventfd'):
+    def _wakeUpFds():
+        fd = os.eventfd(0, os.EFD_CLOEXEC)
+        return fd, fd
+    _WAKE_UP = (1).to_bytes(8, sys.byteorder)
+else:
+    _wakeUpFds = pipe
+    _WAKE_UP = b'x'
+
 def _printException():
     print_exc()
     stderr.flush()
@@ -435,29 +887,82 @@ def _printException():
 def reactor():
     return local('__reactor__')
 
+def _addTimeout(reactor, seconds, callback):
+    "reactor.addTimeout(seconds, callback); or addTimer() for a reactor (or stand-in) without the coarse timeouts."
+    addTimeout = getattr(reactor, 'addTimeout', None)
+    return (reactor.addTimer if addTimeout is None else addTimeout)(seconds, callback)
+
+def _removeTimeout(reactor, token):
+    removeTimeout = getattr(reactor, 'removeTimeout', None)
+    (reactor.removeTimer if removeTimeout is None else removeTimeout)(token)
+
 class Timer(object):
-    def __init__(self, seconds, callback):
+    __slots__ = ('callback', 'time', 'pending')
+
+    def __init__(self, seconds, callback, granularity=None, now=None):
         assert seconds >= 0, 'Timeout must be >= 0. It was %s.' % seconds
         self.callback = callback
+        if granularity is None:
+            granularity = EPOLL_TIMEOUT_GRANULARITY
         if seconds > 0:
-            seconds = seconds + EPOLL_TIMEOUT_GRANULARITY  # Otherwise seconds when (EPOLL_TIMEOUT_GRANULARITY > seconds > 0) is effectively 0(.0)
-        self.time = time() + seconds
+            seconds = seconds + granularity  # Otherwise seconds when (EPOLL_TIMEOUT_GRANULARITY > seconds > 0) is effectively 0(.0)
+        self.time = (monotonic() if now is None else now) + seconds
+        self.pending = True
 
 
 class _FDContext(object):
-    def __init__(self, callback, fileOrFd, intent, prio):
+    __slots__ = ('callback', 'fileOrFd', 'intent', 'prio', 'edgeTriggered', 'oneshot', 'exclusive', 'parked', 'stride', 'nextRun')
+
+    def __init__(self, callback, fileOrFd, intent, prio, edgeTriggered=False, oneshot=False, exclusive=False):
         if prio is None:
             prio = Reactor.DEFAULTPRIO
         if not 0 <= prio < Reactor.MAXPRIO:
             raise ValueError('Invalid priority: %s' % prio)
+        if exclusive and oneshot:
+            raise ValueError('exclusive cannot be combined with oneshot')
 
         self.callback = callback
         self.fileOrFd = fileOrFd
         self.intent = intent
         self.prio = prio
+        self.stride = Reactor.MAXPRIO / (Reactor.MAXPRIO - prio)  # Prio 0 may run every step it is ready, prio 9 one in 10.
+        self.nextRun = 0
+        self.edgeTriggered = edgeTriggered
+        self.oneshot = oneshot
+        self.exclusive = exclusive
+        self.parked = False
+
+    def eventmask(self, intent=None):
+        if intent is None:
+            intent = self.intent
+        eventmask = EPOLLIN if intent is READ_INTENT else EPOLLOUT  # Change iff >2 intents exist.
+        if self.edgeTriggered:
+            eventmask |= EPOLLET
+        if self.oneshot:
+            eventmask |= EPOLLONESHOT
+        if self.exclusive:
+            eventmask |= EPOLLEXCLUSIVE
+        return eventmask
+
+
+class _DuplexFDContext(object):
+    "A reader and a writer on one fd; registered once with epoll, with the combined eventmask."
+    __slots__ = ('reader', 'writer', 'fileOrFd', 'edgeTriggered', 'oneshot')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.fileOrFd = reader.fileOrFd
+        self.edgeTriggered = reader.edgeTriggered
+        self.oneshot = reader.oneshot
+
+    def eventmask(self):
+        return self.reader.eventmask() | self.writer.eventmask()
 
 
 class _ProcessContext(object):
+    __slots__ = ('callback', 'prio', 'stride', 'nextRun', 'idle')
+
     def __init__(self, callback, prio):
         if prio is None:
             prio = Reactor.DEFAULTPRIO
@@ -466,6 +971,9 @@ class _ProcessContext(object):
 
         self.callback = callback
         self.prio = prio
+        self.stride = Reactor.MAXPRIO / (Reactor.MAXPRIO - prio)
+        self.nextRun = 0
+        self.idle = False
 
 
 def _fdNormalize(fd):
@@ -549,18 +1057,20 @@ class _HandleEBADFError(Exception):
     pass
 
 
-_timeKey = lambda t: t.time
-
 READ_INTENT = type('READ_INTENT', (object,), {})()
 WRITE_INTENT = type('WRITE_INTENT', (object,), {})()
 
 # In Python 2.7 - anything lower than 0.001 will become 0(.0); epoll.poll() may (and will IRL) return early - see: https://bugs.python.org/issue20311 (Python 3.x differs in behaviour :-s).
-# TS: If this granularity (& related logic) is unwanted - start using timerfd_* system-calls.
+# TS: If this granularity (& related logic) is unwanted - use Reactor(timerfd=True); which uses the timerfd_* system-calls.
 EPOLL_TIMEOUT_GRANULARITY = 0.001
 MAX_INT_EPOLL = 2**31 -1
 MAX_TIMEOUT_EPOLL = MAX_INT_EPOLL / 1000 - 1
+IDLE_BACKOFF_MIN = 0.001
+TIMER_COMPACT_THRESHOLD = 64  # Rebuild the timer-heap when more than half of it (and more than this) are cancelled timers.
 
 EPOLLRDHUP = int('0x2000', 16)
+_READ_EVENTS = EPOLLIN | EPOLLPRI | EPOLLRDHUP | EPOLLERR | EPOLLHUP
+_WRITE_EVENTS = EPOLLOUT | EPOLLERR | EPOLLHUP
 _EPOLL_CONSTANT_MAPPING = {  # Python epoll constants (missing EPOLLRDHUP - exists since Linux 2.6.17))
     EPOLLIN: 'EPOLLIN',            # Available for read
     EPOLLOUT: 'EPOLLOUT',          # Available for write
@@ -0,0 +1,88 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import os
+from ctypes import CDLL, POINTER, Structure, c_int, c_ulong, byref, get_errno
+from ctypes.util import find_library
+from errno import EAGAIN, EINTR
+from os import read, close
+from struct import Struct
+
+
+class SignalFd(object):
+    """A signalfd (see Linux's: man signalfd) for a changing set of signals; readable when one of them is pending.
+
+    The signals must be blocked (signal.pthread_sigmask) to be received here instead of by their handlers."""
+
+    def __init__(self):
+        self._signums = set()
+        self._fd = _signalfd(-1, self._signums)
+
+    def fileno(self):
+        return self._fd
+
+    def setSignals(self, signums):
+        self._signums = set(signums)
+        _signalfd(self._fd, self._signums)
+
+    def signals(self):
+        "Reads the pending signals; a list of signal numbers."
+        result = []
+        while True:
+            try:
+                data = read(self._fd, _SIGINFO_SIZE * 16)
+            except (IOError, OSError) as e:
+                if e.errno == EINTR:
+                    continue
+                if e.errno == EAGAIN:
+                    return result
+                raise
+            result.extend(_SIGNO.unpack_from(data, offset)[0] for offset in range(0, len(data), _SIGINFO_SIZE))
+
+    def close(self):
+        close(self._fd)
+        self._fd = None
+
+
+class _sigset_t(Structure):
+    _fields_ = [('val', c_ulong * (1024 // (8 * 8)))]
+
+def _signalfd(fd, signums):
+    mask = _sigset_t()
+    _libc.sigemptyset(byref(mask))
+    for signum in signums:
+        _libc.sigaddset(byref(mask), signum)
+    result = _libc.signalfd(fd, byref(mask), os.O_NONBLOCK | os.O_CLOEXEC)
+    if result == -1:
+        errno = get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+_libc = CDLL(find_library('c'), use_errno=True)
+_libc.signalfd.argtypes = [c_int, POINTER(_sigset_t), c_int]
+_libc.sigemptyset.argtypes = [POINTER(_sigset_t)]
+_libc.sigaddset.argtypes = [POINTER(_sigset_t), c_int]
+
+_SIGINFO_SIZE = 128  # sizeof(struct signalfd_siginfo)
+_SIGNO = Struct('=I')  # Its first field: ssi_signo.
@@ -0,0 +1,63 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from signal import SIGUSR1
+from sys import stderr
+
+from weightless.core import tostring
+from ._instrumentation import _hasStack, _callbackName
+
+
+def stackDump(reactor):
+    """What the reactor's readers, writers, processes and suspended contexts are waiting on: [(count, state, stack), ...], most common first.
+
+    The stack of a compose'd generator is rendered with tostring(); other callbacks by their name.  Identical stacks in the same state are counted once, so thousands of requests waiting in the same place make one entry.  Timers are not included."""
+    counts = {}
+    for state, callback in reactor._callbacksByState():
+        key = state, _stackOf(callback)
+        counts[key] = counts.get(key, 0) + 1
+    return sorted(((count, state, stack) for (state, stack), count in counts.items()), key=lambda group: -group[0])
+
+def stackDumpReport(reactor, limit=None):
+    "stackDump() as text; limit: the number of (most common) stacks shown."
+    groups = stackDump(reactor)
+    lines = ['[Reactor]: stack dump: %d callbacks, %d distinct stacks' % (sum(count for count, _, _ in groups), len(groups))]
+    for count, state, stack in groups[:limit]:
+        lines.append('%d %s:' % (count, state))
+        lines.append(stack)
+    return '\n'.join(lines) + '\n'
+
+def dumpStacksOnSignal(reactor, signum=SIGUSR1, limit=None, out=None):
+    "Writes stackDumpReport() to out (default: stderr) from the reactor's loop, each time signal signum arrives: kill -USR1 <pid>."
+    def dump():
+        stream = stderr if out is None else out
+        stream.write(stackDumpReport(reactor, limit=limit))
+        stream.flush()
+    reactor.addSignalHandler(signum, dump)
+
+def _stackOf(callback):
+    generator = getattr(callback, '__self__', None)
+    if _hasStack(generator):
+        return tostring(generator)
+    return '  ' + _callbackName(callback)
@@ -0,0 +1,231 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import os
+from errno import EAGAIN, EINTR
+from subprocess import Popen, PIPE
+from sys import exc_info
+
+from ._suspend import Suspend, _retval
+
+
+class Subprocess(object):
+    """A child process with non-blocking pipes, used from a generator on the reactor; subprocess.Popen(args, **kwargs) with stdin, stdout and stderr PIPE's by default.
+
+        proc = Subprocess(['convert', '-', 'png:-'])
+        yield proc.write(data)
+        proc.closeStdin()
+        while True:
+            chunk = yield proc.read()   # At most bufferSize bytes; b'' at end-of-file.
+            ...
+        code = yield proc.wait()
+
+    Output is only read while a read() waits for it, so a child producing faster than it is consumed is held back by its pipe.  stderr is drained continuously (once the first call suspended), keeping its last stderrLimit bytes; see stderr().  wait() is notified by a pidfd (see Linux's: man pidfd_open), or polls when that is not available."""
+
+    def __init__(self, args, bufferSize=64 * 1024, stderrLimit=64 * 1024, **kwargs):
+        for name in ['stdin', 'stdout', 'stderr']:
+            kwargs.setdefault(name, PIPE)
+        self._popen = Popen(args, bufsize=0, **kwargs)
+        for pipe in [self._popen.stdin, self._popen.stdout, self._popen.stderr]:
+            if pipe is not None:
+                os.set_blocking(pipe.fileno(), False)
+        self._bufferSize = bufferSize
+        self._stderrLimit = stderrLimit
+        self._stderr = bytearray()
+        self._reactor = None
+
+    @property
+    def pid(self):
+        return self._popen.pid
+
+    @property
+    def returncode(self):
+        return self._popen.returncode
+
+    def write(self, data):
+        "yield proc.write(data); returns when all data is written to the child's stdin."
+        data = memoryview(data).cast('B')
+        written = _writeSome(self._popen.stdin, data)
+        if written == len(data):
+            return
+        suspend = Suspend(doNext=lambda suspend: self._startWrite(suspend, data[written:]))
+        yield suspend
+        suspend.getResult()
+
+    def closeStdin(self):
+        if self._popen.stdin is not None:
+            self._popen.stdin.close()
+            self._popen.stdin = None
+
+    def read(self, size=None):
+        "data = yield proc.read(); the next at most size (default bufferSize) bytes from the child's stdout, b'' at end-of-file."
+        size = self._bufferSize if size is None else size
+        data = _readSome(self._popen.stdout, size)
+        if data is None:
+            suspend = Suspend(doNext=lambda suspend: self._startRead(suspend, size))
+            yield suspend
+            data = suspend.getResult()
+        return data
+
+    def wait(self):
+        "code = yield proc.wait(); the child's exit code, when it exited."
+        if self._popen.poll() is None:
+            suspend = Suspend(doNext=self._startWait)
+            yield suspend
+            suspend.getResult()
+        self._drainStderr()
+        return _retval(self._popen.returncode)
+
+    def stderr(self):
+        "The last stderrLimit bytes the child wrote to stderr, so far."
+        return bytes(self._stderr)
+
+    def terminate(self):
+        self._popen.terminate()
+
+    def kill(self):
+        self._popen.kill()
+
+    def close(self):
+        "Stops reading stderr and closes the pipes; it does not wait for the child."
+        stderr = self._popen.stderr
+        if stderr is not None:
+            if self._reactor is not None and not stderr.closed:
+                self._reactor.removeReader(stderr)
+            stderr.close()
+        for pipe in [self._popen.stdin, self._popen.stdout]:
+            if pipe is not None:
+                pipe.close()
+
+    def _attach(self, reactor):
+        if self._reactor is not None:
+            return
+        self._reactor = reactor
+        if self._popen.stderr is not None:
+            reactor.addReader(self._popen.stderr, self._drainStderr)
+
+    def _startWrite(self, suspend, data):
+        self._attach(suspend._reactor)
+        stdin = self._popen.stdin
+        def writable():
+            nonlocal data
+            try:
+                written = _writeSome(stdin, data)
+            except (AssertionError, KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                self._reactor.removeWriter(stdin)
+                suspend.throw(*exc_info())
+                return
+            data = data[written:]
+            if not data:
+                self._reactor.removeWriter(stdin)
+                suspend.resume()
+        self._reactor.addWriter(stdin, writable)
+
+    def _startRead(self, suspend, size):
+        self._attach(suspend._reactor)
+        stdout = self._popen.stdout
+        def readable():
+            try:
+                data = _readSome(stdout, size)
+            except (AssertionError, KeyboardInterrupt, SystemExit):
+                raise
+            except Exception:
+                self._reactor.removeReader(stdout)
+                suspend.throw(*exc_info())
+                return
+            if data is not None:
+                self._reactor.removeReader(stdout)
+                suspend.resume(data)
+        self._reactor.addReader(stdout, readable)
+
+    def _startWait(self, suspend):
+        self._attach(suspend._reactor)
+        try:
+            if _pidfdOpen is None:
+                raise NotImplementedError()
+            pidfd = _pidfdOpen(self._popen.pid)
+        except (NotImplementedError, OSError):
+            self._pollExit(suspend)
+            return
+        def exited():
+            self._reactor.removeReader(pidfd)
+            os.close(pidfd)
+            self._popen.wait()
+            suspend.resume()
+        self._reactor.addReader(pidfd, exited)
+
+    def _pollExit(self, suspend):
+        if self._popen.poll() is None:
+            self._reactor.addTimer(WAIT_POLL_INTERVAL, lambda: self._pollExit(suspend))
+        else:
+            suspend.resume()
+
+    def _drainStderr(self):
+        stderr = self._popen.stderr
+        if stderr is None or stderr.closed:
+            return
+        while True:
+            data = _readSome(stderr, self._bufferSize)
+            if data is None:
+                return
+            if not data:
+                if self._reactor is not None:
+                    self._reactor.removeReader(stderr)
+                stderr.close()
+                return
+            self._stderr += data
+            if len(self._stderr) > self._stderrLimit:
+                del self._stderr[:len(self._stderr) - self._stderrLimit]
+
+
+def _readSome(pipe, size):
+    "Returns the data read (b'' at end-of-file), or None when there is none yet."
+    while True:
+        try:
+            return os.read(pipe.fileno(), size)
+        except (IOError, OSError) as e:
+            if e.errno == EINTR:
+                continue
+            if e.errno == EAGAIN:
+                return None
+            raise
+
+def _writeSome(pipe, data):
+    written = 0
+    while written < len(data):
+        try:
+            written += os.write(pipe.fileno(), data[written:])
+        except (IOError, OSError) as e:
+            if e.errno == EINTR:
+                continue
+            if e.errno == EAGAIN:
+                break
+            raise
+    return written
+
+_pidfdOpen = getattr(os, 'pidfd_open', None)  # Python >= 3.9 on Linux >= 5.3
+
+WAIT_POLL_INTERVAL = 0.01
@@ -110,3 +110,8 @@ class Suspend(object):
             print_exc()
         self.throw(TimeoutException, TimeoutException(), None)
 
+
+def _retval(value):
+    "return _retval(value) from a generator called with retval = yield ...: compose() takes a returned tuple as (retval, remaining data), so a value that may itself be a tuple must be wrapped."
+    return (value,)
+
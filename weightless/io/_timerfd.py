@@ -0,0 +1,114 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import os
+from errno import EAGAIN, EINTR
+from os import read, close
+
+
+class TimerFd(object):
+    """One-shot CLOCK_MONOTONIC timerfd (see Linux's: man timerfd_create), armed on absolute time.monotonic() values.
+
+    Uses os.timerfd_* when available (Python >= 3.13), libc through ctypes otherwise."""
+
+    def __init__(self):
+        self._fd = _timerfd_create()
+        self._armedAt = None
+
+    def fileno(self):
+        return self._fd
+
+    def armAt(self, when):
+        if when == self._armedAt:
+            return
+        _timerfd_settime_abs(self._fd, max(when, _MIN_ABSTIME))
+        self._armedAt = when
+
+    def disarm(self):
+        if self._armedAt is None:
+            return
+        _timerfd_settime_abs(self._fd, 0)
+        self._armedAt = None
+
+    def clear(self):
+        "Consumes the expiration count, if any; a one-shot timer is disarmed once expired."
+        self._armedAt = None
+        while True:
+            try:
+                read(self._fd, 8)
+                break
+            except (IOError, OSError) as e:
+                if e.errno == EINTR:
+                    continue
+                if e.errno == EAGAIN:
+                    break
+                raise
+
+    def close(self):
+        close(self._fd)
+        self._fd = None
+
+
+if hasattr(os, 'timerfd_create'):
+    from time import CLOCK_MONOTONIC
+
+    def _timerfd_create():
+        return os.timerfd_create(CLOCK_MONOTONIC, flags=os.TFD_NONBLOCK | os.TFD_CLOEXEC)
+
+    def _timerfd_settime_abs(fd, when):
+        os.timerfd_settime(fd, flags=os.TFD_TIMER_ABSTIME, initial=when, interval=0)
+
+else:
+    from ctypes import CDLL, POINTER, Structure, c_int, c_long, pointer, get_errno
+    from ctypes.util import find_library
+
+    class _timespec(Structure):
+        _fields_ = [('tv_sec', c_long), ('tv_nsec', c_long)]
+
+    class _itimerspec(Structure):
+        _fields_ = [('it_interval', _timespec), ('it_value', _timespec)]
+
+    _libc = CDLL(find_library('c'), use_errno=True)
+    _libc.timerfd_create.argtypes = [c_int, c_int]
+    _libc.timerfd_settime.argtypes = [c_int, c_int, POINTER(_itimerspec), POINTER(_itimerspec)]
+
+    _CLOCK_MONOTONIC = 1
+    _TFD_TIMER_ABSTIME = 1
+
+    def _timerfd_create():
+        fd = _libc.timerfd_create(_CLOCK_MONOTONIC, os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd == -1:
+            errno = get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return fd
+
+    def _timerfd_settime_abs(fd, when):
+        seconds = int(when)
+        spec = _itimerspec(_timespec(0, 0), _timespec(seconds, int((when - seconds) * 1e9)))
+        if _libc.timerfd_settime(fd, _TFD_TIMER_ABSTIME, pointer(spec), None) == -1:
+            errno = get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+
+_MIN_ABSTIME = 1e-9  # An it_value of 0 would disarm the timer.
@@ -0,0 +1,142 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+from math import ceil
+from traceback import print_exc
+from sys import stderr
+
+
+class TimingWheel(object):
+    """Hierarchical timing wheel for coarse timeouts (idle- and request-timeouts that are mostly cancelled before they expire).
+
+    Adding and removing a timeout is O(1); expiry is rounded up to the next tick, so a timeout fires between seconds and seconds + resolution late.  The wheel is driven by a single reactor timer, which is only present while timeouts are pending.
+
+    Same scheme as the (classic) Linux kernel timer wheel: LEVELS wheels of WHEEL_SIZE slots each; timeouts far in the future live in the higher levels and are cascaded down as time passes."""
+
+    def __init__(self, reactor, resolution):
+        if not resolution > 0:
+            raise ValueError('Invalid resolution: %s' % resolution)
+        self._reactor = reactor
+        self._resolution = resolution
+        self._levels = [[{} for _ in range(WHEEL_SIZE)] for _ in range(LEVELS)]
+        self._nextTick = self._currentTick()
+        self._count = 0
+        self._timer = None
+
+    def addTimeout(self, seconds, callback):
+        assert seconds >= 0, 'Timeout must be >= 0. It was %s.' % seconds
+        if self._count == 0:
+            self._nextTick = self._currentTick()  # All slots are empty; skip the idle ticks.
+        timeout = Timeout(expires=int(ceil((self._reactor.now() + seconds) / self._resolution)), callback=callback)
+        self._insert(timeout)
+        self._count += 1
+        if self._timer is None:
+            self._armTimer()
+        return timeout
+
+    def removeTimeout(self, token):
+        if token.slot is None:
+            raise ValueError('Timeout not pending')
+        del token.slot[token]
+        token.slot = None
+        self._count -= 1
+        if self._count == 0 and self._timer is not None:
+            self._reactor.removeTimer(self._timer)
+            self._timer = None
+
+    def __len__(self):
+        return self._count
+
+    def _insert(self, timeout):
+        expires = timeout.expires
+        delta = expires - self._nextTick
+        if delta < 0:
+            expires, delta = self._nextTick, 0  # Already expired; fires with the next tick.
+        elif delta > MAX_DELTA:
+            expires, delta = self._nextTick + MAX_DELTA, MAX_DELTA  # Cascaded (re-inserted) until really expired.
+        level = 0
+        while delta >= WHEEL_SIZE:
+            delta >>= WHEEL_BITS
+            level += 1
+        slot = self._levels[level][(expires >> (level * WHEEL_BITS)) & WHEEL_MASK]
+        slot[timeout] = None
+        timeout.slot = slot
+
+    def _cascade(self, level):
+        index = (self._nextTick >> (level * WHEEL_BITS)) & WHEEL_MASK
+        slot = self._levels[level][index]
+        if slot:
+            self._levels[level][index] = {}
+            for timeout in slot:
+                self._insert(timeout)
+        return index
+
+    def _expire(self):
+        self._timer = None
+        currentTick = self._currentTick()
+        try:
+            while self._count and self._nextTick <= currentTick:
+                index = self._nextTick & WHEEL_MASK
+                if index == 0:
+                    level = 1
+                    while level < LEVELS and self._cascade(level) == 0:
+                        level += 1
+                self._nextTick += 1
+                slot = self._levels[0][index]
+                while slot:
+                    timeout, _ = slot.popitem()
+                    timeout.slot = None
+                    self._count -= 1
+                    try:
+                        timeout.callback()
+                    except (AssertionError, SystemExit, KeyboardInterrupt):
+                        raise
+                    except:
+                        print_exc()
+                        stderr.flush()
+        finally:
+            if self._count and self._timer is None:
+                self._armTimer()
+
+    def _armTimer(self):
+        self._timer = self._reactor.addTimer(max(0, self._nextTick * self._resolution - self._reactor.now()), self._expire)
+
+    def _currentTick(self):
+        return int(self._reactor.now() / self._resolution)
+
+
+class Timeout(object):
+    __slots__ = ('expires', 'callback', 'slot')
+
+    def __init__(self, expires, callback):
+        self.expires = expires
+        self.callback = callback
+        self.slot = None
+
+
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+LEVELS = 5
+MAX_DELTA = (1 << (LEVELS * WHEEL_BITS)) - 1
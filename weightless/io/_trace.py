@@ -0,0 +1,231 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+import os
+from collections import Counter
+from struct import Struct, error as StructError
+from sys import stdout
+from time import monotonic
+
+from ._instrumentation import Histogram, TIME_BUCKETS, COUNT_BUCKETS, _callbackName
+
+
+class TraceRecorder(object):
+    """Records what each reactor step did into a binary trace file: Reactor(instrumentation=TraceRecorder(path)).
+
+    Per step: the fd-events returned by epoll and the time waited for them; per callback: the fd or process it was called for (by name), and its duration; per timer: its lateness.  Records are buffered, and written per bufferSize bytes, and by flush() and close().
+
+    The trace is bounded by maxBytes: it is a ring of two segments, path and path + '.1'; when path grows beyond maxBytes / 2 it becomes path + '.1' (replacing the older one).  Read with readTrace(path) or summarize with: python3 -m weightless.io.utils.tracesummary <path> [--steps]."""
+
+    def __init__(self, path, maxBytes=64 * 1024 * 1024, bufferSize=64 * 1024):
+        self._path = path
+        self._segmentBytes = maxBytes // 2
+        self._bufferSize = bufferSize
+        self._buffer = bytearray()
+        self._reactor = None
+        self._timerDue = False
+        if os.path.exists(path + OLDER_SEGMENT):
+            os.remove(path + OLDER_SEGMENT)
+        self._openSegment()
+
+    def attach(self, reactor):
+        self._reactor = reactor
+
+    def polled(self, seconds, fdEvents):
+        buffer = self._buffer
+        buffer += _STEP.pack(STEP, monotonic(), seconds, len(fdEvents))
+        for fd, mask in fdEvents:
+            buffer += _EVENT.pack(fd, mask)
+        if len(buffer) >= self._bufferSize:
+            self.flush()
+
+    def timerDue(self, lateness):
+        self._buffer += _TIMER.pack(TIMER, lateness)
+        self._timerDue = True
+
+    def call(self, callback):
+        handle = self._reactor.currenthandle
+        if type(handle) is int:
+            kind = KIND_FD
+        elif handle is not None:
+            kind, handle = KIND_PROCESS, 0
+        else:
+            kind, handle = (KIND_TIMER if self._timerDue else KIND_OTHER), 0
+        self._timerDue = False
+        t0 = monotonic()
+        try:
+            callback()
+        finally:
+            duration = monotonic() - t0
+            self._buffer += _CALL.pack(CALL, kind, handle, self._nameId(callback), duration)
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._segmentSize += len(self._buffer)
+            del self._buffer[:]
+            if self._segmentSize >= self._segmentBytes:
+                self._file.close()
+                os.replace(self._path, self._path + OLDER_SEGMENT)
+                self._openSegment()
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def _openSegment(self):
+        self._file = open(self._path, 'wb')
+        self._file.write(MAGIC)
+        self._segmentSize = len(MAGIC)
+        self._names = {}  # Each segment defines its own names.
+        self._nameIds = {}
+
+    def _nameId(self, callback):
+        entry = self._nameIds.get(id(callback))
+        if entry is None:
+            if len(self._nameIds) >= MAX_CACHED_CALLBACKS:
+                self._nameIds.clear()
+            name = _callbackName(callback)
+            nameId = self._names.get(name)
+            if nameId is None and len(self._names) < UNKNOWN_NAME:
+                nameId = self._names[name] = len(self._names)
+                encoded = name.encode('utf-8', 'replace')[:0xffff]
+                self._buffer += _NAME.pack(NAME, nameId, len(encoded)) + encoded
+            entry = self._nameIds[id(callback)] = (callback, UNKNOWN_NAME if nameId is None else nameId)  # Keeps callback; so its id is not reused meanwhile.
+        return entry[1]
+
+
+def readTrace(path):
+    """Yields a dict per recorded step, oldest first: time (monotonic), pollWait, events [(fd, mask)], timers [lateness] and callbacks [(kind, fd, name, duration)]; kind is one of 'fd', 'process', 'timer' or 'other'."""
+    step = None
+    for segment in (path + OLDER_SEGMENT, path):
+        if not os.path.exists(segment):
+            continue
+        with open(segment, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError('Not a reactor trace: %s' % segment)
+        names = {}
+        offset = len(MAGIC)
+        end = len(data)
+        try:
+            while offset < end:
+                recordType = data[offset]
+                if recordType == STEP:
+                    _, t, pollWait, count = _STEP.unpack_from(data, offset)
+                    offset += _STEP.size
+                    if step is not None:
+                        yield step
+                    events = [_EVENT.unpack_from(data, offset + i * _EVENT.size) for i in range(count)]
+                    offset += count * _EVENT.size
+                    step = {'time': t, 'pollWait': pollWait, 'events': events, 'timers': [], 'callbacks': []}
+                elif recordType == CALL:
+                    _, kind, fd, nameId, duration = _CALL.unpack_from(data, offset)
+                    offset += _CALL.size
+                    if step is not None:
+                        step['callbacks'].append((KIND_NAMES[kind], fd if kind == KIND_FD else None, names.get(nameId, '?'), duration))
+                elif recordType == TIMER:
+                    _, lateness = _TIMER.unpack_from(data, offset)
+                    offset += _TIMER.size
+                    if step is not None:
+                        step['timers'].append(lateness)
+                elif recordType == NAME:
+                    _, nameId, length = _NAME.unpack_from(data, offset)
+                    offset += _NAME.size
+                    names[nameId] = data[offset:offset + length].decode('utf-8', 'replace')
+                    offset += length
+                else:
+                    raise ValueError('Corrupt reactor trace: %s, at offset %d' % (segment, offset))
+        except StructError:
+            pass  # Truncated last record (e.g. a crash while writing); ignored.
+    if step is not None:
+        yield step
+
+def summarizeTrace(path, topFds=10):
+    steps = 0
+    pollWait = Histogram(TIME_BUCKETS)
+    eventsPerStep = Histogram(COUNT_BUCKETS)
+    callbackDuration = Histogram(TIME_BUCKETS)
+    stepCallbackTime = Histogram(TIME_BUCKETS)
+    fdEvents = Counter()
+    fdTime = Counter()
+    nameTime = Counter()
+    for step in readTrace(path):
+        steps += 1
+        pollWait.add(step['pollWait'])
+        eventsPerStep.add(len(step['events']))
+        fdEvents.update(fd for fd, mask in step['events'])
+        total = 0
+        for kind, fd, name, duration in step['callbacks']:
+            callbackDuration.add(duration)
+            total += duration
+            nameTime[name] += duration
+            if fd is not None:
+                fdTime[fd] += duration
+        stepCallbackTime.add(total)
+    return {
+        'steps': steps,
+        'pollWait': pollWait.asDict(),
+        'eventsPerStep': eventsPerStep.asDict(),
+        'callbackDuration': callbackDuration.asDict(),
+        'stepCallbackTime': stepCallbackTime.asDict(),
+        'hotFds': [(fd, fdEvents[fd], fdTime[fd]) for fd, _ in fdTime.most_common(topFds)],
+        'hotCallbacks': nameTime.most_common(topFds),
+    }
+
+def printTraceSummary(path, steps=False, out=stdout):
+    if steps:
+        for step in readTrace(path):
+            callbackTime = sum(duration for kind, fd, name, duration in step['callbacks'])
+            out.write('%.6f  poll %.6f  events %d  timers %d  callbacks %d (%.6f)\n' % (step['time'], step['pollWait'], len(step['events']), len(step['timers']), len(step['callbacks']), callbackTime))
+            for kind, fd, name, duration in step['callbacks']:
+                out.write('    %-7s %5s %.6f %s\n' % (kind, '' if fd is None else fd, duration, name))
+    summary = summarizeTrace(path)
+    out.write('steps: %d\n' % summary['steps'])
+    for key in ['pollWait', 'eventsPerStep', 'callbackDuration', 'stepCallbackTime']:
+        h = summary[key]
+        out.write('%s: count %d, total %.6g, max %.6g\n' % (key, h['count'], h['total'], h['max']))
+        out.write('    %s\n' % '  '.join('<=%s: %d' % (bound, count) for bound, count in zip(h['bounds'] + ('more',), h['counts']) if count))
+    out.write('hot fds (fd, events, callback seconds):\n')
+    for fd, events, seconds in summary['hotFds']:
+        out.write('    %5d %8d %.6f\n' % (fd, events, seconds))
+    out.write('hot callbacks (callback seconds, name):\n')
+    for name, seconds in summary['hotCallbacks']:
+        out.write('    %.6f %s\n' % (seconds, name))
+
+
+MAGIC = b'WLTRACE1'
+OLDER_SEGMENT = '.1'
+STEP, CALL, TIMER, NAME = b'SCTN'
+KIND_FD, KIND_PROCESS, KIND_TIMER, KIND_OTHER = range(4)
+KIND_NAMES = ('fd', 'process', 'timer', 'other')
+UNKNOWN_NAME = 0xffff
+MAX_CACHED_CALLBACKS = 10000
+
+_STEP = Struct('<BdfI')
+_EVENT = Struct('<iI')
+_CALL = Struct('<BBiHf')
+_TIMER = Struct('<Bf')
+_NAME = Struct('<BHH')
@@ -0,0 +1,38 @@
+## begin license ##
+#
+# "Weightless" is a High Performance Asynchronous Networking Library. See http://weightless.io
+#
+# Copyright (C) 2026 Seecr (Seek You Too B.V.) https://seecr.nl
+#
+# This file is part of "Weightless"
+#
+# "Weightless" is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# "Weightless" is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with "Weightless"; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+#
+## end license ##
+
+# Summarizes a trace recorded by weightless.io.TraceRecorder; with --steps, each recorded step is printed first.
+# Usage: python3 -m weightless.io.utils.tracesummary <path> [--steps]
+
+from sys import argv, exit
+
+from weightless.io._trace import printTraceSummary
+
+
+if __name__ == '__main__':
+    args = argv[1:]
+    paths = [arg for arg in args if not arg.startswith('--')]
+    if len(paths) != 1:
+        exit('Usage: python3 -m weightless.io.utils.tracesummary <path> [--steps]')
+    printTraceSummary(paths[0], steps='--steps' in args)